@@ -1,4 +1,5 @@
 import os
+from typing import Optional
 from pydantic import BaseModel
 
 class Settings(BaseModel):
@@ -17,7 +18,29 @@ class Settings(BaseModel):
     DOWNLOADS_DIR: str = os.path.join(os.getcwd(), "downloads")
     
     # Rate Limiting Ayarları
-    RATE_LIMIT_SECONDS: int = 3  # API çağrıları arasında beklenecek süre (saniye)
+    REVIEW_PAGE_CONCURRENCY: int = 4  # Bir ürün için aynı anda çekilecek en fazla yorum sayfası
+    TRENDYOL_MAX_REVIEW_PAGES: int = 100  # Ürün başına çekilecek en fazla yorum sayfası
+    TRENDYOL_NEWEST_FIRST_PARAMS: dict = {"order": "DESC", "orderBy": "CreatedDate"}  # Artımlı taramada yorum sıralaması
+    TRENDYOL_PRODUCT_WORKERS: int = 3  # Ürün detay + yorumlarını aynı anda işleyen işçi sayısı
+    SEARCH_PAGE_CONCURRENCY: int = 3  # Toplam sayfa sayısı öğrenildikten sonra aynı anda çekilecek arama sayfası
+    # Host bazında adaptif (token bucket + AIMD) hız sınırlama. Hızlar istek/saniye cinsindendir.
+    RATE_LIMIT_DEFAULTS: dict = {
+        "initial_rate": 1.0,
+        "min_rate": 0.1,
+        "max_rate": 5.0,
+        "burst": 2,
+        "additive_increase": 0.05,  # Her başarılı yanıtta eklenecek hız
+        "decrease_factor": 0.5,  # 403/429/Cloudflare'da hızın çarpılacağı değer
+        "decrease_cooldown": 5.0,  # İki düşürme arasında geçmesi gereken en az süre (saniye)
+    }
+    RATE_LIMIT_HOSTS: dict = {
+        "apigw.trendyol.com": {"initial_rate": 2.0, "max_rate": 10.0, "burst": 4},
+        "public-mdc.trendyol.com": {"initial_rate": 1.0, "max_rate": 5.0},
+        "www.trendyol.com": {"initial_rate": 0.5, "max_rate": 3.0},
+        "blackgate.hepsiburada.com": {"initial_rate": 1.0, "max_rate": 5.0},
+        "user-content-gw-hermes.hepsiburada.com": {"initial_rate": 1.0, "max_rate": 8.0, "burst": 3},
+        "www.hepsiburada.com": {"initial_rate": 0.5, "max_rate": 2.0},
+    }
     
     # Trendyol API Ayarları
     TRENDYOL_BASE_URL: str = "https://www.trendyol.com"
@@ -27,6 +50,10 @@ class Settings(BaseModel):
     # Alternatif API URL'leri (birincil URL çalışmazsa)
     TRENDYOL_ALT_API_URL: str = "https://public-mdc.trendyol.com/discovery-web-searchgw-service/v2/api/infinite-scroll/sr"
     TRENDYOL_ALT_REVIEW_API_URL: str = "https://apigw.trendyol.com/discovery-web-socialgw-service/api/review/products"
+    # Tarayıcı ile JSON API çağrısı: "navigate" bir sayfayı API URL'sine götürüp yanıtı dinleyerek
+    # (Chromium'un ağ yığını ve TLS parmak izi), "request" sayfa açmadan context.request
+    # (APIRequestContext, Playwright'ın kendi HTTP istemcisi) ile. Kıyas: python -m benchmarks.trendyol_api_fetch
+    TRENDYOL_API_FETCH_MODE: str = "navigate"
 
     # Hepsiburada Ayarları
     HEPSIBURADA_BASE_URL: str = "https://www.hepsiburada.com"
@@ -35,8 +62,12 @@ class Settings(BaseModel):
     HEPSIBURADA_API_CLIENT_ID: str = "MoriaDesktop"
     HEPSIBURADA_SEARCH_PAGE_SIZE: int = 36
     HEPSIBURADA_REVIEW_PAGE_SIZE: int = 100
-    HEPSIBURADA_API_MIN_WAIT_TIME: int = 1
-    HEPSIBURADA_API_MAX_WAIT_TIME: int = 3
+    HEPSIBURADA_MAX_REVIEW_PAGES: int = 100  # Artımlı taramada ürün başına en fazla yorum sayfası
+    HEPSIBURADA_NEWEST_FIRST_PARAMS: dict = {"sortField": "createdAt", "sortDirection": "DESC"}  # Artımlı taramada yorum sıralaması
+    # Hepsiburada ürün zamanlayıcısı: aşama başına işçi sayısı ve aşamalar arası kuyruk boyutu
+    HEPSIBURADA_FEATURE_WORKERS: int = 2  # Aynı anda açık olacak en fazla Chrome sekmesi
+    HEPSIBURADA_REVIEW_WORKERS: int = 4
+    HEPSIBURADA_STAGE_QUEUE_SIZE: int = 50
     HEPSIBURADA_REQUIRED_COOKIES: list = ['_abck', 'bm_sz', 'bm_sv', 'ak_bmsc', 'hbus_sessionId']
 
     # Playwright & Chrome Ayarları
@@ -57,9 +88,124 @@ class Settings(BaseModel):
     }
     CHROME_USER_DATA_DIR: str = os.path.join(os.path.expanduser("~"), "chrome-debug-profile")
     HEPSIBURADA_COOKIE_WARMUP_URL: str = "https://www.hepsiburada.com/ara?q=telefon"
-    
+    HEPSIBURADA_SESSION_TTL: float = 900.0  # Akamai cookie setinin yeniden kullanılacağı süre (saniye)
+    HEPSIBURADA_SESSION_REFRESH_MARGIN: float = 60.0  # Süre dolmadan bu kadar saniye önce arka planda yenile
+
+    # Tarayıcı Havuzu Ayarları (Trendyol headless istekleri)
+    BROWSER_POOL_SIZE: int = 2  # Sıcak tutulacak Chromium sayısı
+    BROWSER_POOL_CONTEXTS_PER_BROWSER: int = 3  # Tarayıcı ve profil başına önceden çerezlenmiş context sayısı
+    BROWSER_POOL_MAX_NAVIGATIONS: int = 200  # Bu kadar navigasyondan sonra tarayıcı yenilenir
+    BROWSER_POOL_HEALTHCHECK_INTERVAL: float = 30.0  # Saniye
+    BROWSER_POOL_CHECKOUT_TIMEOUT: float = 120.0  # Boş context beklerken en fazla bekleme süresi (saniye)
+
+    # İstek Engelleme Ayarları (sadece HTML'e ihtiyaç duyulan sayfalar için)
+    RESOURCE_BLOCKING_ENABLED: bool = True
+    BLOCKED_RESOURCE_TYPES: list = ["image", "media", "font"]
+    BLOCKED_DOMAINS: list = [
+        "google-analytics.com", "googletagmanager.com", "doubleclick.net", "googlesyndication.com",
+        "facebook.net", "connect.facebook.net", "hotjar.com", "mc.yandex.ru", "yandex.ru",
+        "criteo.com", "criteo.net", "tiktok.com", "bing.com", "clarity.ms", "insider.com",
+        "useinsider.com", "onetrust.com", "cookielaw.org",
+    ]
+    # Engellenen istekler için tür bazında ortalama boyut tahmini (byte), tasarruf sayacında kullanılır
+    BLOCKED_RESOURCE_ESTIMATED_BYTES: dict = {
+        "image": 45000, "media": 400000, "font": 35000, "stylesheet": 30000, "script": 60000, "other": 5000,
+    }
+    # "target": hedef script DOM'a eklenince devam et, "networkidle": tüm ağ trafiğinin bitmesini bekle
+    PAGE_WAIT_STRATEGY: str = "target"
+    PAGE_TARGET_WAIT_TIMEOUT: int = 20000  # Milisaniye
+    # "evaluate": aranan JSON tarayıcıda bulunup sadece sonuç döner (CDP üzerinden küçük veri),
+    # "html": sayfa HTML'i / script metni Python'a taşınıp burada ayrıştırılır
+    PAGE_EXTRACTION_MODE: str = "evaluate"
+
+    # Upstream Yanıt Önbelleği (SQLite)
+    RESPONSE_CACHE_ENABLED: bool = True
+    RESPONSE_CACHE_PATH: str = os.path.join(os.getcwd(), "cache", "responses.sqlite3")
+    RESPONSE_CACHE_MAX_BYTES: int = 512 * 1024 * 1024  # Aşılınca en eski erişilen kayıtlar silinir (LRU)
+    RESPONSE_CACHE_OFFLINE: bool = False  # True: sadece önbellekten oku, upstream'e hiç gitme (offline replay)
+    # Endpoint bazında TTL (saniye)
+    RESPONSE_CACHE_TTLS: dict = {
+        "trendyol_search": 600,
+        "trendyol_reviews": 300,
+        "trendyol_product_details": 86400,
+        "hepsiburada_search": 600,
+        "hepsiburada_reviews": 300,
+        "hepsiburada_features": 86400,
+        "default": 600,
+    }
+
+    # Aynı anda yapılan özdeş upstream isteklerini birleştirme (singleflight)
+    SINGLEFLIGHT_WINDOW: float = 2.0  # İstek bittikten sonra sonucun paylaşılmaya devam edeceği süre (saniye)
+
+    # Artımlı Tarama (incremental) Ayarları
+    WATERMARK_FILE: str = os.path.join(os.getcwd(), "cache", "review_watermarks.json")
+    WATERMARK_MAX_IDS: int = 20  # Ürün başına saklanan en yeni yorum kimliği sayısı
+
+    # Yorum Deposu (SQLite, WAL modu)
+    REVIEW_STORE_ENABLED: bool = True
+    REVIEW_STORE_PATH: str = os.path.join(os.getcwd(), "data", "reviews.sqlite3")
+    REVIEW_STORE_BATCH_SIZE: int = 500  # Bu kadar satır birikince tek transaction ile yazılır
+
+    # Yorum Tekilleştirme Ayarları
+    DEDUPE_MODE: str = "hash"  # "hash": 64 bit özet kümesi (kesin), "bloom": ölçeklenebilir Bloom filtresi (sabit bellek)
+    DEDUPE_BLOOM_INITIAL_CAPACITY: int = 100_000  # İlk Bloom katmanının kapasitesi, dolunca 2 katı eklenir
+    DEDUPE_BLOOM_ERROR_RATE: float = 0.001  # Toplam yanlış pozitif oranı üst sınırı
+    DEDUPE_STATE_DIR: str = os.path.join(os.getcwd(), "cache", "dedupe")  # Devam ettirilen işlerin tekilleştirme durumu
+
+    # Arka Plan Tarama İşleri (POST /jobs)
+    JOB_WORKERS: int = 2  # Aynı anda çalışabilecek en fazla tarama işi
+    JOB_MAX_QUEUED: int = 100  # Kuyrukta bekleyebilecek en fazla iş (dolunca 429)
+    JOB_STATE_DIR: str = os.path.join(os.getcwd(), "data", "jobs")  # İş durumu ve sonuç dosyaları
+    JOB_PROGRESS_SAVE_INTERVAL: float = 5.0  # Çalışan işin ilerlemesi bu aralıkla diske yazılır
+    CHECKPOINT_SAVE_INTERVAL: float = 5.0  # CSV'ye yazan işlerin kontrol noktası en fazla bu aralıkla yazılır
+
+    # Akış (format=ndjson|sse) Ayarları
+    STREAM_QUEUE_SIZE: int = 4  # İstemciye gönderilmeyi bekleyebilecek en fazla ürün (dolunca tarama bekler)
+
+    # CSV Yazıcı Ayarları
+    CSV_WRITER_ORDERED: bool = False  # True: satırlar ürünlerin arama sırasıyla yazılır (yeniden sıralama tamponu)
+    CSV_WRITER_BATCH_SIZE: int = 500  # Bu kadar satır birikince dosyaya yazılır
+    CSV_WRITER_FSYNC_INTERVAL: float = 5.0  # En fazla bu kadar saniyede bir diske fsync edilir
+    CSV_WRITER_QUEUE_SIZE: int = 100  # Yazıcı kuyruğunda bekleyebilecek en fazla ürün
+
+    # Parquet Dışa Aktarım Ayarları (export_format=parquet, pyarrow gerekir)
+    PARQUET_ROW_GROUP_SIZE: int = 50_000  # Bu kadar satır birikince bir row group yazılır
+    PARQUET_COMPRESSION: str = "snappy"  # "snappy", "zstd", "gzip" veya "none"
+    PARQUET_COMPRESSION_LEVEL: Optional[int] = None  # Ör. zstd için 1-22
+
     # HTTP İstek Ayarları
     REQUEST_TIMEOUT: int = 30  # Saniye cinsinden
+
+    # Paylaşılan httpx client ayarları (host bazında HTTP_CLIENT_HOSTS ile ezilebilir)
+    HTTP_CLIENT_DEFAULTS: dict = {
+        "max_connections": 20,
+        "max_keepalive_connections": 10,
+        "keepalive_expiry": 30.0,
+        "http2": True,
+        "timeout": 30.0,
+        "connect_timeout": 10.0,
+        "verify": True,
+    }
+    HTTP_CLIENT_HOSTS: dict = {
+        "apigw.trendyol.com": {
+            "verify": False,
+            "cookies": {"platform": "web", "countryCode": "TR", "language": "tr"},
+            "cookie_domain": ".trendyol.com",
+        },
+        "public-mdc.trendyol.com": {
+            "verify": False,
+            "cookies": {"platform": "web", "countryCode": "TR", "language": "tr"},
+            "cookie_domain": ".trendyol.com",
+        },
+        "blackgate.hepsiburada.com": {"persist_cookies": False},
+        "user-content-gw-hermes.hepsiburada.com": {"persist_cookies": False, "max_connections": 30},
+        "www.*": {
+            "verify": False,
+            "max_connections": 10,
+            "cookies": {"platform": "web", "countryCode": "TR", "language": "tr"},
+            "cookie_domain": ".trendyol.com",
+        },
+    }
     USER_AGENT: str = "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/138.0.0.0 Safari/537.36 Edg/138.0.0.0"
 
 settings = Settings()
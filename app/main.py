@@ -1,7 +1,7 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 import uvicorn
-from .routers import trendyol, hepsiburada
+from .routers import trendyol, hepsiburada, admin, reviews, jobs
 import warnings
 import urllib3
 import asyncio
@@ -9,6 +9,13 @@ import os
 import subprocess
 from fastapi.staticfiles import StaticFiles
 from .core.config import settings
+from .utils.browser_pool import browser_pool
+from .utils.hepsiburada_session import hepsiburada_session
+from .utils.http_clients import http_clients
+from .utils.response_cache import response_cache
+from .utils.review_store import review_store
+from .utils.json_codec import FastJSONResponse
+from .services.job_service import job_manager
 from typing import Dict, Any
 import logging
 from rich.logging import RichHandler
@@ -33,7 +40,8 @@ warnings.filterwarnings("ignore", message="Unverified HTTPS request")
 app = FastAPI(
     title="Trendyol API",
     description="Trendyol ürün yorumları ve arama sonuçları için API",
-    version="1.0.0"
+    version="1.0.0",
+    default_response_class=FastJSONResponse
 )
 
 # CORS ayarları
@@ -74,9 +82,63 @@ async def install_playwright_browsers():
         print(f"Playwright tarayıcıları kurulurken beklenmeyen hata: {e}")
         print("Uygulama tarayıcısız yedek modda çalışacak.")
 
+# Kapanışta önce çalışan işler durdurulur (kuyruğa geri alınır), ardından
+# kullandıkları paylaşılan altyapı kapatılır
+@app.on_event("shutdown")
+async def stop_job_manager():
+    await job_manager.stop()
+
+# Paylaşılan tarayıcı havuzunu uygulama ömrü boyunca açık tut
+@app.on_event("startup")
+async def start_browser_pool():
+    try:
+        await browser_pool.start()
+    except Exception as e:
+        # Havuz ilk checkout'ta yeniden başlatılmayı dener
+        print(f"Tarayıcı havuzu başlatılamadı: {e}")
+
+@app.on_event("shutdown")
+async def stop_browser_pool():
+    await browser_pool.stop()
+
+# Hepsiburada oturumunu süresi dolmadan arka planda yenile
+@app.on_event("startup")
+async def start_hepsiburada_session():
+    await hepsiburada_session.start()
+
+@app.on_event("shutdown")
+async def stop_hepsiburada_session():
+    await hepsiburada_session.stop()
+
+# Upstream host'ları için paylaşılan httpx client'larını oluştur / kapat
+@app.on_event("startup")
+async def start_http_clients():
+    await http_clients.start()
+
+@app.on_event("shutdown")
+async def close_http_clients():
+    await http_clients.aclose()
+
+@app.on_event("shutdown")
+async def close_response_cache():
+    response_cache.close()
+
+# Arka plan tarama işlerinin işçilerini başlat (yarım kalan işler yeniden kuyruğa alınır)
+@app.on_event("startup")
+async def start_job_manager():
+    await job_manager.start()
+
+@app.on_event("shutdown")
+async def close_review_store():
+    await review_store.flush()
+    review_store.close()
+
 # Routerları ekle
 app.include_router(trendyol.router)
 app.include_router(hepsiburada.router)
+app.include_router(admin.router)
+app.include_router(reviews.router)
+app.include_router(jobs.router)
 
 @app.get("/")
 def read_root():
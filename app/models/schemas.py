@@ -39,3 +39,10 @@ class ProductReviewsResponse(BaseModel):
     products: List[Dict[str, Any]] = []
     csv_file: Optional[str] = None
     error: Optional[str] = None
+
+class JobCreate(BaseModel):
+    marketplace: str = Field(..., description="'trendyol' veya 'hepsiburada'")
+    url: str = Field(..., description="Pazaryeri arama URL'si")
+    export_csv: bool = False
+    export_format: str = Field("csv", description="'csv' veya 'parquet'")
+    incremental: bool = False
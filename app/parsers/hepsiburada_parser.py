@@ -3,46 +3,56 @@ import httpx
 import logging
 from urllib.parse import urlparse, parse_qs, urlencode
 from typing import Dict, Any, Optional
-import json
 import pyjson5 # pyjson5'i kendi adıyla import et
-from bs4 import BeautifulSoup
 import html
 from playwright.async_api import async_playwright
 
 from app.core.config import settings
-from app.utils.hepsiburada_cookie_fetcher import fetch_hepsiburada_cookies_async
+from app.utils.hepsiburada_session import hepsiburada_session
+from app.utils.request_blocker import request_blocker
+from app.utils.http_clients import http_clients
+from app.utils.rate_limiter import rate_limiter
+from app.utils.response_cache import response_cache
+from app.utils.singleflight import singleflight
+from app.utils import json_codec
+from app.parsers.script_extractor import balanced_end, decode_json_at, iter_value_starts
 
 # Logger'ı yapılandır
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-async def _make_api_request(url: str, headers: dict, params: Optional[Dict[str, Any]] = None, retries: int = 2) -> Dict[str, Any]:
+async def _make_api_request(url: str, referer: str = settings.HEPSIBURADA_BASE_URL + "/", params: Optional[Dict[str, Any]] = None, extra_headers: Optional[Dict[str, str]] = None) -> Dict[str, Any]:
     """
-    Hepsiburada API'sine httpx ile istek atar ve 403 hatası durumunda yeniden dener.
+    Hepsiburada API'sine paylaşılan oturumun cookie'leri ile httpx isteği atar.
+    403 alınırsa oturum bir kez geçersiz kılınıp yenilenir ve istek tekrarlanır.
+    Yenileme, aynı anda 403 alan tüm çağrılar arasında paylaşılır.
     """
-    for attempt in range(retries + 1):
+    session = await hepsiburada_session.get()
+    if not session:
+        logger.error(f"Cookie'ler alınamadı, istek iptal edildi: URL={url}")
+        return {}
+
+    for attempt in range(2):
+        headers = _get_default_headers(session.cookie_string, session.user_agent, referer=referer)
+        if extra_headers:
+            headers.update(extra_headers)
         try:
-            async with httpx.AsyncClient(timeout=30.0) as client:
-                response = await client.get(url, headers=headers, params=params)
-                
-                if response.status_code == 403:
-                    logger.warning(f"403 Forbidden hatası alındı (URL: {url}). Cookie'ler geçersiz olabilir. Yeniden denenecek...")
-                    if attempt < retries:
-                        raise httpx.HTTPStatusError("403 Forbidden", request=response.request, response=response)
-                    else:
-                        logger.error("Maksimum deneme sayısına ulaşıldı, 403 hatası devam ediyor.")
-                        response.raise_for_status()
-
-                response.raise_for_status()
-                return response.json()
+            response = await http_clients.get(url).get(url, headers=headers, params=params)
+
+            if response.status_code == 403 and attempt == 0:
+                logger.warning(f"403 Forbidden hatası alındı (URL: {url}). Oturum yenilenip bir kez daha denenecek...")
+                session = await hepsiburada_session.invalidate(session)
+                if not session:
+                    logger.error("Oturum yenilenemedi, istek iptal edildi.")
+                    return {}
+                continue
+
+            response.raise_for_status()
+            return json_codec.loads(response.content)
 
         except httpx.HTTPStatusError as e:
-            if e.response.status_code == 403 and attempt < retries:
-                await asyncio.sleep(settings.HEPSIBURADA_API_MIN_WAIT_TIME)
-                continue
-            else:
-                logger.error(f"API isteği başarısız oldu: URL={url}, Hata={e}")
-                return {}
+            logger.error(f"API isteği başarısız oldu: URL={url}, Hata={e}")
+            return {}
         except httpx.RequestError as e:
             logger.error(f"İstek sırasında kritik bir hata oluştu: URL={url}, Hata={e}")
             return {}
@@ -68,102 +78,185 @@ def _get_default_headers(cookie_string: str, user_agent: str, referer: str = set
     }
 
 
+@response_cache.cached("hepsiburada_search", key=lambda url: (url, None))
 async def fetch_products_from_search(url: str) -> Dict[str, Any]:
     """
     Verilen Hepsiburada arama URL'sinden ürünleri çeker.
-    Her çağrıda yeni cookie'ler alarak Akamai korumasını aşmayı hedefler.
+    Akamai cookie'leri paylaşılan oturum sağlayıcısından alınır.
     """
     logger.info(f"Hepsiburada arama sonuçları çekiliyor: {url}")
-    max_retries = 2
-    for attempt in range(max_retries + 1): # +1 ile toplam deneme sayısı doğru olur
-        try:
-            cookie_dict, user_agent = await fetch_hepsiburada_cookies_async()
-            if not cookie_dict:
-                logger.error("Cookie'ler alınamadı, ürün arama işlemi iptal edildi.")
-                return {}
+    parsed_frontend_url = urlparse(url)
+    query_params = parse_qs(parsed_frontend_url.query)
+
+    search_query = query_params.get('q')
+    if not search_query:
+        logger.error("Arama sorgusu 'q' URL'de bulunamadı.")
+        return {}
 
-            cookie_string = "; ".join([f"{k}={v}" for k, v in cookie_dict.items()])
-            headers = _get_default_headers(cookie_string, user_agent)
+    api_params = {
+        'pageType': 'Search',
+        'size': settings.HEPSIBURADA_SEARCH_PAGE_SIZE,
+        'page': query_params.get('sayfa', [1])[0],
+        'q': search_query[0],
+    }
 
-            parsed_frontend_url = urlparse(url)
-            query_params = parse_qs(parsed_frontend_url.query)
+    return await _make_api_request(settings.HEPSIBURADA_SEARCH_API_URL, params=api_params)
 
-            api_params = {
-                'pageType': 'Search',
-                'size': settings.HEPSIBURADA_SEARCH_PAGE_SIZE,
-                'page': query_params.get('sayfa', [1])[0]
-            }
-            
-            search_query = query_params.get('q')
-            if not search_query:
-                raise ValueError("Arama sorgusu 'q' URL'de bulunamadı.")
-            api_params['q'] = search_query[0]
 
-            api_base_url = settings.HEPSIBURADA_SEARCH_API_URL
-            
-            # Doğrudan _make_api_request'i çağır ve sonucu dön
-            return await _make_api_request(api_base_url, headers=headers, params=api_params, retries=1)
+def _product_reviews_key(sku: str, page: int = 0, size: int = 100, sort_params: Optional[Dict[str, str]] = None):
+    """Önbellek ve singleflight için (url, params) anahtarı"""
+    return settings.HEPSIBURADA_REVIEW_API_URL, {"sku": sku, "page": page, "size": size, **(sort_params or {})}
 
-        except httpx.HTTPStatusError as e:
-            if e.response.status_code == 403 and attempt < max_retries:
-                # 403 hatası zaten _make_api_request içinde loglandı, burada tekrar loglamaya gerek yok.
-                await asyncio.sleep(settings.HEPSIBURADA_API_MAX_WAIT_TIME)
-                continue # Döngünün başına dönerek yeni cookie almayı tetikle
-            else:
-                logger.error(f"Ürün arama işlemi {e.response.status_code} hatasıyla son denemede de başarısız oldu.")
-                return {}
-    logger.error("Ürün arama işlemi maksimum deneme sayısına ulaştıktan sonra başarısız oldu.")
-    return {}
+
+def _is_newest_first(sku: str, page: int = 0, size: int = 100, sort_params: Optional[Dict[str, str]] = None) -> bool:
+    """Artımlı taramanın en yeniden eskiye sayfaları güncel olmalı: önbellek ve singleflight atlanır."""
+    return sort_params == settings.HEPSIBURADA_NEWEST_FIRST_PARAMS
 
 
-async def fetch_product_reviews(sku: str, page: int = 0, size: int = 100) -> Dict[str, Any]:
+@singleflight.coalesce("hepsiburada_reviews", key=_product_reviews_key, bypass=_is_newest_first)
+@response_cache.cached("hepsiburada_reviews", key=_product_reviews_key, bypass=_is_newest_first)
+async def fetch_product_reviews(sku: str, page: int = 0, size: int = 100, sort_params: Optional[Dict[str, str]] = None) -> Dict[str, Any]:
     """
     Belirli bir ürün (SKU) için yorumları çeker.
     Yeni 'user-content-gw-hermes' endpoint'ini kullanır.
+    `sort_params` verilirse (ör. artımlı taramada en yeniden eskiye) isteğe eklenir.
     """
-    # Bu log çok sık çağrıldığı için DEBUG seviyesine düşürülebilir veya kaldırılabilir. Şimdilik kaldırıyorum.
-    # logger.info(f"'{sku}' için {page}. sayfa yorumları çekiliyor...") 
-    max_retries = 2
-    for attempt in range(max_retries + 1):
-        try:
-            cookie_dict, user_agent = await fetch_hepsiburada_cookies_async()
-            if not cookie_dict:
-                logger.error(f"Cookie'ler alınamadı, {sku} için yorum çekme işlemi iptal edildi.")
-                return {}
-
-            cookie_string = "; ".join([f"{k}={v}" for k, v in cookie_dict.items()])
-            referer_url = f"{settings.HEPSIBURADA_BASE_URL}/product-p-{sku}-yorumlari"
-            headers = _get_default_headers(cookie_string, user_agent, referer=referer_url)
-            # Add specific headers for this request if any
-            headers['cache-control'] = 'no-cache'
-            headers['pragma'] = 'no-cache'
-            headers['priority'] = 'u=1, i'
-
-
-            api_url = settings.HEPSIBURADA_REVIEW_API_URL
-            params = {
-                "sku": sku,
-                "from": page * size,
-                "size": size,
-                "includeSiblingVariantContents": "true",
-                "includeSummary": "true",
+    referer_url = f"{settings.HEPSIBURADA_BASE_URL}/product-p-{sku}-yorumlari"
+    extra_headers = {
+        'cache-control': 'no-cache',
+        'pragma': 'no-cache',
+        'priority': 'u=1, i',
+    }
+    params = {
+        "sku": sku,
+        "from": page * size,
+        "size": size,
+        "includeSiblingVariantContents": "true",
+        "includeSummary": "true",
+    }
+    if sort_params:
+        params.update(sort_params)
+
+    result = await _make_api_request(settings.HEPSIBURADA_REVIEW_API_URL, referer=referer_url, params=params, extra_headers=extra_headers)
+    if not result:
+        logger.error(f"Yorum çekme işlemi ({sku}) başarısız oldu.")
+    return result
+
+
+def _product_page_url(product_url: str) -> str:
+    if not product_url.startswith(settings.HEPSIBURADA_BASE_URL):
+        return f"{settings.HEPSIBURADA_BASE_URL}{product_url}"
+    return product_url
+
+
+def _product_features_key(product_url: str):
+    return _product_page_url(product_url), None
+
+
+# Özellikleri içeren script'ler, öncelik sırasıyla
+_FEATURE_SCRIPT_IDS = ("reduxStore", "product-detail-app-initial-state")
+# PAGE_EXTRACTION_MODE="evaluate" ise script tarayıcıda JSON.parse edilir ve CDP üzerinden
+# sadece {özellik adı: değer} sözlüğü döner. Katı JSON değilse (veya "html" modunda)
+# script metni döner ve Python'da parse_product_features ile ayrıştırılır.
+_FEATURES_JS = """
+([ids, parseInPage]) => {
+    const isObject = (value) => value !== null && typeof value === 'object' && !Array.isArray(value);
+    // parse_product_features ile aynı kural: sadece tüm elemanları nesne olan 'expends' dizisi
+    // kabul edilir, başka bir 'expends' (ör. string listesi) bulunursa aramaya devam edilir
+    const findExpends = (node) => {
+        if (Array.isArray(node)) {
+            for (const item of node) {
+                const found = findExpends(item);
+                if (found) return found;
             }
-            
-            # Bu API çağrısı için deneme hakkını _make_api_request'e devrediyoruz.
-            return await _make_api_request(api_url, headers=headers, params=params, retries=1)
+        } else if (isObject(node)) {
+            for (const [key, value] of Object.entries(node)) {
+                if (key === 'expends' && Array.isArray(value) && value.every(isObject)) return value;
+                const found = findExpends(value);
+                if (found) return found;
+            }
+        }
+        return null;
+    };
+    for (const id of ids) {
+        const element = document.getElementById(id);
+        const text = element && element.textContent;
+        if (!text) continue;
+        if (!parseInPage) return {id, text};
+        let state;
+        try {
+            state = JSON.parse(text);
+        } catch (e) {
+            return {id, text};
+        }
+        const expends = findExpends(state);
+        if (!expends) return {id, features: null};
+        const features = {};
+        for (const group of expends) {
+            const properties = Array.isArray(group.properties) ? group.properties : [];
+            for (const prop of properties) {
+                if (isObject(prop) && 'name' in prop && 'property' in prop) features[prop.name] = prop.property;
+            }
+        }
+        return {id, features};
+    }
+    return null;
+}
+"""
 
-        except httpx.HTTPStatusError as e:
-            if e.response.status_code == 403 and attempt < max_retries:
-                # 403 hatası zaten _make_api_request içinde loglandı.
-                await asyncio.sleep(settings.HEPSIBURADA_API_MAX_WAIT_TIME)
-                continue
-            else:
-                logger.error(f"Yorum çekme işlemi ({sku}) {e.response.status_code} hatasıyla son denemede de başarısız oldu.")
-                return {}
-    logger.error(f"Yorum çekme işlemi ({sku}) maksimum deneme sayısına ulaştıktan sonra başarısız oldu.")
-    return {} 
+def _decode_expends_at(script_content: str, value_start: int) -> Optional[list]:
+    try:
+        # Katı JSON ise liste C hızında, kapanış parantezine kadar tek seferde okunur
+        value = decode_json_at(script_content, value_start)
+    except ValueError:
+        # Değilse (tek tırnak, sondaki virgül vb.) dengeli aralık ayrılıp pyjson5 ile çözülür
+        end = balanced_end(script_content, value_start)
+        if end == -1:
+            return None
+        try:
+            value = pyjson5.loads(script_content[value_start:end])
+        except Exception:
+            return None
+    # Özellik grupları nesnelerdir; başka bir 'expends' dizisi (ör. string listesi) kabul edilmez
+    if isinstance(value, list) and all(isinstance(group, dict) for group in value):
+        return value
+    return None
 
 
+def parse_product_features(script_content: str) -> Optional[Dict[str, Any]]:
+    """
+    reduxStore script metnindeki 'expends' listesini {özellik adı: değer}
+    sözlüğüne çevirir. Liste tırnak içindeki parantezlere takılmadan tek geçişte
+    bulunur ve önce hızlı json ile, katı JSON değilse pyjson5 ile çözülür.
+    'expends' birden fazla yerde geçiyorsa (string değer, iç içe anahtar)
+    çözülebilen ilk liste kullanılır. Liste bulunamaz veya çözülemezse None döner.
+    """
+    if "&quot;" in script_content:
+        # HTML entity'leriyle kaçışlanmış içerik
+        script_content = html.unescape(script_content)
+
+    expends_list = None
+    for value_start in iter_value_starts(script_content, "expends"):
+        if script_content[value_start] == "[":
+            expends_list = _decode_expends_at(script_content, value_start)
+            if expends_list is not None:
+                break
+    if expends_list is None:
+        logger.error("'expends' listesi script içinde bulunamadı veya çözülemedi.")
+        return None
+
+    features_dict = {}
+    for group in expends_list:
+        properties = group.get('properties')
+        if not isinstance(properties, list):
+            continue
+        for prop in properties:
+            if isinstance(prop, dict) and 'name' in prop and 'property' in prop:
+                features_dict[prop['name']] = prop['property']
+    return features_dict
+
+@singleflight.coalesce("hepsiburada_features", key=_product_features_key)
+@response_cache.cached("hepsiburada_features", key=_product_features_key)
 async def fetch_product_features(product_url: str) -> Dict[str, Any]:
     """
     Verilen Hepsiburada ürün sayfasının HTML'ini Playwright kullanarak indirir.
@@ -173,15 +266,14 @@ async def fetch_product_features(product_url: str) -> Dict[str, Any]:
     # Bu log da çok sık çağrılıyor, şimdilik kaldırıyorum.
     # logger.info(f"Ürün özellikleri çekiliyor: {product_url}")
 
-    if not product_url.startswith(settings.HEPSIBURADA_BASE_URL):
-        product_url = f"{settings.HEPSIBURADA_BASE_URL}{product_url}"
+    product_url = _product_page_url(product_url)
 
     page = None
     try:
         # Bu fonksiyon, 9222 portunda bir tarayıcının çalışır durumda olmasını sağlar.
         # Biz bu tarayıcıya yeniden bağlanarak işlemi gerçekleştireceğiz.
-        cookies, user_agent = await fetch_hepsiburada_cookies_async()
-        if not cookies:
+        session = await hepsiburada_session.get()
+        if not session:
             logger.error("Tarayıcı başlatılamadığı veya cookie alınamadığı için özellikler çekilemiyor.")
             return {}
 
@@ -189,8 +281,15 @@ async def fetch_product_features(product_url: str) -> Dict[str, Any]:
             browser = await p.chromium.connect_over_cdp(settings.PLAYWRIGHT_CDP_URL)
             context = browser.contexts[0]
             page = await context.new_page()
+            # Sadece reduxStore script'ine ihtiyacımız var; görsel, font ve reklam isteklerini engelle.
+            # Kural context'e değil sayfaya kurulur, böylece cookie ısınma sayfası etkilenmez.
+            if settings.RESOURCE_BLOCKING_ENABLED:
+                await request_blocker.install(page)
             
-            await page.goto(product_url, wait_until="domcontentloaded", timeout=60000)
+            wait_until = "networkidle" if settings.PAGE_WAIT_STRATEGY == "networkidle" else "domcontentloaded"
+            await rate_limiter.acquire(product_url)
+            response = await page.goto(product_url, wait_until=wait_until, timeout=60000)
+            rate_limiter.record(product_url, response.status if response else None)
 
             await page.evaluate("window.scrollBy(0, 1000)")
             
@@ -207,66 +306,23 @@ async def fetch_product_features(product_url: str) -> Dict[str, Any]:
             except Exception:
                 logger.warning(f"Sayfa içeriği beklenenden yavaş yüklendi veya 'reduxStore' bulunamadı ({product_url}). Devam ediliyor...")
 
-            html_content = await page.content()
-            
-            soup = BeautifulSoup(html_content, 'html.parser')
-            
-            script_tag = soup.find('script', id='reduxStore')
-            source_log = "reduxStore"
-            if not script_tag:
-                logger.warning("'reduxStore' script'i bulunamadı, 'product-detail-app-initial-state' deneniyor.")
-                script_tag = soup.find('script', id='product-detail-app-initial-state')
-                source_log = "product-detail-app-initial-state"
-
-            if script_tag:
-                script_content = script_tag.getText()
-                if script_content:
-                    unescaped_content = html.unescape(script_content)
-                    
-                    # --- Bracket Sayma ile Sadece 'expends' listesini çıkarma ---
-                    start_key = '"expends":'
-                    start_index = unescaped_content.find(start_key)
-                    if start_index == -1:
-                        logger.error(f"'{start_key}' anahtarı script içinde bulunamadı.")
-                        return {}
-                    
-                    open_bracket_index = unescaped_content.find('[', start_index)
-                    if open_bracket_index == -1:
-                        logger.error(f"'{start_key}' anahtarından sonra açılış bracket'ı '[' bulunamadı.")
-                        return {}
-
-                    bracket_level = 1
-                    current_pos = open_bracket_index + 1
-                    content_len = len(unescaped_content)
-                    while bracket_level > 0 and current_pos < content_len:
-                        char = unescaped_content[current_pos]
-                        if char == '[':
-                            bracket_level += 1
-                        elif char == ']':
-                            bracket_level -= 1
-                        current_pos += 1
-                    
-                    if bracket_level != 0:
-                        logger.error("Eşleşen kapanış bracket'ı ']' bulunamadı. 'expends' listesi eksik olabilir.")
-                        return {}
-                        
-                    expends_list_str = unescaped_content[open_bracket_index:current_pos]
-                    
-                    try:
-                        expends_list = pyjson5.loads(expends_list_str)
-                    except Exception as e:
-                        logger.error(f"Ayıklanan 'expends' listesi JSON'a çevrilirken hata oluştu: {e}")
-                        return {}
-
-                    features_dict = {}
-                    for group in expends_list:
-                        properties = group.get('properties', [])
-                        for prop in properties:
-                            if 'name' in prop and 'property' in prop:
-                                features_dict[prop['name']] = prop['property']
-                    
-                    logger.info(f"{len(features_dict)} adet ürün özelliği '{source_log}' kaynağından bulundu.")
-                    return features_dict
+            # Tüm sayfa HTML'i yerine sadece özellikler (veya script metni) CDP üzerinden taşınır
+            parse_in_page = settings.PAGE_EXTRACTION_MODE == "evaluate"
+            found = await page.evaluate(_FEATURES_JS, [list(_FEATURE_SCRIPT_IDS), parse_in_page])
+            if found:
+                source_log = found["id"]
+                if source_log != _FEATURE_SCRIPT_IDS[0]:
+                    logger.warning(f"'{_FEATURE_SCRIPT_IDS[0]}' script'i bulunamadı, '{source_log}' kullanıldı.")
+                if "text" in found:
+                    features_dict = parse_product_features(found["text"])
+                else:
+                    features_dict = found["features"]
+                    if features_dict is None:
+                        logger.error("'expends' listesi script içinde bulunamadı.")
+                if features_dict is None:
+                    return {}
+                logger.info(f"{len(features_dict)} adet ürün özelliği '{source_log}' kaynağından bulundu.")
+                return features_dict
 
             logger.warning("Özellikleri içeren script etiketi bulunamadı.")
             return {}
@@ -276,4 +332,4 @@ async def fetch_product_features(product_url: str) -> Dict[str, Any]:
         return {}
     finally:
         if page:
-            await page.close() 
\ No newline at end of file
+            await page.close()
@@ -0,0 +1,216 @@
+import json
+import re
+from typing import Any, Dict, Iterator, Optional, Tuple
+
+# Sayfa HTML'inden gömülü <script> bloklarını ve içlerindeki JSON'u çıkaran yardımcılar.
+#
+# 1-3 MB'lık ürün sayfalarında `re.findall(r'<script ...>(.*?)</script>', re.DOTALL)`
+# ve `{.*?};` gibi tembel desenler tüm sayfayı defalarca tarar, iç içe JSON'u da ilk
+# `};` görüldüğünde keser. Burada sayfa `str.find` ile tek geçişte taranır, sadece
+# aranan script'in açılış etiketi ayrıştırılır ve JSON değerleri C hızlandırmalı
+# `JSONDecoder.raw_decode` ile (dengeli parantezlere kadar, kesilmeden) okunur.
+
+_SCRIPT_OPEN = "<script"
+_SCRIPT_CLOSE = "</script"
+_ATTR_RE = re.compile(r'([^\s=/>]+)(?:\s*=\s*(?:"([^"]*)"|\'([^\']*)\'|([^\s>]+)))?')
+# Parantezler ve (içleri tek seferde atlanan) çift / tek tırnaklı string'ler
+_TOKEN_RE = re.compile(r'"(?:[^"\\]|\\.)*"|\'(?:[^\'\\]|\\.)*\'|[\[\]{}]', re.DOTALL)
+_WHITESPACE_RE = re.compile(r'\s*')
+_decoder = json.JSONDecoder()
+
+PRODUCT_STATE_VARIABLE = "window.__PRODUCT_DETAIL_APP_INITIAL_STATE__"
+
+
+def _parse_attrs(tag: str) -> Dict[str, str]:
+    attrs = {}
+    for match in _ATTR_RE.finditer(tag):
+        name, double, single, bare = match.groups()
+        value = double if double is not None else single if single is not None else bare
+        attrs[name.lower()] = value if value is not None else ""
+    return attrs
+
+
+def iter_scripts(html: str, type: Optional[str] = None, id: Optional[str] = None) -> Iterator[Tuple[Dict[str, str], str]]:
+    """
+    Sayfadaki <script> bloklarını (öznitelikler, içerik) olarak sırayla verir.
+
+    `type` / `id` verilirse tüm script'ler gezilmez: öznitelik değeri sayfada
+    doğrudan aranır, açılış etiketi geriye doğru bulunup sadece o etiket
+    ayrıştırılır. HTML'de '<' çok sık geçtiği için bu, her '<script'i tek tek
+    ziyaret etmekten belirgin şekilde hızlıdır.
+    """
+    marker = type or id
+    if marker is None:
+        yield from _iter_all_scripts(html)
+        return
+    pos = 0
+    while True:
+        index = html.find(marker, pos)
+        if index == -1:
+            return
+        pos = index + len(marker)
+        start = html.rfind(_SCRIPT_OPEN, 0, index)
+        # Değer bir script açılış etiketinin içinde olmalı
+        if start == -1 or html.find(">", start, index) != -1:
+            continue
+        tag_end = html.find(">", index)
+        if tag_end == -1:
+            return
+        attrs = _parse_attrs(html[start + len(_SCRIPT_OPEN):tag_end])
+        if (type and attrs.get("type") != type) or (id and attrs.get("id") != id):
+            continue
+        close = html.find(_SCRIPT_CLOSE, tag_end)
+        if close == -1:
+            return
+        pos = close + len(_SCRIPT_CLOSE)
+        yield attrs, html[tag_end + 1:close]
+
+
+def _iter_all_scripts(html: str) -> Iterator[Tuple[Dict[str, str], str]]:
+    pos = 0
+    while True:
+        start = html.find(_SCRIPT_OPEN, pos)
+        if start == -1:
+            return
+        tag_end = html.find(">", start)
+        if tag_end == -1:
+            return
+        close = html.find(_SCRIPT_CLOSE, tag_end)
+        if close == -1:
+            return
+        pos = close + len(_SCRIPT_CLOSE)
+        yield _parse_attrs(html[start + len(_SCRIPT_OPEN):tag_end]), html[tag_end + 1:close]
+
+
+def find_script_by_id(html: str, script_id: str) -> Optional[str]:
+    """`id` özniteliği verilen script'in içeriğini döndürür; yoksa None."""
+    for _, content in iter_scripts(html, id=script_id):
+        return content
+    return None
+
+
+def balanced_end(text: str, start: int) -> int:
+    """
+    `text[start]` konumundaki '{' veya '[' ile eşleşen kapanışın hemen sonrasını
+    döndürür; bulunamazsa -1. Tırnak içindeki parantezler ve kaçışlı tırnaklar
+    (JSON/JSON5 ve JS string'leri) sayılmaz; string'ler regex motorunda atlanır.
+    """
+    depth = 0
+    for match in _TOKEN_RE.finditer(text, start):
+        char = text[match.start()]
+        if char == "{" or char == "[":
+            depth += 1
+        elif char == "}" or char == "]":
+            depth -= 1
+            if depth == 0:
+                return match.end()
+    return -1
+
+
+def decode_json_at(text: str, start: int) -> Any:
+    """`start` konumundan (baştaki boşluklar atlanarak) tek bir JSON değeri okur; geçersizse ValueError."""
+    start = _WHITESPACE_RE.match(text, start).end()
+    value, _ = _decoder.raw_decode(text, start)
+    return value
+
+
+def iter_value_starts(text: str, key: str, start: int = 0) -> Iterator[int]:
+    """
+    `"key": {...}` / `"key": [...]` biçimindeki her geçiş için değerin başladığı
+    konumu sırayla verir. Anahtar adı string değer olarak geçtiği veya değeri
+    nesne/dizi olmadığı yerler atlanır.
+    """
+    while True:
+        index = text.find(f'"{key}"', start)
+        if index == -1:
+            return
+        start = index + len(key) + 2
+        colon = _WHITESPACE_RE.match(text, start).end()
+        if colon >= len(text) or text[colon] != ":":
+            continue
+        value_start = _WHITESPACE_RE.match(text, colon + 1).end()
+        if value_start < len(text) and text[value_start] in "{[":
+            yield value_start
+
+
+def find_value_start(text: str, key: str, start: int = 0) -> int:
+    """`"key": {...}` / `"key": [...]` için değerin başladığı ilk konumu döndürür; yoksa -1."""
+    return next(iter_value_starts(text, key, start), -1)
+
+
+def find_value_span(text: str, key: str, start: int = 0) -> Optional[Tuple[int, int]]:
+    """
+    `"key"` değerinin [başlangıç, bitiş) aralığını parse etmeden döndürür; anahtar
+    yoksa veya hiçbir geçişin değeri kapanmamışsa None. Katı JSON olmayan (JSON5/JS) değerler için.
+    """
+    for value_start in iter_value_starts(text, key, start):
+        end = balanced_end(text, value_start)
+        if end != -1:
+            return value_start, end
+    return None
+
+
+def extract_assigned_json(html: str, variable: str) -> Optional[Any]:
+    """
+    `variable = {...}` atamasındaki JSON değerini iç içe yapısı bozulmadan döndürür; yoksa None.
+    Değişkenin atama olmayan geçişleri (ör. `if (variable)`) atlanır.
+    """
+    index = html.find(variable)
+    while index != -1:
+        after = _WHITESPACE_RE.match(html, index + len(variable)).end()
+        if html.startswith("=", after) and not html.startswith("==", after):
+            try:
+                return decode_json_at(html, after + 1)
+            except ValueError:
+                pass
+        index = html.find(variable, index + len(variable))
+    return None
+
+
+def _find_product_node(data: Any) -> Optional[Dict[str, Any]]:
+    if isinstance(data, list):
+        for item in data:
+            node = _find_product_node(item)
+            if node is not None:
+                return node
+    elif isinstance(data, dict):
+        node_type = data.get("@type")
+        if node_type == "Product" or (isinstance(node_type, list) and "Product" in node_type):
+            return data
+        if "@graph" in data:
+            return _find_product_node(data["@graph"])
+    return None
+
+
+def extract_product_json_ld(html: str) -> Optional[Dict[str, Any]]:
+    """
+    Sayfadaki JSON-LD bloklarından `@type: Product` düğümünü döndürür.
+    Product içermeyen bloklar (BreadcrumbList, Organization, ...) hiç parse edilmez.
+    """
+    for _, content in iter_scripts(html, type="application/ld+json"):
+        if '"Product"' not in content:
+            continue
+        try:
+            data = json.loads(content)
+        except ValueError:
+            continue
+        node = _find_product_node(data)
+        if node is not None:
+            return node
+    return None
+
+
+def extract_trendyol_product_details(html: str) -> Optional[Dict[str, Any]]:
+    """
+    Trendyol ürün sayfasından ürün detaylarını çıkarır: önce JSON-LD Product
+    düğümü, yoksa `__PRODUCT_DETAIL_APP_INITIAL_STATE__` içindeki ürün
+    (`{"productData": ...}` olarak). Hiçbiri yoksa None.
+    """
+    product = extract_product_json_ld(html)
+    if product is not None:
+        return product
+    state = extract_assigned_json(html, PRODUCT_STATE_VARIABLE)
+    if isinstance(state, dict):
+        return {"productData": state.get("product", {})}
+    return None
+
@@ -0,0 +1,49 @@
+from typing import Optional
+
+from fastapi import APIRouter, Query
+
+from ..utils.browser_pool import browser_pool
+from ..utils.request_blocker import request_blocker
+from ..utils.hepsiburada_session import hepsiburada_session
+from ..utils.http_clients import http_clients
+from ..utils.rate_limiter import rate_limiter
+from ..utils.response_cache import response_cache
+from ..utils.singleflight import singleflight
+from ..utils.review_store import review_store
+from ..services.job_service import job_manager
+
+router = APIRouter(
+    prefix="/admin",
+    tags=["admin"],
+    responses={404: {"description": "Not found"}},
+)
+
+@router.get("/stats")
+async def get_stats_endpoint():
+    """
+    Paylaşılan altyapının (tarayıcı havuzu, istek engelleyici, oturumlar, HTTP client'ları,
+    hız sınırlayıcı, yanıt önbelleği, singleflight, yorum deposu, tarama işleri) anlık sayaçlarını döndürür.
+    """
+    return {
+        "browser_pool": browser_pool.stats(),
+        "request_blocker": request_blocker.stats(),
+        "hepsiburada_session": hepsiburada_session.stats(),
+        "http_clients": http_clients.stats(),
+        "rate_limiter": rate_limiter.stats(),
+        "response_cache": await response_cache.stats(),
+        "singleflight": singleflight.stats(),
+        "review_store": review_store.stats(),
+        "jobs": job_manager.stats(),
+    }
+
+@router.delete("/cache")
+async def purge_cache_endpoint(
+    host: Optional[str] = Query(None, description="Sadece bu host'a ait kayıtları sil. Örnek: apigw.trendyol.com"),
+    pattern: Optional[str] = Query(None, description="URL deseni (fnmatch). Örnek: *contentId=123*")
+):
+    """
+    Yanıt önbelleğini host ve/veya URL desenine göre temizler.
+    Hiçbir parametre verilmezse tüm önbellek silinir.
+    """
+    deleted = await response_cache.purge(host=host, pattern=pattern)
+    return {"deleted": deleted}
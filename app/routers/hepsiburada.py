@@ -1,6 +1,9 @@
 from fastapi import APIRouter, Query, HTTPException
 from ..services.hepsiburada_service import get_hepsiburada_product_info_and_reviews
 from ..core.config import settings
+from ..utils.streaming import STREAM_FORMATS, stream_products
+from ..utils.parquet_writer import EXPORT_FORMATS, PYARROW_AVAILABLE
+from ..utils.json_codec import FastJSONResponse
 
 router = APIRouter(
     prefix="/hepsiburada",
@@ -11,13 +14,19 @@ router = APIRouter(
 @router.get("/urun-bilgi-ve-yorumlar")
 async def get_product_info_and_reviews_endpoint(
     url: str = Query(..., description="Hepsiburada ürün arama URL'si. Örnek: https://www.hepsiburada.com/ara?q=telefon"),
-    export_csv: bool = Query(False, description="Sonuçları CSV dosyasına aktarmak için 'true' olarak ayarlayın")
+    export_csv: bool = Query(False, description="Sonuçları CSV dosyasına aktarmak için 'true' olarak ayarlayın"),
+    incremental: bool = Query(False, description="Sadece bir önceki taramadan sonra gelen yeni yorumları çekmek için 'true' olarak ayarlayın"),
+    format: str = Query("json", description="Yanıt formatı: json, ndjson (satır başına bir ürün) veya sse (Server-Sent Events)"),
+    export_format: str = Query("csv", description="Dosya biçimi: csv veya parquet (tipli sütunlar; parquet seçilirse dosyaya aktarım otomatik açılır)")
 ):
     """
     Hepsiburada arama sonucundaki ürünlerin temel bilgilerini ve yorumlarını çeker.
     
     - **url**: Hepsiburada arama sayfası URL'si
     - **export_csv**: Sonuçları CSV dosyasına aktarmak için true/false
+    - **incremental**: SKU başına saklanan su seviyesine kadar sadece yeni yorumları çek
+    - **format**: ndjson/sse ile her ürün yorumlarıyla birlikte işlendiği anda gönderilir
+    - **export_format**: csv veya parquet (özellikler map, medya URL'leri list sütunu olarak)
     """
     if not url or not url.startswith(settings.HEPSIBURADA_BASE_URL):
         raise HTTPException(
@@ -25,10 +34,29 @@ async def get_product_info_and_reviews_endpoint(
             detail=f"Geçerli bir Hepsiburada URL'si gereklidir. Örn: {settings.HEPSIBURADA_BASE_URL}/ara?q=some-product"
         )
     
+    if format not in STREAM_FORMATS:
+        raise HTTPException(status_code=400, detail=f"Geçersiz format: {format}. Seçenekler: {', '.join(STREAM_FORMATS)}")
+    
+    if export_format not in EXPORT_FORMATS:
+        raise HTTPException(status_code=400, detail=f"Geçersiz export_format: {export_format}. Seçenekler: {', '.join(EXPORT_FORMATS)}")
+    if export_format == "parquet":
+        if not PYARROW_AVAILABLE:
+            raise HTTPException(status_code=400, detail="Parquet dışa aktarımı için sunucuda pyarrow kurulu olmalıdır.")
+        export_csv = True
+    
+    if format != "json":
+        if export_csv:
+            raise HTTPException(status_code=400, detail="Dosyaya aktarım (export_csv/export_format=parquet) sadece format=json ile kullanılabilir.")
+        return stream_products(
+            lambda on_product: get_hepsiburada_product_info_and_reviews(url, incremental=incremental, on_product=on_product),
+            format,
+        )
+    
     try:
-        result = await get_hepsiburada_product_info_and_reviews(url, export_csv)
+        result = await get_hepsiburada_product_info_and_reviews(url, export_csv, incremental, export_format=export_format)
         if not result.get("success"):
             raise HTTPException(status_code=500, detail=result.get("error", "Servis katmanında bilinmeyen bir hata oluştu."))
-        return result
+        # Büyük sonuç: jsonable_encoder geçişini atlayıp doğrudan serileştir
+        return FastJSONResponse(result)
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Endpoint hatası: {str(e)}")
\ No newline at end of file
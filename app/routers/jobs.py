@@ -0,0 +1,87 @@
+import os
+from typing import Optional
+
+from fastapi import APIRouter, Query, HTTPException
+from fastapi.responses import FileResponse
+
+from ..core.config import settings
+from ..models.schemas import JobCreate
+from ..services.job_service import job_manager, CRAWLERS, JOB_SUCCEEDED
+from ..utils.parquet_writer import EXPORT_FORMATS, PYARROW_AVAILABLE
+
+router = APIRouter(
+    prefix="/jobs",
+    tags=["jobs"],
+    responses={404: {"description": "Not found"}},
+)
+
+# Pazaryeri bazında kabul edilen arama URL'si ön ekleri
+_URL_PREFIXES = {
+    "trendyol": "https://www.trendyol.com",
+    "hepsiburada": settings.HEPSIBURADA_BASE_URL,
+}
+
+def _get_job_or_404(job_id: str):
+    job = job_manager.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"İş bulunamadı: {job_id}")
+    return job
+
+@router.post("", status_code=202)
+async def create_job_endpoint(request: JobCreate):
+    """
+    Bir tarama işini arka planda çalıştırılmak üzere kuyruğa alır ve hemen döner.
+
+    - **marketplace**: 'trendyol' veya 'hepsiburada'
+    - **url**: Pazaryeri arama sayfası URL'si
+    - **export_csv**: Sonuçları CSV dosyasına aktar
+    - **export_format**: csv veya parquet (parquet seçilirse dosyaya aktarım otomatik açılır)
+    - **incremental**: Sadece bir önceki taramadan sonra gelen yeni yorumları çek
+    """
+    if request.marketplace not in CRAWLERS:
+        raise HTTPException(status_code=400, detail=f"Geçersiz pazaryeri: {request.marketplace}. Seçenekler: {', '.join(CRAWLERS)}")
+    prefix = _URL_PREFIXES[request.marketplace]
+    if not request.url.startswith(prefix):
+        raise HTTPException(status_code=400, detail=f"Geçerli bir URL değil. URL '{prefix}' ile başlamalıdır.")
+
+    if request.export_format not in EXPORT_FORMATS:
+        raise HTTPException(status_code=400, detail=f"Geçersiz export_format: {request.export_format}. Seçenekler: {', '.join(EXPORT_FORMATS)}")
+    if request.export_format == "parquet" and not PYARROW_AVAILABLE:
+        raise HTTPException(status_code=400, detail="Parquet dışa aktarımı için sunucuda pyarrow kurulu olmalıdır.")
+    export_csv = request.export_csv or request.export_format == "parquet"
+
+    job = await job_manager.submit(request.marketplace, request.url, export_csv, request.incremental, request.export_format)
+    if job is None:
+        raise HTTPException(status_code=429, detail="İş kuyruğu dolu, daha sonra tekrar deneyin.")
+    return job.to_dict()
+
+@router.get("")
+async def list_jobs_endpoint(
+    status: Optional[str] = Query(None, description="Duruma göre filtrele: queued, running, succeeded, failed, cancelled")
+):
+    """Tüm tarama işlerini en yeniden eskiye listeler."""
+    return {"jobs": [job.to_dict() for job in job_manager.list_jobs(status)]}
+
+@router.get("/{job_id}")
+async def get_job_endpoint(job_id: str):
+    """
+    İşin durumunu ve ilerlemesini döndürür: taranan sayfa/ürün/yorum sayıları,
+    anlık hız ve tahmini kalan süre (eta_seconds).
+    """
+    return _get_job_or_404(job_id).to_dict()
+
+@router.delete("/{job_id}")
+async def cancel_job_endpoint(job_id: str):
+    """Kuyruktaki veya çalışan işi iptal eder. Bitmiş işler olduğu gibi döner."""
+    _get_job_or_404(job_id)
+    job = await job_manager.cancel(job_id)
+    return job.to_dict()
+
+@router.get("/{job_id}/result")
+async def get_job_result_endpoint(job_id: str):
+    """Başarıyla bitmiş işin sonucunu (servisin döndürdüğü JSON) döndürür."""
+    job = _get_job_or_404(job_id)
+    result_path = job_manager.result_path(job_id)
+    if job.status != JOB_SUCCEEDED or not os.path.exists(result_path):
+        raise HTTPException(status_code=409, detail=f"İş sonucu hazır değil (durum: {job.status})")
+    return FileResponse(result_path, media_type="application/json")
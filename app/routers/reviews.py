@@ -0,0 +1,92 @@
+from fastapi import APIRouter, Query, HTTPException
+from typing import Optional
+
+from ..utils.review_store import review_store
+from ..utils.json_codec import FastJSONResponse
+
+MARKETPLACES = ("trendyol", "hepsiburada")
+
+router = APIRouter(
+    prefix="/reviews",
+    tags=["reviews"],
+    responses={404: {"description": "Not found"}},
+)
+
+def _check_marketplace(marketplace: Optional[str]) -> None:
+    if marketplace is not None and marketplace not in MARKETPLACES:
+        raise HTTPException(status_code=400, detail=f"Geçersiz pazaryeri. Geçerli değerler: {', '.join(MARKETPLACES)}")
+
+@router.get("/search")
+async def search_reviews_endpoint(
+    q: str = Query(..., min_length=1, description="Aranacak kelimeler. Örnek: kargo kırık (sonuna * eklenirse önek araması yapılır)"),
+    marketplace: Optional[str] = Query(None, description="trendyol veya hepsiburada"),
+    product_id: Optional[str] = Query(None, description="Trendyol contentId veya Hepsiburada SKU"),
+    min_rating: Optional[float] = Query(None, ge=0, le=5, description="En düşük puan"),
+    max_rating: Optional[float] = Query(None, ge=0, le=5, description="En yüksek puan"),
+    since: Optional[str] = Query(None, description="Bu tarihten (ISO, ör. 2024-01-01) sonraki yorumlar"),
+    until: Optional[str] = Query(None, description="Bu tarihe (ISO) kadar olan yorumlar"),
+    limit: int = Query(20, ge=1, le=200, description="Sayfa başına sonuç sayısı"),
+    offset: int = Query(0, ge=0, description="Atlanacak sonuç sayısı")
+):
+    """
+    Depodaki tüm yorumlarda tam metin arama yapar (Türkçe büyük/küçük harf ve
+    aksan duyarsız: "KIRIK", "kırık" ve "kirik" aynı sonuçları verir).
+    Sonuçlar alaka düzeyine (bm25) göre sıralanır.
+    """
+    _check_marketplace(marketplace)
+    result = await review_store.search(
+        q,
+        marketplace=marketplace,
+        product_id=product_id,
+        min_rating=min_rating,
+        max_rating=max_rating,
+        since=since,
+        until=until,
+        limit=limit,
+        offset=offset,
+    )
+    return FastJSONResponse({**result, "limit": limit, "offset": offset})
+
+@router.get("/products")
+async def list_products_endpoint(
+    marketplace: Optional[str] = Query(None, description="trendyol veya hepsiburada"),
+    limit: int = Query(50, ge=1, le=500, description="Sayfa başına ürün sayısı"),
+    offset: int = Query(0, ge=0, description="Atlanacak ürün sayısı")
+):
+    """
+    Yorum deposundaki ürünleri (son güncellenen önce) yorum sayılarıyla listeler.
+    Yeniden tarama yapmaz.
+    """
+    _check_marketplace(marketplace)
+    products = await review_store.list_products(marketplace, limit=limit, offset=offset)
+    return {"products": products, "limit": limit, "offset": offset}
+
+@router.get("/products/{marketplace}/{product_id}")
+async def get_product_endpoint(marketplace: str, product_id: str):
+    """
+    Depodaki bir ürünü ve özelliklerini döndürür.
+
+    - **marketplace**: trendyol veya hepsiburada
+    - **product_id**: Trendyol contentId veya Hepsiburada SKU
+    """
+    _check_marketplace(marketplace)
+    product = await review_store.get_product(marketplace, product_id)
+    if not product:
+        raise HTTPException(status_code=404, detail="Ürün depoda bulunamadı")
+    return product
+
+@router.get("/products/{marketplace}/{product_id}/reviews")
+async def get_product_reviews_endpoint(
+    marketplace: str,
+    product_id: str,
+    since: Optional[str] = Query(None, description="Bu tarihten (ISO, ör. 2024-01-01) sonraki yorumlar"),
+    until: Optional[str] = Query(None, description="Bu tarihe (ISO) kadar olan yorumlar"),
+    limit: int = Query(100, ge=1, le=1000, description="Sayfa başına yorum sayısı"),
+    offset: int = Query(0, ge=0, description="Atlanacak yorum sayısı")
+):
+    """
+    Depodaki bir ürünün yorumlarını en yeniden eskiye döndürür.
+    """
+    _check_marketplace(marketplace)
+    reviews = await review_store.get_reviews(marketplace, product_id, since=since, until=until, limit=limit, offset=offset)
+    return FastJSONResponse({"reviews": reviews, "limit": limit, "offset": offset})
@@ -1,6 +1,9 @@
 from fastapi import APIRouter, Query, HTTPException
 from typing import Optional
 from ..services.trendyol_service import get_product_reviews, search_products
+from ..utils.streaming import STREAM_FORMATS, stream_products
+from ..utils.parquet_writer import EXPORT_FORMATS, PYARROW_AVAILABLE
+from ..utils.json_codec import FastJSONResponse
 
 router = APIRouter(
     prefix="/trendyol",
@@ -11,13 +14,19 @@ router = APIRouter(
 @router.get("/urun-yorumlari")
 async def get_product_reviews_endpoint(
     url: str = Query(..., description="Trendyol ürün arama URL'si. Örnek: https://www.trendyol.com/sr?q=telefon"),
-    export_csv: bool = Query(False, description="Yorumları CSV dosyasına aktarmak için 'true' olarak ayarlayın")
+    export_csv: bool = Query(False, description="Yorumları CSV dosyasına aktarmak için 'true' olarak ayarlayın"),
+    incremental: bool = Query(False, description="Sadece bir önceki taramadan sonra gelen yeni yorumları çekmek için 'true' olarak ayarlayın"),
+    format: str = Query("json", description="Yanıt formatı: json, ndjson (satır başına bir ürün) veya sse (Server-Sent Events)"),
+    export_format: str = Query("csv", description="Dosya biçimi: csv veya parquet (tipli sütunlar; parquet seçilirse dosyaya aktarım otomatik açılır)")
 ):
     """
     Trendyol ürün yorumlarını çeker ve döndürür.
     
     - **url**: Trendyol arama sayfası URL'si
     - **export_csv**: Yorumları CSV dosyasına aktarmak için true/false
+    - **incremental**: Ürün başına saklanan su seviyesine kadar sadece yeni yorumları çek
+    - **format**: ndjson/sse ile her ürün yorumlarıyla birlikte işlendiği anda gönderilir
+    - **export_format**: csv veya parquet (özellikler map, medya URL'leri list sütunu olarak)
     """
     if not url:
         raise HTTPException(status_code=400, detail="URL parametresi gerekli. Örnek: ?url=https://www.trendyol.com/sr?q=telefon")
@@ -25,12 +34,28 @@ async def get_product_reviews_endpoint(
     if not url.startswith("https://www.trendyol.com"):
         raise HTTPException(status_code=400, detail="Geçerli bir Trendyol URL'si değil. URL 'https://www.trendyol.com' ile başlamalıdır.")
     
-    result = await get_product_reviews(url, export_csv)
+    if format not in STREAM_FORMATS:
+        raise HTTPException(status_code=400, detail=f"Geçersiz format: {format}. Seçenekler: {', '.join(STREAM_FORMATS)}")
+    
+    if export_format not in EXPORT_FORMATS:
+        raise HTTPException(status_code=400, detail=f"Geçersiz export_format: {export_format}. Seçenekler: {', '.join(EXPORT_FORMATS)}")
+    if export_format == "parquet":
+        if not PYARROW_AVAILABLE:
+            raise HTTPException(status_code=400, detail="Parquet dışa aktarımı için sunucuda pyarrow kurulu olmalıdır.")
+        export_csv = True
+    
+    if format != "json":
+        if export_csv:
+            raise HTTPException(status_code=400, detail="Dosyaya aktarım (export_csv/export_format=parquet) sadece format=json ile kullanılabilir.")
+        return stream_products(lambda on_product: get_product_reviews(url, incremental=incremental, on_product=on_product), format)
+    
+    result = await get_product_reviews(url, export_csv, incremental, export_format=export_format)
     
     if not result.get("success", False):
         raise HTTPException(status_code=500, detail=result.get("error", "Bilinmeyen bir hata oluştu"))
     
-    return result
+    # Büyük sonuç: jsonable_encoder geçişini atlayıp doğrudan serileştir
+    return FastJSONResponse(result)
 
 @router.get("/search")
 async def search_products_endpoint(
@@ -1,75 +1,297 @@
 from ..parsers.hepsiburada_parser import fetch_products_from_search, fetch_product_reviews, fetch_product_features
-from typing import Dict, Any, List, Optional
+from typing import Any, Awaitable, Callable, Dict, List, Optional
 import asyncio
 import csv
 import os
-import json
 from datetime import datetime
 from urllib.parse import urlparse, urlencode, parse_qs, urlunparse
-import random
 import logging
 import math
 
 from app.core.config import settings
+from app.utils.pagination import fetch_pages_concurrently, fetch_pages_until
+from app.utils.csv_writer import CsvWriterStage
+from app.utils.parquet_writer import ParquetWriterStage
+from app.utils.pipeline import Stage, UniqueWorkQueue, run_staged_pipeline
+from app.utils.watermarks import watermark_store
+from app.utils.review_store import review_store
+from app.utils.dedupe import ReviewDeduplicator
+from app.utils.progress import CrawlProgress
+from app.utils.checkpoint import CrawlCheckpoint
+from app.utils import json_codec
 
 logger = logging.getLogger(__name__)
 
-async def get_hepsiburada_product_info_and_reviews(url: str, export_csv: bool = False) -> Dict[str, Any]:
+def _build_search_page_url(url: str, page_num: int) -> str:
+    """Arama URL'sinin 'sayfa' parametresini verilen sayfa numarasıyla değiştirir."""
+    parsed_url = urlparse(url)
+    query_params = parse_qs(parsed_url.query)
+    query_params['sayfa'] = [str(page_num)]
+    next_page_url_parts = list(parsed_url)
+    next_page_url_parts[4] = urlencode(query_params, doseq=True)
+    return urlunparse(next_page_url_parts)
+
+def _build_product_rows(processed_product: Dict[str, Any], encode_nested: bool = True) -> List[Dict[str, Any]]:
     """
-    Orchestrates fetching products and reviews. If export_csv is True, data is
-    written to the file instantly after each product is processed. Otherwise,
-    data is processed concurrently and returned as JSON.
+    İşlenmiş bir ürünün dışa aktarım satırlarını (yorum başına bir satır) oluşturur.
+    encode_nested=False ise özellikler ve medya URL'leri JSON string'e çevrilmez
+    (Parquet'te map/list sütunu olarak yazılır).
     """
-    try:
-        all_products_from_search = []
+    features = processed_product.get('features', {})
+    features_json = json_codec.dumps(features) if encode_nested else features
+    if not processed_product.get('reviews'): # Product has no reviews
+        return [{
+            'product_name': processed_product.get('product_name'),
+            'sku': processed_product.get('sku'),
+            'price': processed_product.get('price'),
+            'product_url': processed_product.get('product_url', ''),
+            'product_features': features_json
+        }]
+
+    rows = []
+    for review in processed_product['reviews']:
+        media_list = review.get('media', []) or []
         
-        logger.info("Hepsiburada ürün listesi ve sayfa sayısı çekiliyor...")
-        first_page_result = await fetch_products_from_search(url)
+        # Gelen URL'lerin sonundaki ":webp" uzantısını kaldır
+        cleaned_urls = [
+            media.get('fullMediaUrl').removesuffix(':webp')
+            for media in media_list
+            if media.get('fullMediaUrl')
+        ]
+        media_urls = json_codec.dumps(cleaned_urls) if encode_nested else cleaned_urls
+
+        # Yorum içeriğini güvenli bir string haline getir
+        review_content = review.get('review', {}).get('content') # Önce içeriği al
+        # Eğer içerik None değilse temizle, None ise boş string ata
+        safe_review_content = review_content.replace('\n', ' ').replace('\r', ' ') if review_content else ""
+
+        rows.append({
+            'product_name': processed_product.get('product_name'),
+            'sku': processed_product.get('sku'),
+            'price': processed_product.get('price'),
+            'product_url': processed_product.get('product_url', ''), 
+            'review_content': safe_review_content,
+            'review_star': review.get('star'),
+            'review_created_at': review.get('createdAt'),
+            'customer_name': review.get('customer', {}).get('name'),
+            'customer_surname': review.get('customer', {}).get('surname'),
+            'customer_display_name': review.get('customer', {}).get('displayName'),
+            'media_urls': media_urls,
+            'product_features': features_json
+        })
+    return rows
+
+async def _store_product(processed_product: Dict[str, Any]) -> None:
+    """İşlenmiş ürünü, özelliklerini ve yorumlarını yorum deposuna yazar."""
+    sku = processed_product.get('sku')
+    await review_store.add_product(
+        "hepsiburada", sku,
+        name=processed_product.get('product_name'),
+        url=processed_product.get('product_url'),
+        price=processed_product.get('price'),
+        features=processed_product.get('features', {}),
+    )
+    await review_store.add_reviews("hepsiburada", sku, processed_product.get('reviews', []))
+
+async def run_product_scheduler(
+    produce_products: Callable[[UniqueWorkQueue], Awaitable[None]],
+    sink: Callable[[int, Optional[Dict[str, Any]]], Awaitable[None]],
+    incremental: bool = False,
+    dedupe: Optional[ReviewDeduplicator] = None,
+    progress: Optional[CrawlProgress] = None,
+) -> UniqueWorkQueue:
+    """
+    JSON ve CSV modlarının ortak zamanlayıcısı: features -> reviews -> sink.
+
+    Her aşamanın işçi sayısı ayrı ayarlanır (özellik aşaması Chrome sekmesi açar,
+    yorum aşaması sadece API çağrısı yapar). Aşamalar arası kuyruklar
+    HEPSIBURADA_STAGE_QUEUE_SIZE ile sınırlıdır; sink tek işçiyle çalışır ve her
+    ürünü ayrıca yorum deposuna yazar. dedupe verilirse sink'e daha önce görülmüş
+    yorumlar (ör. devam ettirilen işin önceki çalışmasında yazılanlar) iletilmez.
+    Çağıran görev iptal edilirse tüm aşamalar iptal edilir.
+    """
+    # Başarısız ürünler hattan düşürülmez, (index, None) olarak sink'e ulaşır;
+    # böylece sıralı yazıcı eksik indeksi beklemez
+    async def features_stage(job):
+        index, product, sku = job
+        return index, await fetch_single_product_features(product, sku)
+
+    async def reviews_stage(job):
+        index, product_info = job
+        if product_info is None:
+            return index, None
+        return index, await fetch_single_product_reviews(product_info, incremental=incremental)
+
+    async def sink_stage(job):
+        index, processed_product = job
+        digests = None
+        if processed_product:
+            await _store_product(processed_product)
+            if dedupe is not None and processed_product.get('reviews'):
+                processed_product['reviews'], digests = dedupe.check("hepsiburada", processed_product.get('sku'), processed_product['reviews'])
+        await sink(index, processed_product)
+        # Yorumlar ancak sink'e (ör. CSV yazıcı kuyruğuna) ulaştıktan sonra görülmüş sayılır;
+        # sink beklerken iptal edilen ürün devam eden taramada yorumlarıyla tekrar yazılır
+        if digests:
+            dedupe.commit(digests)
+        if progress is not None:
+            progress.product_done()
+            if processed_product:
+                progress.reviews_added(len(processed_product.get('reviews', [])))
+
+    # Bir aşama hata verirse ürün de (index, None) olarak iletilir, sink'e mutlaka ulaşır
+    def skip_failed(job, error):
+        return job[0], None
+
+    async def sink_failed(job, error):
+        await sink(job[0], None)
+        if progress is not None:
+            progress.product_done()
+
+    stages = [
+        Stage("features", features_stage, settings.HEPSIBURADA_FEATURE_WORKERS, settings.HEPSIBURADA_STAGE_QUEUE_SIZE, on_error=skip_failed),
+        Stage("reviews", reviews_stage, settings.HEPSIBURADA_REVIEW_WORKERS, settings.HEPSIBURADA_STAGE_QUEUE_SIZE, on_error=skip_failed),
+        Stage("sink", sink_stage, 1, settings.HEPSIBURADA_STAGE_QUEUE_SIZE, on_error=sink_failed),
+    ]
+    try:
+        queue = await run_staged_pipeline(produce_products, stages)
+    finally:
+        await review_store.flush()
+        if incremental:
+            watermark_store.save()
+    logger.info(f"Hepsiburada zamanlayıcı istatistikleri: {queue.stats()} {[(stage.name, stage.stats()) for stage in stages]}")
+    return queue
+
+async def get_hepsiburada_product_info_and_reviews(
+    url: str,
+    export_csv: bool = False,
+    incremental: bool = False,
+    dedupe: Optional[ReviewDeduplicator] = None,
+    progress: Optional[CrawlProgress] = None,
+    checkpoint: Optional[CrawlCheckpoint] = None,
+    on_product: Optional[Callable[[Dict[str, Any]], Awaitable[None]]] = None,
+    export_format: str = "csv",
+) -> Dict[str, Any]:
+    """
+    Orchestrates fetching products and reviews.
+
+    The first search page gives the page count; the remaining search pages are
+    fetched concurrently and every new SKU is handed to the product workers as
+    soon as its page arrives. Products then go through the shared features ->
+    reviews scheduler (run_product_scheduler). If export_csv is True, rows are
+    written by a single queue-fed writer stage as products complete. Otherwise,
+    data is returned as JSON.
+
+    With incremental=True only reviews newer than each SKU's watermark from the
+    previous crawl are fetched (newest-first, stopping at the watermark).
+
+    Reviews are deduplicated by a fixed-size hash of their stable identifier;
+    pass a restored ReviewDeduplicator to skip reviews emitted by an earlier
+    run of a resumed job. Page/product/review counters are reported through
+    `progress` when given (used by background jobs).
+
+    With a checkpoint (CSV export only), finished search pages and SKUs whose
+    rows have been fsynced are recorded; a resumed crawl truncates the CSV to the
+    checkpointed size, appends to it and skips the finished work. Review pages
+    are fetched per product, so an unfinished product is fetched again.
+
+    In JSON mode, passing on_product streams every processed product (with its
+    reviews) to that callback as soon as it completes instead of collecting
+    them; the returned dict then carries only the product count.
+
+    export_format="parquet" writes the export as typed Parquet row groups
+    (features as map, media URLs as list columns) instead of CSV; checkpoints
+    only apply to CSV exports.
+    """
+    if dedupe is None:
+        dedupe = ReviewDeduplicator()
+    if progress is None:
+        progress = CrawlProgress()
+    if not export_csv or export_format != "csv":
+        checkpoint = None
+    try:
+        if checkpoint is not None and checkpoint.search_page_done(1) and checkpoint.total_pages:
+            logger.info(f"Kontrol noktasından devam ediliyor: {checkpoint.products_done} ürün zaten tamamlanmış.")
+            first_page_result = {'products': [], 'lastPage': checkpoint.total_pages}
+        else:
+            logger.info("Hepsiburada ürün listesi ve sayfa sayısı çekiliyor...")
+            first_page_result = await fetch_products_from_search(url)
 
         if not first_page_result or 'products' not in first_page_result:
              logger.error("Başlangıç ürün sayfası çekilemedi, işlem durduruldu.")
              return {"success": False, "error": "Failed to fetch initial product page."}
 
-        all_products_from_search.extend(first_page_result.get('products', []))
         last_page = first_page_result.get('lastPage', 1)
-        
         logger.info(f"Toplam {last_page} sayfa bulundu.")
+        progress.set_pages_total(last_page)
+        progress.page_done()
+        if checkpoint is not None:
+            checkpoint.total_pages = last_page
+
+        async def enqueue_products(queue: UniqueWorkQueue, products: List[Dict[str, Any]], page_num: Optional[int] = None) -> None:
+            enqueued = []
+            for product in products:
+                sku = product.get('variantList', [{}])[0].get('sku')
+                if not sku or (checkpoint is not None and checkpoint.product_done(sku)):
+                    continue
+                if await queue.put(sku, (queue.enqueued, product, sku)):
+                    enqueued.append((sku, product))
+                    progress.products_found()
+            if checkpoint is not None and page_num is not None:
+                checkpoint.mark_search_page(page_num, enqueued)
 
-        if last_page > 1: # 1. SAYFA KISITLAMASI KALDIRILDI
-            parsed_url = urlparse(url)
-            query_params = parse_qs(parsed_url.query)
+        async def produce_products(queue: UniqueWorkQueue) -> None:
+            if checkpoint is not None:
+                # Önceki çalışmada kuyruğa alınmış ama CSV'ye yazılmamış ürünler önce işlenir
+                await enqueue_products(queue, [product for _, product in checkpoint.pending_products()])
+            await enqueue_products(queue, first_page_result.get('products', []), page_num=1)
+            if last_page <= 1:
+                return
 
-            for page_num in range(2, last_page + 1):
+            async def fetch_search_page(page_num: int) -> Optional[Dict[str, Any]]:
                 logger.info(f"📄 Sayfa {page_num}/{last_page} çekiliyor...")
-                query_params['sayfa'] = [str(page_num)]
-                
-                new_query_string = urlencode(query_params, doseq=True)
-                next_page_url_parts = list(parsed_url)
-                next_page_url_parts[4] = new_query_string
-                next_page_url = urlunparse(next_page_url_parts)
-                
-                page_result = await fetch_products_from_search(next_page_url)
-                if page_result and 'products' in page_result:
-                    all_products_from_search.extend(page_result.get('products', []))
-                else:
+                page_result = await fetch_products_from_search(_build_search_page_url(url, page_num))
+                if not page_result or 'products' not in page_result:
                     logger.warning(f"⚠️ Sayfa {page_num} için ürünler çekilemedi. Devam ediliyor...")
-                
-                # Sunucuyu yormamak için sayfalar arasında makul ve rastgele bir süre bekle
-                wait_time = random.uniform(settings.HEPSIBURADA_API_MIN_WAIT_TIME, settings.HEPSIBURADA_API_MAX_WAIT_TIME)
-                await asyncio.sleep(wait_time)
-        
-        product_count = len(all_products_from_search)
-        logger.info(f"Toplam {product_count} ürün bulundu. Yorum ve detaylar çekilecek...")
+                    return None
+                return page_result
 
-        if not all_products_from_search:
-            logger.info("Hiç ürün bulunamadı.")
-            return {"success": True, "message": "No products found."}
+            async def on_search_page(page_num: int, products: List[Dict[str, Any]]) -> None:
+                progress.page_done()
+                await enqueue_products(queue, products, page_num=page_num)
+
+            # Kalan arama sayfaları paralel çekilir, ürünler geldiği anda kuyruğa girer
+            remaining_pages = [
+                page_num for page_num in range(2, last_page + 1)
+                if checkpoint is None or not checkpoint.search_page_done(page_num)
+            ]
+            progress.page_done(last_page - 1 - len(remaining_pages))
+            await fetch_pages_concurrently(
+                fetch_search_page,
+                remaining_pages,
+                extract_items=lambda page_result: page_result.get('products', []),
+                concurrency=settings.SEARCH_PAGE_CONCURRENCY,
+                on_page=on_search_page,
+            )
 
         # --- CSV EXPORT LOGIC ---
         if export_csv:
             os.makedirs(settings.DOWNLOADS_DIR, exist_ok=True) # Dizin'in var olduğundan emin ol
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
             file_path = os.path.join(settings.DOWNLOADS_DIR, f"hepsiburada_reviews_{timestamp}.csv")
+            resume_offset = 0
+            on_sync = None
+            if checkpoint is not None:
+                # Devam eden taramada önceki çalışmanın CSV dosyasına eklenir
+                file_path = checkpoint.output_file or file_path
+                resume_offset = checkpoint.prepare_output(file_path)
+
+                async def on_sync(skus: List[str], offset: int) -> None:
+                    # Satırları diske yazılmış ürünler tamamlandı sayılır
+                    for sku in skus:
+                        checkpoint.mark_product_done(sku)
+                    # Tekilleştirme durumu kontrol noktasıyla aynı anda yazılır
+                    await checkpoint.save(output_offset=offset, dedupe=dedupe)
             
             headers = [
                 'product_name', 'sku', 'price', 'product_url', 'review_content', 'review_star', 
@@ -77,89 +299,96 @@ async def get_hepsiburada_product_info_and_reviews(url: str, export_csv: bool =
                 'media_urls', 'product_features'
             ]
 
-            with open(file_path, 'w', newline='', encoding='utf-8') as f:
-                writer = csv.DictWriter(f, fieldnames=headers)
-                writer.writeheader()
-                
-                for i, product in enumerate(all_products_from_search):
-                    # logger.info(f"[{i+1}/{product_count}] Ürün işleniyor: {product.get('variantList', [{}])[0].get('sku')}")
-                    sku = product.get('variantList', [{}])[0].get('sku')
-                    if not sku:
-                        continue
-                    
-                    processed_product = await process_single_product(product, sku)
-                    if processed_product:
-                        # Append to CSV instantly
-                        if processed_product.get('reviews'):
-                            features_json = json.dumps(processed_product.get('features', {}), ensure_ascii=False)
-                            for review in processed_product['reviews']:
-                                media_list = review.get('media', []) or []
-                                
-                                # Gelen URL'lerin sonundaki ":webp" uzantısını kaldır
-                                cleaned_urls = [
-                                    media.get('fullMediaUrl').removesuffix(':webp')
-                                    for media in media_list
-                                    if media.get('fullMediaUrl')
-                                ]
-                                media_urls = json.dumps(cleaned_urls, ensure_ascii=False)
-
-
-                                # Yorum içeriğini güvenli bir string haline getir
-                                review_content = review.get('review', {}).get('content') # Önce içeriği al
-                                # Eğer içerik None değilse temizle, None ise boş string ata
-                                safe_review_content = review_content.replace('\n', ' ').replace('\r', ' ') if review_content else ""
-
-
-                                writer.writerow({
-                                    'product_name': processed_product.get('product_name'),
-                                    'sku': processed_product.get('sku'),
-                                    'price': processed_product.get('price'),
-                                    'product_url': processed_product.get('product_url', ''), 
-                                    'review_content': safe_review_content,
-                                    'review_star': review.get('star'),
-                                    'review_created_at': review.get('createdAt'),
-                                    'customer_name': review.get('customer', {}).get('name'),
-                                    'customer_surname': review.get('customer', {}).get('surname'),
-                                    'customer_display_name': review.get('customer', {}).get('displayName'),
-                                    'media_urls': media_urls,
-                                    'product_features': features_json
-                                })
-                        else: # Product has no reviews
-                             writer.writerow({
-                                'product_name': processed_product.get('product_name'),
-                                'sku': processed_product.get('sku'),
-                                'price': processed_product.get('price'),
-                                'product_url': processed_product.get('product_url', ''),
-                                'product_features': json.dumps(processed_product.get('features', {}), ensure_ascii=False)
-                            })
-
-            logger.info(f"Veriler başarıyla CSV dosyasına aktarıldı: {file_path}")
+            if export_format == "parquet":
+                # Parquet: özellikler map, medya URL'leri list sütunu olarak row group'lar halinde yazılır
+                file_path = os.path.join(settings.DOWNLOADS_DIR, f"hepsiburada_reviews_{timestamp}.parquet")
+                async with ParquetWriterStage(file_path, "hepsiburada") as parquet_writer:
+
+                    async def write_product(index: int, processed_product: Optional[Dict[str, Any]]) -> None:
+                        rows = _build_product_rows(processed_product, encode_nested=False) if processed_product else []
+                        await parquet_writer.put(index, rows, key=processed_product.get('sku') if processed_product else None)
+
+                    queue = await run_product_scheduler(produce_products, write_product, incremental=incremental, dedupe=dedupe, progress=progress)
+            else:
+                # DictWriter'ın tek sahibi yazıcı aşamasıdır; ürünler paralel işlenir,
+                # satırlar tamamlanma (veya CSV_WRITER_ORDERED ile arama) sırasıyla yazılır
+                async with CsvWriterStage(file_path, headers, resume_offset=resume_offset, on_sync=on_sync) as csv_writer:
+
+                    async def write_product(index: int, processed_product: Optional[Dict[str, Any]]) -> None:
+                        # Başarısız ürünler anahtarsız gönderilir; devam eden taramada tekrar denenir
+                        rows = _build_product_rows(processed_product) if processed_product else []
+                        await csv_writer.put(index, rows, key=processed_product.get('sku') if processed_product else None)
+
+                    queue = await run_product_scheduler(produce_products, write_product, incremental=incremental, dedupe=dedupe, progress=progress)
+
+            if not queue.enqueued:
+                logger.info("Hiç ürün bulunamadı.")
+                return {"success": True, "message": "No products found."}
+
+            logger.info(f"{queue.enqueued} ürünün verileri başarıyla {export_format.upper()} dosyasına aktarıldı: {file_path}")
             return {"success": True, "message": f"Data successfully exported to {file_path}"}
 
+        # --- STREAMING RESPONSE LOGIC ---
+        elif on_product is not None:
+
+            async def stream_product(index: int, processed_product: Optional[Dict[str, Any]]) -> None:
+                if processed_product:
+                    await on_product(processed_product)
+
+            queue = await run_product_scheduler(produce_products, stream_product, incremental=incremental, dedupe=dedupe, progress=progress)
+            return {"success": True, "totalProducts": queue.enqueued}
+
         # --- JSON RESPONSE LOGIC ---
         else:
-            tasks = []
-            for product in all_products_from_search:
-                sku = product.get('variantList', [{}])[0].get('sku')
-                if sku:
-                    tasks.append(process_single_product(product, sku))
-            
-            processed_products = await asyncio.gather(*tasks)
-            all_product_data = [p for p in processed_products if p]
+            processed_products = {}
+
+            async def collect_product(index: int, processed_product: Optional[Dict[str, Any]]) -> None:
+                if processed_product:
+                    processed_products[index] = processed_product
+
+            queue = await run_product_scheduler(produce_products, collect_product, incremental=incremental, dedupe=dedupe, progress=progress)
+
+            if not queue.enqueued:
+                logger.info("Hiç ürün bulunamadı.")
+                return {"success": True, "message": "No products found."}
+
+            # Sonuçlar, ürünlerin arama sonuçlarında bulunduğu sırayla döndürülür
+            all_product_data = [processed_products[i] for i in sorted(processed_products)]
             return {"success": True, "data": all_product_data}
 
     except Exception as e:
         logger.error(f"Servis katmanında bir hata oluştu: {e}", exc_info=True)
         return {"success": False, "error": str(e)}
 
-async def process_single_product(product: Dict[str, Any], sku: str) -> Optional[Dict[str, Any]]:
+def _extract_review_list(response: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Yorum API yanıtından (yeni veya eski format) yorum listesini çıkarır."""
+    if not response or not isinstance(response, dict):
+        return []
+    data_node = response.get('data', {})
+    if not isinstance(data_node, dict):
+        return []
+    if 'approvedUserContent' in data_node:
+        return data_node.get('approvedUserContent', {}).get('approvedUserContentList', []) or []
+    if 'approvedUserContents' in data_node:
+        return data_node.get('approvedUserContents', {}).get('userContents', []) or []
+    return []
+
+def _product_full_url(reviews: List[Dict[str, Any]], product_url_path: Optional[str]) -> str:
+    if reviews:
+        # Yorum varsa, oradaki tam URL'i kullanmak daha garantidir
+        return reviews[0].get('product', {}).get('url')
+    if product_url_path:
+        # Yorum yoksa, arama sonucundaki path'ten tam URL oluştur
+        return f"{settings.HEPSIBURADA_BASE_URL}/{product_url_path}"
+    return ""
+
+async def fetch_single_product_features(product: Dict[str, Any], sku: str) -> Optional[Dict[str, Any]]:
     """
-    Helper function to process a single product: get its info and reviews.
+    Ürün işlemenin ilk aşaması: arama sonucundaki temel bilgileri çıkarır ve
+    ürün sayfasından özellikleri çeker (Chrome sekmesi açan aşama).
     """
     try:
         variant_info = product.get('variantList', [{}])[0]
-        product_name = variant_info.get('name')
-        price = variant_info.get('listing', {}).get('priceInfo', {}).get('price')
         product_url_path = variant_info.get('url') # Arama sonucundan gelen ürün URL path'i
 
         # Ürün özelliklerini, yorum olup olmamasından bağımsız olarak her zaman çek
@@ -170,10 +399,66 @@ async def process_single_product(product: Dict[str, Any], sku: str) -> Optional[
         else:
             logger.warning(f"  - SKU {sku} için ürün URL'si arama sonucunda bulunamadı, özellikler çekilemiyor.")
 
+        return {
+            "product_name": variant_info.get('name'),
+            "sku": sku,
+            "price": variant_info.get('listing', {}).get('priceInfo', {}).get('price'),
+            "features": features,
+            "product_url_path": product_url_path,
+        }
+    except Exception as e:
+        logger.error(f"❌ '{sku}' SKU'lu ürün işlenirken hata oluştu: {e}", exc_info=True)
+        return None
+
+async def fetch_new_product_reviews(sku: str) -> List[Dict[str, Any]]:
+    """
+    Artımlı tarama: yorumları en yeniden eskiye `from`/`size` sayfalarıyla sırayla
+    çeker ve SKU'nun su seviyesini geçen ilk sayfada durur. Tarama tamamlanırsa
+    su seviyesi ilerletilir.
+    """
+    page_size = settings.HEPSIBURADA_REVIEW_PAGE_SIZE
+    watermark = watermark_store.get("hepsiburada", sku)
+
+    async def fetch_page(page_num: int) -> Optional[Dict[str, Any]]:
+        # Başarısız istek {} döner; bunu boş sayfa değil hata olarak işaretle
+        response = await fetch_product_reviews(sku, page=page_num, size=page_size, sort_params=settings.HEPSIBURADA_NEWEST_FIRST_PARAMS)
+        return response or None
 
+    new_reviews, complete = await fetch_pages_until(
+        fetch_page,
+        range(0, settings.HEPSIBURADA_MAX_REVIEW_PAGES),
+        extract_items=_extract_review_list,
+        split_new=lambda page_reviews: watermark_store.split_new("hepsiburada", watermark, page_reviews),
+    )
+    if complete:
+        watermark_store.advance("hepsiburada", sku, new_reviews)
+    else:
+        logger.warning(f"  - SKU {sku} için artımlı tarama yarıda kaldı, su seviyesi ilerletilmedi.")
+    logger.info(f"SKU {sku} için {len(new_reviews)} yeni yorum bulundu.")
+    return new_reviews
+
+async def fetch_single_product_reviews(product_info: Dict[str, Any], incremental: bool = False) -> Optional[Dict[str, Any]]:
+    """
+    Ürün işlemenin ikinci aşaması: `fetch_single_product_features` çıktısına
+    ürünün tüm yorumlarını (artımlı modda sadece yeni yorumlarını) ekler.
+    """
+    sku = product_info["sku"]
+    product_url_path = product_info.get("product_url_path")
+    try:
         all_reviews = []
         page_size = settings.HEPSIBURADA_REVIEW_PAGE_SIZE
         
+        if incremental:
+            all_reviews = await fetch_new_product_reviews(sku)
+            return {
+                "product_name": product_info.get("product_name"),
+                "sku": sku,
+                "price": product_info.get("price"),
+                "reviews": all_reviews,
+                "features": product_info.get("features", {}),
+                "product_url": _product_full_url(all_reviews, product_url_path)
+            }
+        
         # 1. İlk sayfayı çek ve toplam yorum sayısını öğren
         first_page_response = await fetch_product_reviews(sku, page=0, size=page_size)
         
@@ -183,11 +468,11 @@ async def process_single_product(product: Dict[str, Any], sku: str) -> Optional[
             logger.warning(f"  - SKU {sku} için geçerli bir yorum verisi alınamadı.")
             # Yorum olmasa bile ürün temel bilgilerini ve özelliklerini döndür
             return {
-                "product_name": product_name, 
+                "product_name": product_info.get("product_name"), 
                 "sku": sku, 
-                "price": price, 
+                "price": product_info.get("price"), 
                 "reviews": [],
-                "features": features,
+                "features": product_info.get("features", {}),
                 "product_url": f"{settings.HEPSIBURADA_BASE_URL}/{product_url_path}" if product_url_path else ""
             }
 
@@ -203,52 +488,28 @@ async def process_single_product(product: Dict[str, Any], sku: str) -> Optional[
                 all_reviews.extend(content_node.get('userContents', []))
                 total_reviews = content_node.get('listCount', 0)
 
-        # logger.info(f"  - Toplam {total_reviews} yorum bulundu. İlk sayfadan {len(all_reviews)} yorum alındı.")
-
         # 2. Gerekliyse diğer sayfaları da çek
         if total_reviews > len(all_reviews):
             total_pages = math.ceil(total_reviews / page_size)
-            # logger.info(f"  - {sku} için {total_pages} sayfa yorum çekilecek.")
             
-            for page_num in range(1, int(total_pages)):
-                await asyncio.sleep(random.uniform(settings.HEPSIBURADA_API_MIN_WAIT_TIME, settings.HEPSIBURADA_API_MAX_WAIT_TIME)) # API'ye nefes aldır
-                
-                next_page_response = await fetch_product_reviews(sku, page=page_num, size=page_size)
-                
-                new_reviews = []
-                if next_page_response and isinstance(next_page_response, dict):
-                    data_node = next_page_response.get('data', {})
-                    if isinstance(data_node, dict):
-                        if 'approvedUserContent' in data_node:
-                            new_reviews = data_node.get('approvedUserContent', {}).get('approvedUserContentList', [])
-                        elif 'approvedUserContents' in data_node:
-                            new_reviews = data_node.get('approvedUserContents', {}).get('userContents', [])
-                
-                if new_reviews:
-                    all_reviews.extend(new_reviews)
-                else:
-                    logger.warning(f"    - Sayfa {page_num + 1} boş geldi, {sku} için yorum çekme işlemi durduruluyor.")
-                    break
+            # Kalan sayfaların indeksleri belli; sınırlı eşzamanlılıkla paralel çek
+            other_reviews = await fetch_pages_concurrently(
+                lambda page_num: fetch_product_reviews(sku, page=page_num, size=page_size),
+                range(1, int(total_pages)),
+                extract_items=_extract_review_list,
+            )
+            all_reviews.extend(other_reviews)
 
         logger.info(f"SKU {sku} için toplam {len(all_reviews)} yorum işlendi.")
 
-        product_full_url = ""
-        if all_reviews:
-            # Yorum varsa, oradaki tam URL'i kullanmak daha garantidir
-            product_full_url = all_reviews[0].get('product', {}).get('url')
-        elif product_url_path:
-            # Yorum yoksa, arama sonucundaki path'ten tam URL oluştur
-            product_full_url = f"{settings.HEPSIBURADA_BASE_URL}/{product_url_path}"
-
-
         return {
-            "product_name": product_name,
+            "product_name": product_info.get("product_name"),
             "sku": sku,
-            "price": price,
+            "price": product_info.get("price"),
             "reviews": all_reviews,
-            "features": features,
-            "product_url": product_full_url
+            "features": product_info.get("features", {}),
+            "product_url": _product_full_url(all_reviews, product_url_path)
         }
     except Exception as e:
         logger.error(f"❌ '{sku}' SKU'lu ürün işlenirken hata oluştu: {e}", exc_info=True)
-        return None
\ No newline at end of file
+        return None
@@ -0,0 +1,317 @@
+import asyncio
+import glob
+import logging
+import os
+import time
+import uuid
+from typing import Any, Dict, List, Optional
+
+from app.core.config import settings
+from app.utils.common import load_json_from_file, save_json_atomic
+from app.utils.checkpoint import CrawlCheckpoint
+from app.utils.dedupe import ReviewDeduplicator
+from app.utils.progress import CrawlProgress
+from app.services.trendyol_service import get_product_reviews
+from app.services.hepsiburada_service import get_hepsiburada_product_info_and_reviews
+
+logger = logging.getLogger(__name__)
+
+# Pazaryeri -> tarama fonksiyonu (url, export_csv, incremental, dedupe=, progress=, checkpoint=, export_format=)
+CRAWLERS = {
+    "trendyol": get_product_reviews,
+    "hepsiburada": get_hepsiburada_product_info_and_reviews,
+}
+
+JOB_QUEUED = "queued"
+JOB_RUNNING = "running"
+JOB_SUCCEEDED = "succeeded"
+JOB_FAILED = "failed"
+JOB_CANCELLED = "cancelled"
+FINISHED_STATUSES = (JOB_SUCCEEDED, JOB_FAILED, JOB_CANCELLED)
+
+
+class Job:
+    """Bir arka plan tarama işinin durumu; JSON olarak diske yazılır."""
+
+    def __init__(
+        self,
+        id: str,
+        marketplace: str,
+        url: str,
+        export_csv: bool = False,
+        incremental: bool = False,
+        export_format: str = "csv",
+        status: str = JOB_QUEUED,
+        created_at: Optional[float] = None,
+        started_at: Optional[float] = None,
+        finished_at: Optional[float] = None,
+        attempts: int = 0,
+        error: Optional[str] = None,
+        progress: Optional[Dict[str, Any]] = None,
+    ):
+        self.id = id
+        self.marketplace = marketplace
+        self.url = url
+        self.export_csv = export_csv
+        self.incremental = incremental
+        self.export_format = export_format
+        self.status = status
+        self.created_at = created_at if created_at is not None else time.time()
+        self.started_at = started_at
+        self.finished_at = finished_at
+        self.attempts = attempts
+        self.error = error
+        self.progress = progress
+
+    def to_dict(self) -> Dict[str, Any]:
+        return dict(vars(self))
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "Job":
+        return cls(**data)
+
+
+class JobManager:
+    """
+    Uzun süren taramaları HTTP isteğinden ayırıp arka planda çalıştırır.
+
+    - İşler FIFO kuyruğa alınır ve JOB_WORKERS adet işçi tarafından çalıştırılır;
+      tüm işler aynı paylaşılan altyapıyı (tarayıcı havuzu, HTTP client'ları,
+      hız sınırlayıcı, önbellek) kullanır.
+    - İş durumu `JOB_STATE_DIR/<id>.json`, sonucu `<id>.result.json` dosyasına yazılır.
+      Çalışan işin ilerlemesi JOB_PROGRESS_SAVE_INTERVAL aralıkla kaydedilir.
+    - Uygulama kapanırken (veya süreç çökerken) yarıda kalan işler bir sonraki
+      açılışta yeniden kuyruğa alınır. CSV'ye yazan işler `<id>.checkpoint.json`
+      kontrol noktasından devam eder: biten arama sayfaları, ürünler ve yorum
+      sayfaları tekrar çekilmez, aynı CSV dosyasına ekleme yapılır. Tekilleştirme
+      durumu da yalnızca bu işlerde korunur; diğer işler baştan ve boş bir
+      tekilleştiriciyle çalışır.
+    """
+
+    def __init__(
+        self,
+        state_dir: str = settings.JOB_STATE_DIR,
+        workers: int = settings.JOB_WORKERS,
+        max_queued: int = settings.JOB_MAX_QUEUED,
+        save_interval: float = settings.JOB_PROGRESS_SAVE_INTERVAL,
+    ):
+        self.state_dir = state_dir
+        self.workers = workers
+        self.max_queued = max_queued
+        self.save_interval = save_interval
+        self._jobs: Dict[str, Job] = {}
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker_tasks: List[asyncio.Task] = []
+        self._running: Dict[str, asyncio.Task] = {}
+        self._progress: Dict[str, CrawlProgress] = {}
+        self._cancel_requested: set = set()
+
+    # --- Dosya yolları ---
+
+    def _state_path(self, job_id: str) -> str:
+        return os.path.join(self.state_dir, f"{job_id}.json")
+
+    def result_path(self, job_id: str) -> str:
+        return os.path.join(self.state_dir, f"{job_id}.result.json")
+
+    def _checkpoint_path(self, job_id: str) -> str:
+        return os.path.join(self.state_dir, f"{job_id}.checkpoint.json")
+
+    def _dedupe_path(self, job_id: str) -> str:
+        return os.path.join(settings.DEDUPE_STATE_DIR, f"{job_id}.bin")
+
+    def _remove_state_files(self, dedupe_path: str, checkpoint: Optional[CrawlCheckpoint]) -> None:
+        # Bitmiş işin devam etme durumuna ihtiyacı yok
+        if checkpoint is not None:
+            checkpoint.delete()
+        if os.path.exists(dedupe_path):
+            os.remove(dedupe_path)
+
+    async def _save(self, job: Job) -> None:
+        try:
+            await asyncio.to_thread(save_json_atomic, job.to_dict(), self._state_path(job.id))
+        except Exception as e:
+            logger.error(f"İş durumu yazılamadı ({job.id}): {e}")
+
+    # --- Yaşam döngüsü ---
+
+    async def start(self) -> None:
+        if self._queue is not None:
+            return
+        self._queue = asyncio.Queue()
+        os.makedirs(self.state_dir, exist_ok=True)
+        pending = []
+        for path in glob.glob(os.path.join(self.state_dir, "*.json")):
+            if path.endswith((".result.json", ".checkpoint.json")):
+                continue
+            try:
+                job = Job.from_dict(load_json_from_file(path))
+            except Exception as e:
+                logger.error(f"İş durumu okunamadı ({path}): {e}")
+                continue
+            self._jobs[job.id] = job
+            if job.status not in FINISHED_STATUSES:
+                job.status = JOB_QUEUED
+                pending.append(job)
+        # Yarıda kalan işler oluşturulma sırasıyla yeniden kuyruğa alınır
+        for job in sorted(pending, key=lambda job: job.created_at):
+            self._queue.put_nowait(job.id)
+        if pending:
+            logger.info(f"{len(pending)} yarım kalmış tarama işi yeniden kuyruğa alındı")
+        self._worker_tasks = [asyncio.create_task(self._worker()) for _ in range(max(1, self.workers))]
+
+    async def stop(self) -> None:
+        """İşçileri durdurur; çalışan işler kuyruğa geri alınmış olarak kaydedilir."""
+        for task in self._worker_tasks:
+            task.cancel()
+        await asyncio.gather(*self._worker_tasks, return_exceptions=True)
+        self._worker_tasks = []
+        self._queue = None
+
+    # --- Public API ---
+
+    async def submit(
+        self,
+        marketplace: str,
+        url: str,
+        export_csv: bool = False,
+        incremental: bool = False,
+        export_format: str = "csv",
+    ) -> Optional[Job]:
+        """Yeni bir tarama işini kuyruğa alır. Kuyruk doluysa None döner."""
+        queued = sum(1 for job in self._jobs.values() if job.status == JOB_QUEUED)
+        if queued >= self.max_queued:
+            return None
+        job = Job(uuid.uuid4().hex, marketplace, url, export_csv=export_csv, incremental=incremental, export_format=export_format)
+        self._jobs[job.id] = job
+        await self._save(job)
+        self._queue.put_nowait(job.id)
+        logger.info(f"Tarama işi kuyruğa alındı: {job.id} ({marketplace})")
+        return job
+
+    def get(self, job_id: str) -> Optional[Job]:
+        job = self._jobs.get(job_id)
+        if job is not None and job.id in self._progress:
+            job.progress = self._progress[job.id].snapshot()
+        return job
+
+    def list_jobs(self, status: Optional[str] = None) -> List[Job]:
+        jobs = [self.get(job_id) for job_id in self._jobs]
+        if status:
+            jobs = [job for job in jobs if job.status == status]
+        return sorted(jobs, key=lambda job: job.created_at, reverse=True)
+
+    async def cancel(self, job_id: str) -> Optional[Job]:
+        """Kuyruktaki işi iptal eder, çalışan işi durdurur. Bitmiş işler değişmez."""
+        job = self._jobs.get(job_id)
+        if job is None or job.status in FINISHED_STATUSES:
+            return job
+        if job.status == JOB_QUEUED:
+            # İşçi kuyruktan aldığında durumu görüp atlar
+            job.status = JOB_CANCELLED
+            job.finished_at = time.time()
+            await self._save(job)
+            return job
+        self._cancel_requested.add(job_id)
+        job.status = JOB_CANCELLED
+        job.finished_at = time.time()
+        task = self._running.get(job_id)
+        if task is not None:
+            task.cancel()
+        return self.get(job_id)
+
+    # --- İşçiler ---
+
+    async def _worker(self) -> None:
+        while True:
+            job_id = await self._queue.get()
+            job = self._jobs.get(job_id)
+            if job is None or job.status != JOB_QUEUED:
+                continue
+            try:
+                await self._run(job)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Tarama işi beklenmeyen hatayla bitti ({job.id}): {e}", exc_info=True)
+
+    async def _run(self, job: Job) -> None:
+        crawler = CRAWLERS[job.marketplace]
+        progress = CrawlProgress()
+        dedupe_path = self._dedupe_path(job.id)
+        checkpoint = None
+        # Parquet dosyasının footer'ı kapanmadan yarıda kalan dosyaya eklenemez; devam etme sadece CSV'de
+        if job.export_csv and job.export_format == "csv":
+            checkpoint = await asyncio.to_thread(CrawlCheckpoint.load, self._checkpoint_path(job.id), dedupe_path)
+            if checkpoint.resumed:
+                progress.restore(checkpoint.products_done)
+        if checkpoint is not None and checkpoint.resumed:
+            dedupe = await asyncio.to_thread(ReviewDeduplicator.load, dedupe_path)
+        else:
+            # Çıktısı baştan üretilen iş önceki çalışmanın gördüğü yorumları da yazmalı
+            dedupe = ReviewDeduplicator()
+            if os.path.exists(dedupe_path):
+                os.remove(dedupe_path)
+
+        job.status = JOB_RUNNING
+        job.started_at = time.time()
+        job.attempts += 1
+        job.error = None
+        self._progress[job.id] = progress
+        await self._save(job)
+        logger.info(f"Tarama işi başladı: {job.id} ({job.marketplace}, deneme {job.attempts})")
+
+        task = asyncio.create_task(
+            crawler(
+                job.url, job.export_csv, job.incremental,
+                dedupe=dedupe, progress=progress, checkpoint=checkpoint, export_format=job.export_format,
+            )
+        )
+        self._running[job.id] = task
+        try:
+            while not task.done():
+                await asyncio.wait({task}, timeout=self.save_interval)
+                job.progress = progress.snapshot()
+                await self._save(job)
+            result = task.result()
+        except asyncio.CancelledError:
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+            job.progress = progress.snapshot()
+            if job.id in self._cancel_requested:
+                await self._save(job)
+                self._remove_state_files(dedupe_path, checkpoint)
+                logger.info(f"Tarama işi iptal edildi: {job.id}")
+                return
+            # Uygulama kapanıyor: iş bir sonraki açılışta yeniden çalışır. Tekilleştirme
+            # durumunu yalnızca kontrol noktası yazar; böylece ikisi birbirinin önüne geçmez
+            job.status = JOB_QUEUED
+            await self._save(job)
+            raise
+        except Exception as e:
+            result = {"success": False, "error": str(e)}
+        finally:
+            self._running.pop(job.id, None)
+            self._progress.pop(job.id, None)
+            self._cancel_requested.discard(job.id)
+
+        job.progress = progress.snapshot()
+        job.finished_at = time.time()
+        if result.get("success"):
+            job.status = JOB_SUCCEEDED
+            await asyncio.to_thread(save_json_atomic, result, self.result_path(job.id))
+        else:
+            job.status = JOB_FAILED
+            job.error = result.get("error", "Bilinmeyen bir hata oluştu")
+        self._remove_state_files(dedupe_path, checkpoint)
+        await self._save(job)
+        logger.info(f"Tarama işi bitti: {job.id} ({job.status})")
+
+    def stats(self) -> Dict[str, Any]:
+        counts: Dict[str, int] = {}
+        for job in self._jobs.values():
+            counts[job.status] = counts.get(job.status, 0) + 1
+        return {"workers": self.workers, "running": len(self._running), "jobs": counts}
+
+
+job_manager = JobManager()
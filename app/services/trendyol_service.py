@@ -4,13 +4,23 @@ from urllib.parse import urlparse, parse_qs, urlencode, urljoin
 from datetime import datetime
 import os
 import re
-from typing import Dict, List, Optional, Any, Tuple
+from typing import Awaitable, Callable, Dict, List, Optional, Any, Tuple
 import socket
 import json
-from playwright.async_api import async_playwright
 
-from ..parsers.trendyol_parser import fetch_review_page, fetch_product_details, append_reviews_to_csv
+from ..parsers.trendyol_parser import fetch_api_json, fetch_review_page, fetch_product_details, append_reviews_to_csv, build_review_rows
 from ..core.config import settings
+from ..utils.http_clients import http_clients
+from ..utils.pagination import fetch_pages_concurrently, fetch_pages_until
+from ..utils.pipeline import UniqueWorkQueue, run_pipeline
+from ..utils.response_cache import response_cache
+from ..utils.watermarks import watermark_store
+from ..utils.review_store import review_store
+from ..utils.dedupe import ReviewDeduplicator
+from ..utils.progress import CrawlProgress
+from ..utils.checkpoint import CrawlCheckpoint
+from ..utils import json_codec
+from ..utils.parquet_writer import ParquetWriterStage
 
 # Bağlantı hatalarını işlemek için bir retry decorator oluştur
 async def with_retry(func, *args, max_retries=3, **kwargs):
@@ -28,6 +38,7 @@ async def with_retry(func, *args, max_retries=3, **kwargs):
     print(f"Maksimum deneme sayısına ulaşıldı. Son hata: {last_exception}")
     return None
 
+@response_cache.cached("trendyol_search", key=lambda url, page=1: (url, {"pi": page}))
 async def fetch_search_results(url: str, page: int = 1) -> Dict:
     """
     Trendyol arama sonuçlarını headless tarayıcı ile çeker
@@ -79,79 +90,51 @@ async def fetch_search_results(url: str, page: int = 1) -> Dict:
     full_url = f"{api_url}?{query_string}"
     
     try:
-        # Playwright ile headless tarayıcı başlat
-        async with async_playwright() as p:
-            # Tarayıcıyı başlat
-            browser = await p.chromium.launch(headless=True)
-            context = await browser.new_context(
-                user_agent=settings.USER_AGENT,
-                viewport={'width': 1920, 'height': 1080}
-            )
-            
-            # Context'e gerekli çerezleri ekle
-            await context.add_cookies([
-                {"name": "platform", "value": "web", "domain": ".trendyol.com", "path": "/"},
-                {"name": "countryCode", "value": "TR", "domain": ".trendyol.com", "path": "/"},
-                {"name": "language", "value": "tr", "domain": ".trendyol.com", "path": "/"}
-            ])
-            
-            # Yeni sayfa oluştur
-            page_browser = await context.new_page()
-            
-            # Bütün header'ları ekle
-            await page_browser.set_extra_http_headers({
-                'accept': 'application/json, text/plain, */*',
-                'accept-language': 'tr,en;q=0.9,en-GB;q=0.8,en-US;q=0.7',
-                'baggage': 'ty.kbt.name=ViewSearchResult,ty.platform=Web,ty.business_unit=Core Commerce,ty.channel=TR,com.trendyol.observability.business_transaction.name=ViewSearchResult,ty.source.service.name=WEB Storefront TR,ty.source.deployment.environment=production,ty.source.service.version=b1729d82,ty.source.client.path=/sr,ty.source.service.type=client',
-                'cache-control': 'no-cache',
-                'origin': 'https://www.trendyol.com',
-                'pragma': 'no-cache',
-                'priority': 'u=1, i',
-                'sec-ch-ua': '"Not)A;Brand";v="8", "Chromium";v="138", "Microsoft Edge";v="138"',
-                'sec-ch-ua-mobile': '?0',
-                'sec-ch-ua-platform': '"macOS"',
-                'sec-fetch-dest': 'empty',
-                'sec-fetch-mode': 'cors',
-                'sec-fetch-site': 'same-site',
-            })
-            
-            # İsteği hazırla ve response'u dinle
-            
-            # İsteği yap ve yanıtı yakalamak için ağ isteğini izle
-            response_data = None
-            
-            async def handle_response(response):
-                nonlocal response_data
-                if response.url.startswith(api_url):
-                    try:
-                        response_data = await response.json()
-                    except:
-                        try:
-                            response_data = await response.text()
-                        except:
-                            pass
-            
-            # Response event listener'ı ekle
-            page_browser.on("response", handle_response)
-            
-            # Sayfaya git
-            await page_browser.goto(full_url, wait_until="networkidle")
-            
-            # Tarayıcıyı kapat
-            await browser.close()
-            
-            # Response verisini kontrol et
-            if response_data:
-            
-                if isinstance(response_data, dict):
-                    data = response_data
-                    # Yanıt 'result' anahtarı altında geliyor
+        # Havuzdaki sıcak bir tarayıcı context'i ile (her istekte tarayıcı başlatılmaz)
+        _, response_data = await fetch_api_json(full_url, {
+            'accept': 'application/json, text/plain, */*',
+            'accept-language': 'tr,en;q=0.9,en-GB;q=0.8,en-US;q=0.7',
+            'baggage': 'ty.kbt.name=ViewSearchResult,ty.platform=Web,ty.business_unit=Core Commerce,ty.channel=TR,com.trendyol.observability.business_transaction.name=ViewSearchResult,ty.source.service.name=WEB Storefront TR,ty.source.deployment.environment=production,ty.source.service.version=b1729d82,ty.source.client.path=/sr,ty.source.service.type=client',
+            'cache-control': 'no-cache',
+            'origin': 'https://www.trendyol.com',
+            'pragma': 'no-cache',
+            'priority': 'u=1, i',
+            'sec-ch-ua': '"Not)A;Brand";v="8", "Chromium";v="138", "Microsoft Edge";v="138"',
+            'sec-ch-ua-mobile': '?0',
+            'sec-ch-ua-platform': '"macOS"',
+            'sec-fetch-dest': 'empty',
+            'sec-fetch-mode': 'cors',
+            'sec-fetch-site': 'same-site',
+        })
+
+        # Response verisini kontrol et
+        if response_data:
+            if isinstance(response_data, dict):
+                data = response_data
+                # Yanıt 'result' anahtarı altında geliyor
+                result_data = data.get("result", {})
+                if not result_data:
+                    print("API yanıtında 'result' anahtarı bulunamadı veya boş.")
+                    # Alternatif yöntemi dene
+                    return await fetch_search_results_fallback(url, page)
+                    
+                products = result_data.get("products", [])
+                total_count = result_data.get("totalCount", 0)
+                
+                return {
+                    "products": products,
+                    "totalCount": total_count,
+                    "page": page
+                }
+            elif isinstance(response_data, str):
+                try:
+                    data = json_codec.loads(response_data)
                     result_data = data.get("result", {})
                     if not result_data:
                         print("API yanıtında 'result' anahtarı bulunamadı veya boş.")
                         # Alternatif yöntemi dene
                         return await fetch_search_results_fallback(url, page)
-                        
+                    
                     products = result_data.get("products", [])
                     total_count = result_data.get("totalCount", 0)
                     
@@ -160,32 +143,15 @@ async def fetch_search_results(url: str, page: int = 1) -> Dict:
                         "totalCount": total_count,
                         "page": page
                     }
-                elif isinstance(response_data, str):
-                    try:
-                        data = json.loads(response_data)
-                        result_data = data.get("result", {})
-                        if not result_data:
-                            print("API yanıtında 'result' anahtarı bulunamadı veya boş.")
-                            # Alternatif yöntemi dene
-                            return await fetch_search_results_fallback(url, page)
-                        
-                        products = result_data.get("products", [])
-                        total_count = result_data.get("totalCount", 0)
-                        
-                        return {
-                            "products": products,
-                            "totalCount": total_count,
-                            "page": page
-                        }
-                    except json.JSONDecodeError:
-                        print("JSON parse hatası")
-                        # Alternatif yöntemi dene
-                        return await fetch_search_results_fallback(url, page)
+                except json.JSONDecodeError:
+                    print("JSON parse hatası")
+                    # Alternatif yöntemi dene
+                    return await fetch_search_results_fallback(url, page)
+        
+        # Headless browser'dan yanıt alınamadıysa fallback'e geç
+        print("Headless browser ile yanıt alınamadı, httpx ile deneniyor...")
+        return await fetch_search_results_fallback(url, page)
             
-            # Headless browser'dan yanıt alınamadıysa fallback'e geç
-            print("Headless browser ile yanıt alınamadı, httpx ile deneniyor...")
-            return await fetch_search_results_fallback(url, page)
-                
     except Exception as e:
         print(f"Headless browser hatası: {e}")
         # Hata durumunda alternatif yönteme geri dön
@@ -255,85 +221,78 @@ async def fetch_search_results_fallback(url: str, page: int = 1) -> Dict:
         'user-agent': settings.USER_AGENT
     }
     
-    # Basit cookie bilgisi
-    cookies = {
-        'platform': 'web',
-        'countryCode': 'TR',
-        'language': 'tr',
-    }
-    
     response = None
     try:
-        # Özel timeouts ve SSL doğrulama ayarları ile client oluştur
-        async with httpx.AsyncClient(timeout=30.0, verify=False, cookies=cookies, http2=True) as client:
+        # Host bazında paylaşılan client (keep-alive, HTTP/2, pool limitleri ayarlardan)
+        client = http_clients.get(api_url)
 
-            # Yeniden deneme mekanizması
-            max_retries = 3
-            for attempt in range(max_retries):
-                try:
-                    response = await client.get(api_url, params=params, headers=headers)
-                    break
-                except (httpx.ConnectError, httpx.ConnectTimeout, socket.gaierror) as conn_err:
-                    if attempt < max_retries - 1:
-                        wait_time = 2 ** attempt
-                        print(f"Bağlantı hatası, {wait_time} saniye sonra yeniden deneniyor... (Deneme {attempt+1}/{max_retries})")
-                        await asyncio.sleep(wait_time)
-                    else:
-                        print(f"Maksimum deneme sayısına ulaşıldı: {conn_err}")
-                        return {"products": [], "totalCount": 0, "page": page, "error": f"Bağlantı hatası: {conn_err}"}
-            
-            if response:
-                
-                if response.status_code == 200:
-                    data = response.json()
-                    # Yanıt 'result' anahtarı altında geliyor
-                    result_data = data.get("result", {})
-                    if not result_data:
-                        print("API yanıtında 'result' anahtarı bulunamadı veya boş.")
-                        return {"products": [], "totalCount": 0, "page": page, "error": "Geçersiz yanıt yapısı"}
-                        
-                    products = result_data.get("products", [])
-                    total_count = result_data.get("totalCount", 0)
-                    
-                    return {
-                        "products": products,
-                        "totalCount": total_count,
-                        "page": page
-                    }
+        # Yeniden deneme mekanizması
+        max_retries = 3
+        for attempt in range(max_retries):
+            try:
+                response = await client.get(api_url, params=params, headers=headers)
+                break
+            except (httpx.ConnectError, httpx.ConnectTimeout, socket.gaierror) as conn_err:
+                if attempt < max_retries - 1:
+                    wait_time = 2 ** attempt
+                    print(f"Bağlantı hatası, {wait_time} saniye sonra yeniden deneniyor... (Deneme {attempt+1}/{max_retries})")
+                    await asyncio.sleep(wait_time)
                 else:
-                    print(f"Error fetching search results: {response.status_code}")
-                    
-                    # Alternatif yöntem: doğrudan web sayfasını çek
-                    print("API yanıt vermedi, alternatif bir kaynak deneniyor...")
-                    search_url = f"https://www.trendyol.com/sr?pi={page}"
-                    if 'q' in params:
-                        search_url += f"&q={params['q']}"
-                        
-                    print(f"Alternatif URL: {search_url}")
-                    web_response = await client.get(search_url, headers={
-                        'User-Agent': settings.USER_AGENT,
-                        'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,image/apng,*/*;q=0.8',
-                        'Accept-Language': 'tr-TR,tr;q=0.9,en-US;q=0.8,en;q=0.7',
-                    })
-                    
-                    if web_response.status_code == 200:
-                        html_content = web_response.text
-                        # Sayfadan ürün verilerini çıkar
-                        window_data_match = re.search(r'window\.__SEARCH_APP_INITIAL_STATE__\s*=\s*({.*?});', html_content, re.DOTALL)
-                        if window_data_match:
-                            try:
-                                search_data = json.loads(window_data_match.group(1))
-                                products = search_data.get("products", {}).get("products", [])
-                                return {
-                                    "products": products,
-                                    "totalCount": search_data.get("products", {}).get("totalCount", 0),
-                                    "page": page
-                                }
-                            except json.JSONDecodeError:
-                                pass
-                    
-                    # Alternatif de çalışmazsa boş sonuç döndür
-                    return {"products": [], "totalCount": 0, "page": page, "error": f"Status code: {response.status_code}"}
+                    print(f"Maksimum deneme sayısına ulaşıldı: {conn_err}")
+                    return {"products": [], "totalCount": 0, "page": page, "error": f"Bağlantı hatası: {conn_err}"}
+
+        if response:
+
+            if response.status_code == 200:
+                data = json_codec.loads(response.content)
+                # Yanıt 'result' anahtarı altında geliyor
+                result_data = data.get("result", {})
+                if not result_data:
+                    print("API yanıtında 'result' anahtarı bulunamadı veya boş.")
+                    return {"products": [], "totalCount": 0, "page": page, "error": "Geçersiz yanıt yapısı"}
+
+                products = result_data.get("products", [])
+                total_count = result_data.get("totalCount", 0)
+
+                return {
+                    "products": products,
+                    "totalCount": total_count,
+                    "page": page
+                }
+            else:
+                print(f"Error fetching search results: {response.status_code}")
+
+                # Alternatif yöntem: doğrudan web sayfasını çek
+                print("API yanıt vermedi, alternatif bir kaynak deneniyor...")
+                search_url = f"https://www.trendyol.com/sr?pi={page}"
+                if 'q' in params:
+                    search_url += f"&q={params['q']}"
+
+                print(f"Alternatif URL: {search_url}")
+                web_response = await client.get(search_url, headers={
+                    'User-Agent': settings.USER_AGENT,
+                    'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,image/apng,*/*;q=0.8',
+                    'Accept-Language': 'tr-TR,tr;q=0.9,en-US;q=0.8,en;q=0.7',
+                })
+
+                if web_response.status_code == 200:
+                    html_content = web_response.text
+                    # Sayfadan ürün verilerini çıkar
+                    window_data_match = re.search(r'window\.__SEARCH_APP_INITIAL_STATE__\s*=\s*({.*?});', html_content, re.DOTALL)
+                    if window_data_match:
+                        try:
+                            search_data = json.loads(window_data_match.group(1))
+                            products = search_data.get("products", {}).get("products", [])
+                            return {
+                                "products": products,
+                                "totalCount": search_data.get("products", {}).get("totalCount", 0),
+                                "page": page
+                            }
+                        except json.JSONDecodeError:
+                            pass
+
+                # Alternatif de çalışmazsa boş sonuç döndür
+                return {"products": [], "totalCount": 0, "page": page, "error": f"Status code: {response.status_code}"}
     except Exception as e:
         print(f"Exception while fetching search results: {e}")
         return {"products": [], "totalCount": 0, "page": page, "error": str(e)}
@@ -345,420 +304,413 @@ async def fetch_search_results_fallback(url: str, page: int = 1) -> Dict:
         # Döngü hiç çalışmazsa veya response alamazsa
         return {"products": [], "totalCount": 0, "page": page, "error": "İstek yapılamadı"}
 
-async def get_product_reviews(url: str, export_csv: bool = False) -> Dict:
+def _extract_review_content(page_data: Optional[Dict]) -> List[Dict]:
+    """Yorum API yanıtından yorum listesini güvenli şekilde çıkarır"""
+    if not isinstance(page_data, dict):
+        return []
+    return page_data.get("result", {}).get("productReviews", {}).get("content", []) or []
+
+async def fetch_all_product_reviews(base_params: Dict, on_page=None, skip_pages=()) -> Optional[List[Dict]]:
+    """
+    Bir ürünün tüm yorum sayfalarını çeker.
+    İlk sayfadan totalPages öğrenildikten sonra kalan sayfalar sınırlı
+    eşzamanlılıkla paralel çekilir ve sayfa sırasına göre birleştirilir.
+    `skip_pages` içindeki sayfalar (kontrol noktasına göre zaten yazılmış) tekrar
+    çekilmez; ilk sayfa toplam sayfa sayısı için yine istenir ama sink'e verilmez.
+    İlk sayfa alınamazsa None döner.
+    """
+    print(f"\nFetching first page with params: {urlencode({'page': 0, **base_params})}")
+    first_page_data = await fetch_review_page({"page": 0, **base_params})
+    if not first_page_data:
+        return None
+    
+    first_page_reviews = _extract_review_content(first_page_data)
+    
+    # Toplam sayfa sayısını al
+    review_total_pages = first_page_data.get("result", {}).get("productReviews", {}).get("totalPages", 1)
+    # String olabilecek değeri sayıya çevir
+    try:
+        review_total_pages = int(review_total_pages)
+    except (ValueError, TypeError):
+        review_total_pages = 1
+    # 0 veya negatif gelirse 1 olarak düzelt
+    if review_total_pages < 1:
+        review_total_pages = 1
+    print(f"Total pages: {review_total_pages}")
+    
+    skip_pages = set(skip_pages)
+    if 0 in skip_pages:
+        first_page_reviews = []
+    elif first_page_reviews and on_page:
+        await on_page(0, first_page_reviews)
+    
+    # Diğer sayfaları paralel çek (1. sayfadan başla çünkü 0. sayfayı zaten aldık)
+    remaining_pages = [
+        page_num for page_num in range(1, min(review_total_pages, settings.TRENDYOL_MAX_REVIEW_PAGES) + 1)
+        if page_num not in skip_pages
+    ]
+    other_reviews = await fetch_pages_concurrently(
+        lambda page_num: fetch_review_page({"page": page_num, **base_params}),
+        remaining_pages,
+        extract_items=_extract_review_content,
+        on_page=on_page,
+    )
+    return first_page_reviews + other_reviews
+
+def _extract_content_id(product: Dict) -> Optional[str]:
+    """Arama sonucundaki ürün URL'sinden contentId'yi çıkarır"""
+    content_id_match = re.search(r'-p-(\d+)', product.get("url", ""))
+    return content_id_match.group(1) if content_id_match else None
+
+async def fetch_new_product_reviews(base_params: Dict, split_new, on_page=None) -> Optional[Tuple[List[Dict], bool]]:
+    """
+    Artımlı tarama: yorumları en yeniden eskiye sırayla çeker ve su seviyesini
+    (`split_new`) geçen ilk sayfada durur. (yeni yorumlar, tamamlandı_mı) döner;
+    hiçbir sayfa alınamazsa None döner.
+    """
+    print(f"\nFetching new reviews with params: {urlencode(base_params)}")
+    new_reviews, complete = await fetch_pages_until(
+        lambda page_num: fetch_review_page({"page": page_num, **base_params}),
+        range(0, settings.TRENDYOL_MAX_REVIEW_PAGES + 1),
+        extract_items=_extract_review_content,
+        split_new=split_new,
+        on_page=on_page,
+    )
+    if not complete and not new_reviews:
+        return None
+    return new_reviews, complete
+
+async def get_product_reviews(
+    url: str,
+    export_csv: bool = False,
+    incremental: bool = False,
+    dedupe: Optional[ReviewDeduplicator] = None,
+    progress: Optional[CrawlProgress] = None,
+    checkpoint: Optional[CrawlCheckpoint] = None,
+    on_product: Optional[Callable[[Dict], Awaitable[None]]] = None,
+    export_format: str = "csv",
+) -> Dict:
     """
     Trendyol ürün yorumlarını çeker
+
+    Arama sayfaları (producer) yeni ve benzersiz ürünleri bir iş kuyruğuna ekler,
+    TRENDYOL_PRODUCT_WORKERS adet işçi (consumer) her ürünün detaylarını ve
+    yorumlarını tam olarak bir kez çeker.
+
+    incremental=True ise yorumlar en yeniden eskiye istenir ve ürünün bir önceki
+    taramadaki su seviyesine (watermark) ulaşılınca durulur; sadece yeni yorumlar döner.
+
+    dedupe verilirse CSV'ye yazılan yorumların tekrar kontrolü onun durumu üzerinden
+    yapılır (devam ettirilen işlerde önceki çalışmada yazılanlar atlanır).
+    progress verilirse sayfa/ürün/yorum sayaçları onun üzerinden raporlanır.
+
+    checkpoint verilirse (sadece export_csv ile) tamamlanan arama sayfaları, ürünler
+    ve ürün başına CSV'ye yazılmış yorum sayfaları kaydedilir. Devam eden tarama
+    aynı CSV dosyasını kontrol noktasındaki boyuta kısaltıp ona ekleme yapar ve
+    biten işleri tekrar çekmez.
+
+    on_product verilirse her ürün (productInfo + yorumları) işlendiği anda ona
+    verilir ve ürünler bellekte biriktirilmez (akış modu); dönüşteki "products" boş olur.
+
+    export_format="parquet" ise yorumlar CSV yerine tipli sütunlu bir Parquet
+    dosyasına row group'lar halinde yazılır (kontrol noktası sadece CSV içindir).
     """
     try:
         # CSV dosyası için zaman damgası oluştur
         timestamp = datetime.now().strftime("%Y-%m-%d-%H-%M-%S")
         csv_filename = f"trendyol_yorumlar_{timestamp}.csv"
         is_first_write = True  # İlk yazma işlemi için bayrak
+        parquet_writer = None
+        if export_csv and export_format == "parquet":
+            parquet_path = os.path.join(settings.DOWNLOADS_DIR, f"trendyol_yorumlar_{timestamp}.parquet")
+            parquet_writer = ParquetWriterStage(parquet_path, "trendyol")
+        if not export_csv or parquet_writer is not None:
+            checkpoint = None
+        if checkpoint is not None:
+            # Devam eden taramada önceki çalışmanın CSV dosyasına eklenir
+            if checkpoint.output_file:
+                csv_filename = os.path.basename(checkpoint.output_file)
+            resume_offset = checkpoint.prepare_output(os.path.join(settings.DOWNLOADS_DIR, csv_filename))
+            is_first_write = resume_offset == 0
         
-        # Tüm ürünleri toplamak için dizi
+        # Tüm ürünleri toplamak için dizi (akış modunda sadece sayılır)
         all_products = []
-        # Benzersiz ürünleri takip etmek için set
-        unique_product_ids = set()
-        # Benzersiz yorumları takip etmek için set (CSV için)
-        unique_review_keys = set()
-
-        # Yorumları CSV'ye eklemeden önce tekrar kontrolü için fonksiyon
-        def filter_unique_reviews(reviews, product_info):
-            filtered = []
-            for review in reviews:
-                key = f"{product_info['contentId']}_{review.get('userFullName','')}_{review.get('comment','')}"
-                if key not in unique_review_keys:
-                    unique_review_keys.add(key)
-                    filtered.append(review)
-            return filtered
+        total_products = 0
+        # Benzersiz yorumları takip etmek için sabit boyutlu özet kümesi (CSV için);
+        # devam ettirilen işlerde önceki durum dışarıdan verilir
+        if dedupe is None:
+            dedupe = ReviewDeduplicator()
+        if progress is None:
+            progress = CrawlProgress()
         
-        # URL'den temel parametreleri çıkar
-        parsed_url = urlparse(url)
-        
-        # Sayfa sayısını belirle
-        current_page = 1
         total_pages = 1
-        total_count = 0
-        has_next_page = True
         
         print(f"\n===== TÜM SAYFALARI TARAMA İŞLEMİ BAŞLADI =====\n")
         
-        # İlk sayfayı çek ve toplam sayfa sayısını öğren
-        while has_next_page:
+        async def enqueue_products(products: List[Dict], queue: UniqueWorkQueue, page_num: Optional[int] = None):
+            # Sadece daha önce görülmemiş (ve önceki çalışmada bitmemiş) ürünler kuyruğa girer
+            nonlocal total_products
+            enqueued = []
+            for product in products:
+                content_id = _extract_content_id(product)
+                if not content_id:
+                    print(f"⚠️ ContentId bulunamadı: {product.get('url')}")
+                    continue
+                if checkpoint is not None and checkpoint.product_done(content_id):
+                    continue
+                if await queue.put(content_id, product):
+                    total_products += 1
+                    if on_product is None:
+                        all_products.append(product)
+                    enqueued.append((content_id, product))
+                    progress.products_found()
+            if checkpoint is not None and page_num is not None:
+                checkpoint.mark_search_page(page_num, enqueued)
+        
+        async def fetch_search_page(page_num: int) -> Optional[Dict]:
+            print(f"\n🔍 Sayfa {page_num} ürünleri çekiliyor")
+            search_data = await fetch_search_results(url, page_num)
+            if search_data.get("error"):
+                print(f"⚠️ Sayfa {page_num} çekilemedi: {search_data['error']}")
+                return None
+            return search_data
+        
+        async def produce_products(queue: UniqueWorkQueue):
+            """İlk arama sayfasından toplam sayfa sayısını öğrenir, kalanları paralel çeker"""
+            nonlocal total_pages
+            if checkpoint is not None:
+                # Önceki çalışmada kuyruğa alınmış ama bitmemiş ürünler önce işlenir
+                await enqueue_products([product for _, product in checkpoint.pending_products()], queue)
+                if checkpoint.search_page_done(1) and checkpoint.total_pages:
+                    total_pages = checkpoint.total_pages
+                    print(f"\n===== KONTROL NOKTASINDAN DEVAM: {checkpoint.products_done} ÜRÜN ZATEN TAMAMLANMIŞ ({total_pages} SAYFA) =====\n")
+                    progress.set_pages_total(total_pages)
+                    progress.page_done()
+                    await fetch_remaining_search_pages(queue)
+                    return
+            
             # Trendyol search API'sini kullanarak ürünleri çekme
-            print(f"\n🔍 Sayfa {current_page} ürünleri çekiliyor")
+            print(f"\n🔍 Sayfa 1 ürünleri çekiliyor")
+            search_data = await fetch_search_results(url, 1)
+            
+            total_count = search_data.get("totalCount", 0)
+            # String olabilecek değeri sayıya çevir
+            try:
+                total_count = int(total_count)
+            except (ValueError, TypeError):
+                total_count = 0
+                
+            products_per_page = 24  # Trendyol'da sayfa başına 24 ürün gösteriliyor
+            # Bölme işlemini güvenli bir şekilde yap
+            if total_count > 0 and products_per_page > 0:
+                total_pages = (total_count + products_per_page - 1) // products_per_page  # Yukarı yuvarlama
+            else:
+                total_pages = 1  # Eğer total_count 0 ise en az 1 sayfa var
+                
+            print(f"\n===== TOPLAM {total_count} ÜRÜN BULUNDU ({total_pages} SAYFA) =====\n")
+            progress.set_pages_total(total_pages)
+            progress.page_done()
+            if checkpoint is not None:
+                checkpoint.total_pages = total_pages
             
-            search_data = await fetch_search_results(url, current_page)
+            products = search_data.get("products", [])
+            if not products:
+                print(f"⚠️ Sayfa 1'de ürün bulunamadı")
+                return
+            print(f"✅ Sayfa 1/{total_pages}: {len(products)} ürün bulundu")
+            await enqueue_products(products, queue, page_num=1)
+            await fetch_remaining_search_pages(queue)
+        
+        async def fetch_remaining_search_pages(queue: UniqueWorkQueue):
+            async def on_search_page(page_num: int, page_products: List[Dict]):
+                print(f"✅ Sayfa {page_num}/{total_pages}: {len(page_products)} ürün bulundu")
+                progress.page_done()
+                await enqueue_products(page_products, queue, page_num=page_num)
             
-            # İlk sayfada toplam sayfa sayısını hesapla
-            if current_page == 1:
-                total_count = search_data.get("totalCount", 0)
-                # String olabilecek değeri sayıya çevir
-                try:
-                    total_count = int(total_count)
-                except (ValueError, TypeError):
-                    total_count = 0
-                    
-                products_per_page = 24  # Trendyol'da sayfa başına 24 ürün gösteriliyor
-                # Bölme işlemini güvenli bir şekilde yap
-                if total_count > 0 and products_per_page > 0:
-                    total_pages = (total_count + products_per_page - 1) // products_per_page  # Yukarı yuvarlama
+            # Kalan sayfalar host bazındaki hız sınırlayıcı altında paralel çekilir;
+            # her sayfanın ürünleri geldiği anda işçilere aktarılır
+            remaining_pages = [
+                page_num for page_num in range(2, total_pages + 1)
+                if checkpoint is None or not checkpoint.search_page_done(page_num)
+            ]
+            progress.page_done(total_pages - 1 - len(remaining_pages))
+            await fetch_pages_concurrently(
+                fetch_search_page,
+                remaining_pages,
+                extract_items=lambda page_data: page_data.get("products", []),
+                concurrency=settings.SEARCH_PAGE_CONCURRENCY,
+                on_page=on_search_page,
+            )
+        
+        async def process_product(product: Dict):
+            """Tek bir ürünün detaylarını ve tüm yorumlarını çeker"""
+            # Ürün bilgilerini çıkar
+            content_id = _extract_content_id(product)
+            boutique_id = product.get("variants", [{}])[0].get("campaignId") if product.get("variants") else None
+            merchant_id = product.get("merchantId")
+            
+            print(f"\n--------------------------------------------")
+            print(f"ÜRÜN: {product.get('name')}")
+            print(f"ContentID: {content_id}, MerchantID: {merchant_id}, BoutiqueID: {boutique_id or 'Yok'}")
+            product_url = f"https://www.trendyol.com{product.get('url')}"
+            print(f"URL: {product_url}")
+            
+            # Ürün detay sayfasını çek
+            print(f"Ürün detayları çekiliyor: {product_url}")
+            
+            product_properties = []
+            try:
+                # Ürün detaylarını çek
+                product_details = await fetch_product_details(product_url)
+                if product_details and product_details.get("additionalProperty"):
+                    product_properties = product_details["additionalProperty"]
+                    print(f"✅ Ürün özellikleri başarıyla çekildi: {len(product_properties)} özellik")
+                elif product_details and isinstance(product_details, dict) and product_details.get("@type") == "Product":
+                    # Yeni JSON-LD yapısı için
+                    product_properties = product_details.get("additionalProperty", [])
+                    print(f"✅ Ürün özellikleri başarıyla çekildi: {len(product_properties)} özellik")
                 else:
-                    total_pages = 1  # Eğer total_count 0 ise en az 1 sayfa var
-                    
-                print(f"\n===== TOPLAM {total_count} ÜRÜN BULUNDU ({total_pages} SAYFA) =====\n")
+                    print(f"⚠️ Ürün özellikleri bulunamadı")
+                    product_properties = []
+            except Exception as detail_error:
+                print(f"⚠️ Ürün detayları çekme hatası: {detail_error}")
             
-            products = search_data.get("products", [])
+            # Ürün yorumlarını toplama
+            product_reviews = {
+                "productInfo": {
+                    "boutiqueId": boutique_id,
+                    "merchantId": merchant_id,
+                    "contentId": content_id,
+                    "url": product_url,
+                    "name": product.get("name"),
+                    "properties": product_properties  # Ürün özelliklerini ekle
+                },
+                "reviews": []
+            }
+            product_info = product_reviews["productInfo"]
+            # Özellikler CSV'nin her satırında tekrarlanır; JSON'a ürün başına bir kez çevrilir
+            properties_json = json_codec.dumps(product_properties) if product_properties else ""
+            price = product.get("price")
+            await review_store.add_product(
+                "trendyol", content_id,
+                name=product.get("name"),
+                url=product_url,
+                price=price.get("sellingPrice") if isinstance(price, dict) else price,
+                merchant_id=merchant_id,
+                features=product_properties,
+                extra={"boutiqueId": boutique_id},
+            )
             
-            if not products:
-                print(f"⚠️ Sayfa {current_page}'de ürün bulunamadı")
-                break  # Ürün yoksa döngüden çık
+            # Her sayfa geldiği anda CSV'ye yazılır
+            async def write_review_page(page_index, page_reviews):
+                nonlocal is_first_write
+                print(f"\n✅ Sayfa {page_index + 1}: {len(page_reviews)} yorum bulundu")
+                await review_store.add_reviews("trendyol", content_id, page_reviews)
+                progress.reviews_added(len(page_reviews))
+                if export_csv:
+                    filtered_reviews = dedupe.filter("trendyol", content_id, page_reviews)
+                    if parquet_writer is not None:
+                        await parquet_writer.put(page_index, build_review_rows(filtered_reviews, product_info), key=content_id)
+                    elif filtered_reviews:
+                        await append_reviews_to_csv(filtered_reviews, product_info, csv_filename, is_first_write, properties_json)
+                        is_first_write = False  # İlk yazma işlemi tamamlandı
+                    if checkpoint is not None:
+                        # Sayfa, CSV'ye yazıldığı ve tekilleştiriciye eklendiği anda işaretlenir
+                        checkpoint.mark_review_page(content_id, page_index)
+                        await checkpoint.maybe_save(dedupe=dedupe)
             
-            print(f"✅ Sayfa {current_page}/{total_pages}: {len(products)} ürün bulundu")
+            # Artımlı modda yorumlar en yeniden eskiye istenir
+            order_params = settings.TRENDYOL_NEWEST_FIRST_PARAMS if incremental else {"order": "DESC", "orderBy": "Score"}
+            watermark = watermark_store.get("trendyol", content_id) if incremental else None
             
-            # Ürünleri topla (tekrarı engelle)
-            for product in products:
-                content_id_match = re.search(r'-p-(\d+)', product.get("url", ""))
-                content_id = content_id_match.group(1) if content_id_match else None
-                if not content_id or content_id in unique_product_ids:
-                    continue  # Aynı ürün tekrar eklenmesin
-                unique_product_ids.add(content_id)
-                all_products.append(product)
-
+            async def fetch_reviews(params):
+                if not incremental:
+                    skip_pages = checkpoint.review_pages(content_id) if checkpoint is not None else ()
+                    return await fetch_all_product_reviews(params, on_page=write_review_page, skip_pages=skip_pages)
+                fetched = await fetch_new_product_reviews(
+                    params,
+                    lambda page_reviews: watermark_store.split_new("trendyol", watermark, page_reviews),
+                    on_page=write_review_page,
+                )
+                if fetched is None:
+                    return None
+                new_reviews, complete = fetched
+                # Yarıda kalan taramada su seviyesi ilerletilmez, bir sonraki tarama eksikleri tamamlar
+                if complete:
+                    watermark_store.advance("trendyol", content_id, new_reviews)
+                return new_reviews
             
-            # Her ürün için yorumları toplama
-            processed_product_ids = set()
-            for product in all_products:
-                content_id_match = re.search(r'-p-(\d+)', product.get("url", ""))
-                content_id = content_id_match.group(1) if content_id_match else None
-                if not content_id or content_id in processed_product_ids:
-                    continue  # Aynı ürün tekrar işlenmesin
-                processed_product_ids.add(content_id)
-                
-                # Ürün bilgilerini çıkar
-                content_id_match = re.search(r'-p-(\d+)', product.get("url", ""))
-                content_id = content_id_match.group(1) if content_id_match else None
-                boutique_id = product.get("variants", [{}])[0].get("campaignId") if product.get("variants") else None
-                merchant_id = product.get("merchantId")
-                
-                if not content_id:
-                    print(f"⚠️ ContentId bulunamadı: {product.get('url')}")
-                    continue  # ContentId yoksa bu ürünü atla
-                
-                print(f"\n--------------------------------------------")
-                print(f"ÜRÜN: {product.get('name')}")
-                print(f"ContentID: {content_id}, MerchantID: {merchant_id}, BoutiqueID: {boutique_id or 'Yok'}")
-                product_url = f"https://www.trendyol.com{product.get('url')}"
-                print(f"URL: {product_url}")
-                
-                # Ürün detay sayfasını çek
-                print(f"Ürün detayları çekiliyor: {product_url}")
-                
-                product_properties = []
-                try:
-                    # Ürün detaylarını çek
-                    product_details = await fetch_product_details(product_url)
-                    if product_details and product_details.get("additionalProperty"):
-                        product_properties = product_details["additionalProperty"]
-                        print(f"✅ Ürün özellikleri başarıyla çekildi: {len(product_properties)} özellik")
-                    elif product_details and isinstance(product_details, dict) and product_details.get("@type") == "Product":
-                        # Yeni JSON-LD yapısı için
-                        product_properties = product_details.get("additionalProperty", [])
-                        print(f"✅ Ürün özellikleri başarıyla çekildi: {len(product_properties)} özellik")
-                    else:
-                        print(f"⚠️ Ürün özellikleri bulunamadı")
-                        product_properties = []
-                except Exception as detail_error:
-                    print(f"⚠️ Ürün detayları çekme hatası: {detail_error}")
-                
-                # Ürün yorumlarını toplama
-                product_reviews = {
-                    "productInfo": {
-                        "boutiqueId": boutique_id,
-                        "merchantId": merchant_id,
-                        "contentId": content_id,
-                        "url": f"https://www.trendyol.com{product.get('url')}",
-                        "name": product.get("name"),
-                        "properties": product_properties  # Ürün özelliklerini ekle
-                    },
-                    "reviews": []
-                }
-                
-                # İlk sayfayı çek ve toplam sayfa sayısını öğren (Sayfa 0'dan başla)
-                first_page_params = {
-                    "page": 0,
-                    "order": "DESC",
-                    "orderBy": "Score",
+            # Önce contentId/sellerId ile dene
+            reviews = await fetch_reviews({
+                **order_params,
+                "channelId": "1",
+                "sellerId": merchant_id,
+                "contentId": content_id
+            })
+            
+            if reviews is None and boutique_id:
+                # İlk yöntem başarısız oldu, ikinci yöntemi dene
+                print(f"\nFirst method failed, trying second method with boutiqueId")
+                reviews = await fetch_reviews({
+                    **order_params,
                     "channelId": "1",
-                    "sellerId": merchant_id,
-                    "contentId": content_id
-                }
-                
-                print(f"\nFetching first page with params: {urlencode(first_page_params)}")
-                
-                # fetchReviewPage fonksiyonunu kullanarak ilk sayfayı çek
-                first_page_data = await fetch_review_page(first_page_params)
-                
-                if not first_page_data:
-                    # İlk yöntem başarısız oldu, ikinci yöntemi dene
-                    print(f"\nFirst method failed, trying second method with boutiqueId")
-                    if boutique_id:
-                        second_page_params = {
-                            "page": 0,
-                            "order": "DESC",
-                            "orderBy": "Score",
-                            "channelId": "1",
-                            "merchantId": merchant_id,
-                            "boutiqueId": boutique_id
-                        }
-                        
-                        print(f"Fetching with second method params: {urlencode(second_page_params)}")
-                        
-                        # İkinci yöntemle tekrar dene
-                        second_page_data = await fetch_review_page(second_page_params)
-                        
-                        if not second_page_data:
-                            # Yorum yoksa sonraki ürüne geç
-                            print(f"❌ Yorum bulunamadı!")
-                            product_reviews["error"] = "Yorum bulunamadı"
-                            continue
-                        
-                        # Güvenli veri çekme
-                        review_result = second_page_data.get("result", {})
-                        product_reviews_data = review_result.get("productReviews", {})
-                        first_page_reviews = product_reviews_data.get("content", [])
-                        product_reviews["reviews"].extend(first_page_reviews)
-                        
-                        # Toplam sayfa sayısını al
-                        review_total_pages = product_reviews_data.get("totalPages", 1)
-                        # String olabilecek değeri sayıya çevir
-                        try:
-                            review_total_pages = int(review_total_pages)
-                        except (ValueError, TypeError):
-                            review_total_pages = 1
-                            
-                        # 0 veya negatif gelirse 1 olarak düzelt
-                        if review_total_pages < 1:
-                            review_total_pages = 1
-                        
-                        # İlk sayfa yorumlarını konsola yazdır
-                        print(f"\n✅ Sayfa 1/{review_total_pages}: {len(first_page_reviews)} yorum bulundu")
-                        
-                        
-                        # Yorumları CSV dosyasına anlık olarak ekle
-                        if export_csv:
-                            filtered_reviews = filter_unique_reviews(first_page_reviews, product_reviews["productInfo"])
-                            if filtered_reviews:
-                                await append_reviews_to_csv(filtered_reviews, product_reviews["productInfo"], csv_filename, is_first_write)
-                                is_first_write = False  # İlk yazma işlemi tamamlandı
-                                print(f"✅ Sayfa 1 yorumları CSV dosyasına eklendi")
-                        
-                        print(f"Total pages: {review_total_pages}")
-                        
-                        # Diğer sayfaları çek (1. sayfadan başla çünkü 0. sayfayı zaten aldık)
-                        for page_num in range(1, min(review_total_pages, 100) + 1):
-                            page_params = {
-                                "page": page_num,
-                                "order": "DESC",
-                                "orderBy": "Score",
-                                "channelId": "1",
-                                "merchantId": merchant_id,
-                                "boutiqueId": boutique_id
-                            }
-                            # fetchReviewPage fonksiyonunu kullanarak sayfayı çek
-                            page_data = await fetch_review_page(page_params)
-                            
-                            if page_data:
-                                review_result = page_data.get("result", {})
-                                product_reviews_data = review_result.get("productReviews", {})
-                                page_reviews = product_reviews_data.get("content", [])
-                                
-                                if page_reviews:
-                                    product_reviews["reviews"].extend(page_reviews)
-                                    
-                                    # Bu sayfadaki yorumları konsola yazdır
-                                    print(f"\n✅ Sayfa {page_num}/{review_total_pages}: {len(page_reviews)} yorum bulundu")
-                                   
-                                    
-                                    # Yorumları CSV dosyasına anlık olarak ekle
-                                    if export_csv:
-                                        filtered_reviews = filter_unique_reviews(page_reviews, product_reviews["productInfo"])
-                                        if filtered_reviews:
-                                            await append_reviews_to_csv(filtered_reviews, product_reviews["productInfo"], csv_filename, is_first_write)
-                                            is_first_write = False  # İlk yazma işlemi tamamlandı
-                                            print(f"✅ Sayfa {page_num} yorumları CSV dosyasına eklendi")
-                                else:
-                                    print(f"Page data: {page_data}")
-                                    print(f"❌ Sayfa {page_num}: Yorum içeriği bulunamadı")
-                            else:
-                                print(f"❌ Sayfa {page_num}: Yorum bulunamadı")
-                                
-                                # Eğer art arda 5 sayfa boş gelirse, muhtemelen daha fazla sayfa yoktur
-                                if page_num > 5:
-                                    empty_page_count = 1
-                                    for i in range(1, 5):
-                                        if page_num - i >= 1:
-                                            prev_page_params = {
-                                                "page": page_num - i,
-                                                "order": "DESC",
-                                                "orderBy": "Score",
-                                                "channelId": "1",
-                                                "merchantId": merchant_id,
-                                                "boutiqueId": boutique_id
-                                            }
-                                            
-                                            prev_page_data = await fetch_review_page(prev_page_params)
-                                            if not prev_page_data or not prev_page_data.get("result", {}).get("productReviews", {}).get("content"):
-                                                empty_page_count += 1
-                                    
-                                    if empty_page_count >= 5:
-                                        print(f"\n⚠️ Art arda 5 boş sayfa. Muhtemelen daha fazla yorum yok. Sayfa çekme işlemi durduruldu.")
-                                        break
-                            
-                            # Her 10 sayfada bir 3 saniye bekle (rate limiting'i önlemek için)
-                            if page_num % 10 == 0:
-                                print(f"Waiting 3 seconds to avoid rate limiting...")
-                                await asyncio.sleep(3)
-                    else:
-                        # Alternatif parametre de yoksa bu ürünü atla
-                        print(f"❌ Yorumlar alınamadı!")
-                        product_reviews["error"] = "Yorumlar alınamadı"
-                        continue
-                else:
-                    # İlk yöntem başarılı
-                    # İlk sayfadaki yorumları ekle
-                    review_result = first_page_data.get("result", {})
-                    product_reviews_data = review_result.get("productReviews", {})
-                    first_page_reviews = product_reviews_data.get("content", [])
-                    product_reviews["reviews"].extend(first_page_reviews)
-                    
-                    # Toplam sayfa sayısını al
-                    review_total_pages = product_reviews_data.get("totalPages", 1)
-                    # String olabilecek değeri sayıya çevir
-                    try:
-                        review_total_pages = int(review_total_pages)
-                    except (ValueError, TypeError):
-                        review_total_pages = 1
-                        
-                    # 0 veya negatif gelirse 1 olarak düzelt
-                    if review_total_pages < 1:
-                        review_total_pages = 1
-                    
-                    # İlk sayfa yorumlarını konsola yazdır
-                    print(f"\n✅ Sayfa 1/{review_total_pages}: {len(first_page_reviews)} yorum bulundu")
-                   
-                    
-                    # Yorumları CSV dosyasına anlık olarak ekle
-                    if export_csv:
-                        filtered_reviews = filter_unique_reviews(first_page_reviews, product_reviews["productInfo"])
-                        if filtered_reviews:
-                            await append_reviews_to_csv(filtered_reviews, product_reviews["productInfo"], csv_filename, is_first_write)
-                            is_first_write = False  # İlk yazma işlemi tamamlandı
-                            print(f"✅ Sayfa 1 yorumları CSV dosyasına eklendi")
-                    
-                    # Toplam sayfa sayısını al
-                    print(f"Total pages: {review_total_pages}")
-                    
-                    # Diğer sayfaları çek (1. sayfadan başla çünkü 0. sayfayı zaten aldık)
-                    for page_num in range(1, min(review_total_pages, 100) + 1):
-                        page_params = {
-                            "page": page_num,
-                            "order": "DESC",
-                            "orderBy": "Score",
-                            "channelId": "1",
-                            "sellerId": merchant_id,
-                            "contentId": content_id
-                        }
-                        # fetchReviewPage fonksiyonunu kullanarak sayfayı çek
-                        page_data = await fetch_review_page(page_params)
-                        
-                        if page_data:
-                            review_result = page_data.get("result", {})
-                            product_reviews_data = review_result.get("productReviews", {})
-                            page_reviews = product_reviews_data.get("content", [])
-                            
-                            if page_reviews:
-                                product_reviews["reviews"].extend(page_reviews)
-                                
-                                # Bu sayfadaki yorumları konsola yazdır
-                                print(f"\n✅ Sayfa {page_num}/{review_total_pages}: {len(page_reviews)} yorum bulundu")
-                                
-                                
-                                # Yorumları CSV dosyasına anlık olarak ekle
-                                if export_csv:
-                                    filtered_reviews = filter_unique_reviews(page_reviews, product_reviews["productInfo"])
-                                    if filtered_reviews:
-                                        await append_reviews_to_csv(filtered_reviews, product_reviews["productInfo"], csv_filename, is_first_write)
-                                        is_first_write = False  # İlk yazma işlemi tamamlandı
-                                        print(f"✅ Sayfa {page_num} yorumları CSV dosyasına eklendi")
-                            else:
-                                print(f"Page data: {page_data}")
-                                print(f"❌ Sayfa {page_num}: Yorum içeriği bulunamadı")
-                        else:
-                            print(f"❌ Sayfa {page_num}: Yorum bulunamadı")
-                            
-                            # Eğer art arda 5 sayfa boş gelirse, muhtemelen daha fazla sayfa yoktur
-                            if page_num > 5:
-                                empty_page_count = 1
-                                for i in range(1, 5):
-                                    if page_num - i >= 1:
-                                        prev_page_params = {
-                                            "page": page_num - i,
-                                            "order": "DESC",
-                                            "orderBy": "Score",
-                                            "channelId": "1",
-                                            "sellerId": merchant_id,
-                                            "contentId": content_id
-                                        }
-                                        
-                                        prev_page_data = await fetch_review_page(prev_page_params)
-                                        if not prev_page_data or not prev_page_data.get("result", {}).get("productReviews", {}).get("content"):
-                                            empty_page_count += 1
-                                    
-                                    if empty_page_count >= 5:
-                                        print(f"\n⚠️ Art arda 5 boş sayfa. Muhtemelen daha fazla yorum yok. Sayfa çekme işlemi durduruldu.")
-                                        break
-                        
-                        # Her 10 sayfada bir 3 saniye bekle (rate limiting'i önlemek için)
-                        if page_num % 10 == 0:
-                            print(f"Waiting 3 seconds to avoid rate limiting...")
-                            await asyncio.sleep(3)
-                        # Her sayfa isteği arasında 1 saniye bekle
-                        await asyncio.sleep(1)
-                        # Her 10 sayfada bir 5 saniye bekle
-                        if page_num % 10 == 0:
-                            await asyncio.sleep(5)
-                
-                # Bu ürünün tüm yorumlarını listeye ekle
+                    "merchantId": merchant_id,
+                    "boutiqueId": boutique_id
+                })
+            
+            if reviews is None:
+                print(f"❌ Yorumlar alınamadı!")
+                product_reviews["error"] = "Yorumlar alınamadı"
+            else:
+                product_reviews["reviews"].extend(reviews)
                 product_reviews["totalReviews"] = len(product_reviews["reviews"])
                 print(f"\n✅ TOPLAM: {product_reviews['totalReviews']} yorum toplandı")
             
-            # Sonraki sayfaya geç
-            current_page += 1
-            
-            # Tüm sayfalar tamamlandıysa döngüden çık
-            if current_page > total_pages:
-                has_next_page = False
-            
-            # Her sayfadan sonra 2 saniye bekle (rate limiting'i önlemek için)
-            print(f"Waiting 2 seconds before next page...")
-            await asyncio.sleep(2)
+            if on_product is not None:
+                await on_product(product_reviews)
+        
+        async def process_and_track(product: Dict):
+            try:
+                await process_product(product)
+                if checkpoint is not None:
+                    checkpoint.mark_product_done(_extract_content_id(product))
+                    await checkpoint.maybe_save(dedupe=dedupe)
+            finally:
+                progress.product_done()
+        
+        if parquet_writer is not None:
+            await parquet_writer.start()
+        try:
+            queue = await run_pipeline(produce_products, process_and_track, workers=settings.TRENDYOL_PRODUCT_WORKERS)
+        finally:
+            if parquet_writer is not None:
+                await parquet_writer.close()
+            if checkpoint is not None:
+                await checkpoint.save(dedupe=dedupe)
+            await review_store.flush()
+            if incremental:
+                watermark_store.save()
         
-        print(f"\n===== İŞLEM TAMAMLANDI: TOPLAM {len(all_products)} ÜRÜN TARANDI =====\n")
+        print(f"\n===== İŞLEM TAMAMLANDI: TOPLAM {total_products} ÜRÜN TARANDI ({queue.duplicates} tekrar atlandı) =====\n")
         
-        # CSV dosyası yolu
+        # CSV / Parquet dosyası yolu
         csv_path = None
-        if export_csv:
+        if parquet_writer is not None:
+            print(f"\n✅ Parquet dosyası oluşturuldu: {parquet_writer.file_path}")
+        elif export_csv:
             csv_path = os.path.join(os.getcwd(), csv_filename)
             print(f"\n✅ CSV dosyası oluşturuldu: {csv_path}")
         
-        return {
+        result = {
             "success": True,
-            "totalProducts": len(all_products),
+            "totalProducts": total_products,
             "totalPages": total_pages,
             "products": all_products,
             "csv_file": csv_path
         }
+        if parquet_writer is not None:
+            result["parquet_file"] = parquet_writer.file_path
+        return result
         
     except Exception as error:
         print(f'Trendyol ürün yorumları çekme hatası: {error}')
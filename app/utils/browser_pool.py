@@ -0,0 +1,349 @@
+import asyncio
+import logging
+from contextlib import asynccontextmanager
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from playwright.async_api import async_playwright, Browser, BrowserContext, Page
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Her context'e açılışta eklenecek temel Trendyol çerezleri
+TRENDYOL_BASE_COOKIES = [
+    {"name": "platform", "value": "web", "domain": ".trendyol.com", "path": "/"},
+    {"name": "countryCode", "value": "TR", "domain": ".trendyol.com", "path": "/"},
+    {"name": "language", "value": "tr", "domain": ".trendyol.com", "path": "/"},
+]
+
+
+class _BrowserHandle:
+    """Havuzdaki tek bir Chromium sürecinin durumunu tutar."""
+
+    def __init__(self, browser: Browser, index: int):
+        self.browser = browser
+        self.index = index
+        self.navigations = 0
+        self.checked_out = 0
+        self.retired = False
+        self.closed = False
+
+
+class _ContextSlot:
+    """Bir tarayıcıya ait, önceden çerezlenmiş tek bir context."""
+
+    def __init__(self, handle: _BrowserHandle, context: BrowserContext, profile: str):
+        self.handle = handle
+        self.context = context
+        self.profile = profile
+        # Ödünç verildiği süre boyunca bir sorun görülürse False yapılır
+        self.healthy = True
+
+
+class BrowserPool:
+    """
+    Uygulama ömrü boyunca açık kalan Chromium tarayıcı havuzu.
+
+    Her istekte tarayıcı başlatıp kapatmak yerine N adet sıcak tarayıcı tutar.
+    Her tarayıcıda profil başına birkaç context önceden açılır ve çerezlenir.
+    Sayfalar `checkout()` ile alınır, blok bitince havuza geri döner.
+    Bir tarayıcı K navigasyondan sonra veya bağlantısı koptuğunda yenisiyle değiştirilir.
+    """
+
+    def __init__(
+        self,
+        size: int = settings.BROWSER_POOL_SIZE,
+        contexts_per_browser: int = settings.BROWSER_POOL_CONTEXTS_PER_BROWSER,
+        max_navigations: int = settings.BROWSER_POOL_MAX_NAVIGATIONS,
+        healthcheck_interval: float = settings.BROWSER_POOL_HEALTHCHECK_INTERVAL,
+        checkout_timeout: float = settings.BROWSER_POOL_CHECKOUT_TIMEOUT,
+    ):
+        self.size = size
+        self.contexts_per_browser = contexts_per_browser
+        self.max_navigations = max_navigations
+        self.healthcheck_interval = healthcheck_interval
+        self.checkout_timeout = checkout_timeout
+
+        # Profil adı -> context'e eklenecek çerezler
+        self._profiles: Dict[str, List[Dict[str, str]]] = {"default": TRENDYOL_BASE_COOKIES}
+        # Context oluşturulduktan sonra çalıştırılacak kancalar (ör. route kuralları)
+        self._context_hooks: List[Callable[[BrowserContext, str], Any]] = []
+
+        self._playwright = None
+        self._handles: List[_BrowserHandle] = []
+        self._queues: Dict[str, asyncio.Queue] = {}
+        self._healthcheck_task: Optional[asyncio.Task] = None
+        self._refill_task: Optional[asyncio.Task] = None
+        self._start_lock = asyncio.Lock()
+        self._replace_lock = asyncio.Lock()
+        self._next_index = 0
+        self._started = False
+
+        # İstatistikler
+        self.launches = 0
+        self.recycles = 0
+        self.failed_launches = 0
+        self.checkouts = 0
+        self.context_checkouts = 0
+        self.api_requests = 0
+
+    def register_profile(self, name: str, cookies: List[Dict[str, str]]) -> None:
+        """Havuz başlamadan önce yeni bir çerez profili tanımlar."""
+        if self._started:
+            raise RuntimeError("Profiller havuz başlatılmadan önce tanımlanmalıdır.")
+        self._profiles[name] = cookies
+
+    def add_context_hook(self, hook: Callable[[BrowserContext, str], Any]) -> None:
+        """Her yeni context için çağrılacak (async) bir kanca ekler."""
+        self._context_hooks.append(hook)
+
+    async def start(self) -> None:
+        """Playwright'ı başlatır ve havuzu sıcak tarayıcılarla doldurur."""
+        async with self._start_lock:
+            if self._started:
+                return
+            self._playwright = await async_playwright().start()
+            self._queues = {profile: asyncio.Queue() for profile in self._profiles}
+            try:
+                for _ in range(self.size):
+                    await self._launch_browser()
+            except Exception:
+                # Yarım kalan başlatmayı geri al, bir sonraki checkout yeniden denesin
+                for handle in self._handles:
+                    await self._close_handle(handle)
+                self._handles.clear()
+                await self._playwright.stop()
+                self._playwright = None
+                raise
+            self._started = True
+            self._healthcheck_task = asyncio.create_task(self._healthcheck_loop())
+            logger.info(f"Tarayıcı havuzu başlatıldı: {self.size} tarayıcı, profil başına {self.contexts_per_browser} context.")
+
+    async def stop(self) -> None:
+        """Tüm tarayıcıları kapatır ve Playwright'ı durdurur."""
+        async with self._start_lock:
+            if not self._started:
+                return
+            self._started = False
+            if self._healthcheck_task:
+                self._healthcheck_task.cancel()
+                try:
+                    await self._healthcheck_task
+                except asyncio.CancelledError:
+                    pass
+                self._healthcheck_task = None
+            if self._refill_task:
+                self._refill_task.cancel()
+                await asyncio.gather(self._refill_task, return_exceptions=True)
+                self._refill_task = None
+            for handle in list(self._handles):
+                await self._close_handle(handle)
+            self._handles.clear()
+            self._queues.clear()
+            if self._playwright:
+                await self._playwright.stop()
+                self._playwright = None
+            logger.info("Tarayıcı havuzu kapatıldı.")
+
+    @asynccontextmanager
+    async def checkout(self, profile: str = "default"):
+        """
+        Havuzdan bir sayfa ödünç verir. Blok bittiğinde sayfa kapatılır ve
+        context havuza geri döner.
+
+        Kullanım:
+            async with browser_pool.checkout() as page:
+                await page.goto(url)
+        """
+        async with self._checkout_slot(profile) as slot:
+            page: Optional[Page] = None
+            try:
+                page = await slot.context.new_page()
+                self.checkouts += 1
+                yield page
+            finally:
+                if page is not None:
+                    try:
+                        await page.close()
+                    except Exception:
+                        slot.healthy = False
+
+    @asynccontextmanager
+    async def checkout_context(self, profile: str = "default"):
+        """
+        Sayfa açmadan sıcak bir context ödünç verir (ör. `context.request` ile
+        API çağrısı için). Blok bitince context havuza geri döner.
+        """
+        async with self._checkout_slot(profile) as slot:
+            self.context_checkouts += 1
+            yield slot.context
+
+    async def api_get(self, url: str, headers: Optional[Dict[str, str]] = None, profile: str = "default") -> Tuple[int, str]:
+        """
+        Sıcak bir context'in APIRequestContext'i (`context.request`) ile GET isteği
+        atar ve (durum kodu, gövde) döndürür. İstek context'in çerezleri ve
+        user-agent'ı ile gider, yanıttaki çerezler context'e yazılır; sayfa
+        açılmaz, HTML/JS render edilmez ve route kuralları devreye girmez.
+        """
+        async with self.checkout_context(profile) as context:
+            response = await context.request.get(url, headers=headers, timeout=settings.REQUEST_TIMEOUT * 1000)
+            try:
+                body = await response.text()
+            finally:
+                await response.dispose()
+            self.api_requests += 1
+            return response.status, body
+
+    @asynccontextmanager
+    async def _checkout_slot(self, profile: str):
+        if not self._started:
+            await self.start()
+        if profile not in self._queues:
+            raise KeyError(f"Tanımsız tarayıcı profili: {profile}")
+
+        slot = await self._acquire_slot(profile)
+        slot.healthy = True
+        try:
+            yield slot
+        except Exception:
+            slot.healthy = slot.healthy and slot.handle.browser.is_connected()
+            raise
+        finally:
+            await self._release_slot(slot, slot.healthy)
+
+    async def _acquire_slot(self, profile: str) -> _ContextSlot:
+        queue = self._queues[profile]
+        while True:
+            slot = await asyncio.wait_for(queue.get(), timeout=self.checkout_timeout)
+            # Emekliye ayrılmış tarayıcıya ait context'ler sessizce atılır
+            if slot.handle.retired or slot.handle.closed:
+                continue
+            slot.handle.checked_out += 1
+            return slot
+
+    async def _release_slot(self, slot: _ContextSlot, healthy: bool) -> None:
+        handle = slot.handle
+        handle.checked_out -= 1
+        handle.navigations += 1
+
+        if not healthy or not handle.browser.is_connected():
+            await self._retire(handle, reason="sağlıksız")
+        elif handle.navigations >= self.max_navigations:
+            await self._retire(handle, reason=f"{handle.navigations} navigasyon")
+
+        if handle.retired:
+            if handle.checked_out == 0:
+                await self._close_handle(handle)
+            return
+        if self._started:
+            self._queues[slot.profile].put_nowait(slot)
+
+    async def _launch_browser(self) -> _BrowserHandle:
+        browser = await self._playwright.chromium.launch(headless=True)
+        handle = _BrowserHandle(browser, self._next_index)
+        self._next_index += 1
+        self.launches += 1
+
+        try:
+            for profile, cookies in self._profiles.items():
+                for _ in range(self.contexts_per_browser):
+                    context = await browser.new_context(
+                        user_agent=settings.USER_AGENT,
+                        viewport={'width': 1920, 'height': 1080}
+                    )
+                    if cookies:
+                        await context.add_cookies(cookies)
+                    for hook in self._context_hooks:
+                        result = hook(context, profile)
+                        if asyncio.iscoroutine(result):
+                            await result
+                    self._queues[profile].put_nowait(_ContextSlot(handle, context, profile))
+        except Exception:
+            # Kuyruğa girmiş context'ler kapalı tarayıcıya ait olduğu için checkout'ta atlanır
+            await self._close_handle(handle)
+            raise
+
+        self._handles.append(handle)
+        return handle
+
+    async def _retire(self, handle: _BrowserHandle, reason: str) -> None:
+        """Tarayıcıyı emekliye ayırır ve yerine yenisini başlatır."""
+        async with self._replace_lock:
+            if handle.retired:
+                return
+            handle.retired = True
+            self.recycles += 1
+            logger.info(f"Tarayıcı #{handle.index} yenileniyor ({reason}).")
+            if handle in self._handles:
+                self._handles.remove(handle)
+            if self._started:
+                try:
+                    await self._launch_browser()
+                except Exception as e:
+                    self.failed_launches += 1
+                    logger.error(f"Yedek tarayıcı başlatılamadı, arka planda yeniden denenecek: {e}", exc_info=True)
+                    self._schedule_refill()
+        if handle.checked_out == 0:
+            await self._close_handle(handle)
+
+    def _schedule_refill(self) -> None:
+        """Havuz yapılandırılan boyutun altındaysa arka planda doldurmaya başlar."""
+        if self._started and (self._refill_task is None or self._refill_task.done()):
+            self._refill_task = asyncio.create_task(self._refill_loop())
+
+    async def _refill_loop(self) -> None:
+        """
+        Eksik tarayıcıları, başlatma başarısız oldukça artan bekleme süreleriyle
+        (1, 2, 4, ... en fazla healthcheck_interval saniye) havuz dolana kadar başlatır.
+        Böylece başarısız bir yenileme havuzdan kalıcı olarak yer eksiltmez.
+        """
+        delay = 1.0
+        while self._started and len(self._handles) < self.size:
+            try:
+                async with self._replace_lock:
+                    if self._started and len(self._handles) < self.size:
+                        await self._launch_browser()
+                delay = 1.0
+            except Exception as e:
+                self.failed_launches += 1
+                logger.warning(f"Tarayıcı başlatılamadı, {delay:.0f} sn sonra tekrar denenecek: {e}")
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, self.healthcheck_interval)
+
+    async def _close_handle(self, handle: _BrowserHandle) -> None:
+        if handle.closed:
+            return
+        handle.closed = True
+        try:
+            await handle.browser.close()
+        except Exception:
+            # Bağlantısı kopmuş tarayıcıyı kapatmak hata verebilir, önemsiz
+            pass
+
+    async def _healthcheck_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self.healthcheck_interval)
+            for handle in list(self._handles):
+                if not handle.browser.is_connected():
+                    await self._retire(handle, reason="bağlantı koptu")
+            if len(self._handles) < self.size:
+                self._schedule_refill()
+
+    def stats(self) -> Dict[str, Any]:
+        """Havuzun anlık durumunu döndürür."""
+        return {
+            "started": self._started,
+            "browsers": len(self._handles),
+            "idle_contexts": {profile: queue.qsize() for profile, queue in self._queues.items()},
+            "checked_out": sum(h.checked_out for h in self._handles),
+            "navigations": {h.index: h.navigations for h in self._handles},
+            "launches": self.launches,
+            "recycles": self.recycles,
+            "failed_launches": self.failed_launches,
+            "checkouts": self.checkouts,
+            "context_checkouts": self.context_checkouts,
+            "api_requests": self.api_requests,
+        }
+
+
+browser_pool = BrowserPool()
@@ -0,0 +1,185 @@
+import asyncio
+import logging
+import os
+import time
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from app.core.config import settings
+from app.utils.common import load_json_from_file, save_json_atomic
+from app.utils.dedupe import ReviewDeduplicator
+
+logger = logging.getLogger(__name__)
+
+
+class CrawlCheckpoint:
+    """
+    Bir taramanın kaldığı yerden devam edebilmesi için kalıcı kontrol noktası.
+
+    Saklananlar:
+    - tamamlanan arama sayfaları ve bu sayfalardan gelip henüz bitmemiş ürünler,
+    - tamamlanan ürün kimlikleri,
+    - ürün başına çıktı dosyasına yazılmış yorum sayfaları,
+    - çıktı dosyasının adı ve kontrol noktasındaki boyutu (byte).
+
+    Durum tek bir anda (event loop içinde, araya await girmeden) kopyalanıp
+    thread'de atomik olarak yazılır; böylece dosya boyutu, sayfa/ürün listesi ve
+    (verilirse) tekilleştirme durumu birbiriyle tutarlıdır. Devam ederken çıktı
+    dosyası `prepare_output()` ile kayıtlı boyuta kısaltılır, son kontrol
+    noktasından sonra yazılmış yarım satırlar atılır.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        dedupe_path: Optional[str] = None,
+        save_interval: float = settings.CHECKPOINT_SAVE_INTERVAL,
+    ):
+        self.path = path
+        self.dedupe_path = dedupe_path
+        self.save_interval = save_interval
+        self.total_pages: Optional[int] = None
+        self.output_file: Optional[str] = None
+        self.output_offset = 0
+        self._search_pages: Set[int] = set()
+        self._pending: Dict[str, Dict[str, Any]] = {}
+        self._done: Set[str] = set()
+        self._review_pages: Dict[str, Set[int]] = {}
+        self._lock = asyncio.Lock()
+        self._last_save = time.monotonic()
+        self.saves = 0
+        self.resumed = False
+
+    @classmethod
+    def load(cls, path: str, dedupe_path: Optional[str] = None) -> "CrawlCheckpoint":
+        """Kayıtlı kontrol noktasını yükler; yoksa boş bir kontrol noktası döner."""
+        checkpoint = cls(path, dedupe_path)
+        try:
+            data = load_json_from_file(path)
+        except Exception as e:
+            logger.error(f"Kontrol noktası okunamadı, baştan başlanıyor ({path}): {e}")
+            data = {}
+        if data:
+            checkpoint.resumed = True
+            checkpoint.total_pages = data.get("total_pages")
+            checkpoint.output_file = data.get("output_file")
+            checkpoint.output_offset = data.get("output_offset", 0)
+            checkpoint._search_pages = set(data.get("search_pages", []))
+            checkpoint._pending = data.get("pending_products", {})
+            checkpoint._done = set(data.get("products_done", []))
+            checkpoint._review_pages = {key: set(pages) for key, pages in data.get("review_pages", {}).items()}
+        return checkpoint
+
+    # --- Arama sayfaları ---
+
+    def search_page_done(self, page: int) -> bool:
+        return page in self._search_pages
+
+    def mark_search_page(self, page: int, products: Iterable[Tuple[str, Dict[str, Any]]]) -> None:
+        """Arama sayfasını tamamlandı işaretler; sayfadan kuyruğa alınan ürünler bekleyen listesine girer."""
+        self._search_pages.add(page)
+        for key, product in products:
+            if key not in self._done:
+                self._pending[key] = product
+
+    def pending_products(self) -> List[Tuple[str, Dict[str, Any]]]:
+        """Önceki çalışmada kuyruğa alınıp bitmemiş ürünler (kuyruğa ilk olarak geri alınmalı)."""
+        return list(self._pending.items())
+
+    # --- Ürünler ve yorum sayfaları ---
+
+    def product_done(self, key: str) -> bool:
+        return key in self._done
+
+    def mark_product_done(self, key: str) -> None:
+        self._done.add(key)
+        self._pending.pop(key, None)
+        self._review_pages.pop(key, None)
+
+    def review_pages(self, key: str) -> Set[int]:
+        return self._review_pages.get(key, set())
+
+    def mark_review_page(self, key: str, page: int) -> None:
+        self._review_pages.setdefault(key, set()).add(page)
+
+    @property
+    def products_done(self) -> int:
+        return len(self._done)
+
+    # --- Çıktı dosyası ---
+
+    def prepare_output(self, file_path: str) -> int:
+        """
+        Çıktı dosyasını kontrol noktasına hizalar ve yazmaya devam edilecek
+        byte konumunu döndürür (0: dosya baştan, başlık satırıyla yazılmalı).
+        """
+        self.output_file = file_path
+        if not self.resumed or not os.path.exists(file_path):
+            self.output_offset = 0
+            return 0
+        size = os.path.getsize(file_path)
+        if size > self.output_offset:
+            logger.info(f"Çıktı dosyası kontrol noktasına kısaltılıyor: {file_path} ({size} -> {self.output_offset} byte)")
+            with open(file_path, "r+b") as f:
+                f.truncate(self.output_offset)
+        elif size < self.output_offset:
+            # Dosya kontrol noktasından kısa: kayıtlı ilerleme güvenilmez, baştan yazılır
+            logger.warning(f"Çıktı dosyası kontrol noktasından kısa, tarama baştan başlıyor: {file_path}")
+            self._search_pages.clear()
+            self._pending.clear()
+            self._done.clear()
+            self._review_pages.clear()
+            self.total_pages = None
+            self.output_offset = 0
+        return self.output_offset
+
+    # --- Kaydetme ---
+
+    def _snapshot(self, output_offset: Optional[int]) -> Dict[str, Any]:
+        if output_offset is None and self.output_file and os.path.exists(self.output_file):
+            output_offset = os.path.getsize(self.output_file)
+        if output_offset is not None:
+            self.output_offset = output_offset
+        return {
+            "total_pages": self.total_pages,
+            "output_file": self.output_file,
+            "output_offset": self.output_offset,
+            "search_pages": sorted(self._search_pages),
+            "pending_products": dict(self._pending),
+            "products_done": sorted(self._done),
+            "review_pages": {key: sorted(pages) for key, pages in self._review_pages.items()},
+        }
+
+    def _write_sync(self, data: Dict[str, Any], dedupe_bytes: Optional[bytes]) -> None:
+        if self.output_file and os.path.exists(self.output_file):
+            # Kayıtlı boyuta kadar olan satırlar diskte olmalı
+            with open(self.output_file, "ab") as f:
+                os.fsync(f.fileno())
+        if dedupe_bytes is not None and self.dedupe_path:
+            ReviewDeduplicator.write_bytes(dedupe_bytes, self.dedupe_path)
+        save_json_atomic(data, self.path)
+
+    async def save(self, output_offset: Optional[int] = None, dedupe: Optional[ReviewDeduplicator] = None) -> None:
+        """
+        Kontrol noktasını hemen yazar. `output_offset` verilmezse çıktı dosyasının
+        o anki boyutu kullanılır. `dedupe` verilirse aynı anda onun durumu da yazılır.
+        """
+        async with self._lock:
+            data = self._snapshot(output_offset)
+            dedupe_bytes = dedupe.to_bytes() if dedupe is not None else None
+            self._last_save = time.monotonic()
+            try:
+                await asyncio.to_thread(self._write_sync, data, dedupe_bytes)
+                self.saves += 1
+            except Exception as e:
+                logger.error(f"Kontrol noktası yazılamadı ({self.path}): {e}")
+
+    async def maybe_save(self, output_offset: Optional[int] = None, dedupe: Optional[ReviewDeduplicator] = None) -> None:
+        """Son kayıttan bu yana `save_interval` saniye geçtiyse kaydeder."""
+        if self._lock.locked() or time.monotonic() - self._last_save < self.save_interval:
+            return
+        await self.save(output_offset, dedupe)
+
+    def delete(self) -> None:
+        for path in (self.path, self.dedupe_path):
+            if path and os.path.exists(path):
+                os.remove(path)
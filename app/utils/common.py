@@ -21,6 +21,24 @@ def save_json_to_file(data: Dict[str, Any], file_path: str) -> str:
     
     return file_path
 
+def save_json_atomic(data: Dict[str, Any], file_path: str) -> str:
+    """
+    Veriyi JSON olarak geçici dosyaya yazıp fsync eder, sonra hedefin üzerine
+    taşır (os.replace). Yazma sırasında süreç ölse bile dosya ya eski ya yeni
+    haliyle kalır, yarım yazılmış olmaz.
+    """
+    directory = os.path.dirname(file_path)
+    ensure_directory_exists(directory)
+
+    tmp_path = f"{file_path}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, ensure_ascii=False)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, file_path)
+
+    return file_path
+
 def load_json_from_file(file_path: str) -> Dict[str, Any]:
     """
     Dosyadan JSON verisini okur.
@@ -0,0 +1,182 @@
+import asyncio
+import csv
+import logging
+import os
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Yazıcı görevine "kapat" sinyali vermek için kullanılan nesne
+_CLOSE = object()
+
+
+class CsvWriterStage:
+    """
+    Kuyruktan beslenen, csv.DictWriter'ın tek sahibi olan yazıcı aşaması.
+
+    Ürünler paralel işlenir, her biri `put(index, rows)` ile satırlarını gönderir.
+    - `ordered=False`: satırlar tamamlanma sırasıyla yazılır.
+    - `ordered=True`: satırlar bir yeniden sıralama tamponunda bekletilir ve
+      `index` sırasıyla (0, 1, 2, ...) yazılır. Satırı olmayan/başarısız ürünler
+      için de `put(index, [])` çağrılmalıdır, aksi halde tampon o indeksi bekler.
+    - Satırlar `batch_size` adetlik gruplar halinde yazılır; dosya her grupta
+      flush edilir ve en fazla `fsync_interval` saniyede bir diske fsync edilir.
+    - `resume_offset` > 0 ise mevcut dosya bu boyuta kısaltılıp sonuna eklenir
+      (başlık tekrar yazılmaz). `on_sync(keys, offset)` her fsync'ten sonra,
+      satırları artık diskte olan ürünlerin `put(..., key=...)` anahtarları ve
+      dosyanın o anki boyutuyla çağrılır (kontrol noktası için).
+    """
+
+    def __init__(
+        self,
+        file_path: str,
+        fieldnames: List[str],
+        ordered: bool = settings.CSV_WRITER_ORDERED,
+        batch_size: int = settings.CSV_WRITER_BATCH_SIZE,
+        fsync_interval: float = settings.CSV_WRITER_FSYNC_INTERVAL,
+        queue_maxsize: int = settings.CSV_WRITER_QUEUE_SIZE,
+        resume_offset: int = 0,
+        on_sync: Optional[Callable[[List[Any], int], Awaitable[None]]] = None,
+    ):
+        self.file_path = file_path
+        self.fieldnames = fieldnames
+        self.ordered = ordered
+        self.batch_size = max(1, batch_size)
+        self.fsync_interval = fsync_interval
+        self.resume_offset = resume_offset
+        self.on_sync = on_sync
+        self._queue: asyncio.Queue = asyncio.Queue(queue_maxsize)
+        self._task: Optional[asyncio.Task] = None
+        self._file = None
+        self._writer: Optional[csv.DictWriter] = None
+        self._pending_rows: List[Dict[str, Any]] = []
+        self._reorder_buffer: Dict[int, Tuple[List[Dict[str, Any]], Any]] = {}
+        # Satırları tampondaki / flush edilmiş ama henüz fsync edilmemiş ürün anahtarları
+        self._pending_keys: List[Any] = []
+        self._unsynced_keys: List[Any] = []
+        self._next_index = 0
+        self._last_fsync = time.monotonic()
+        self._unsynced = False
+
+        # İstatistikler
+        self.products_written = 0
+        self.rows_written = 0
+        self.batches = 0
+        self.fsyncs = 0
+        self.max_reorder_buffer = 0
+
+    async def __aenter__(self) -> "CsvWriterStage":
+        await self.start()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        await self.close()
+
+    async def start(self) -> None:
+        os.makedirs(os.path.dirname(self.file_path), exist_ok=True)
+        if self.resume_offset > 0:
+            self._file = open(self.file_path, 'r+', newline='', encoding='utf-8')
+            self._file.truncate(self.resume_offset)
+            self._file.seek(self.resume_offset)
+            self._writer = csv.DictWriter(self._file, fieldnames=self.fieldnames)
+        else:
+            self._file = open(self.file_path, 'w', newline='', encoding='utf-8')
+            self._writer = csv.DictWriter(self._file, fieldnames=self.fieldnames)
+            self._writer.writeheader()
+        self._task = asyncio.create_task(self._run())
+
+    async def put(self, index: int, rows: List[Dict[str, Any]], key: Any = None) -> None:
+        """Bir ürünün satırlarını yazıcı kuyruğuna ekler (kuyruk doluysa bekler)."""
+        if self._task is None or self._task.done():
+            raise RuntimeError("CSV yazıcısı çalışmıyor")
+        await self._queue.put((index, rows, key))
+
+    async def close(self) -> None:
+        """Kuyruktaki tüm satırları yazar, dosyayı fsync edip kapatır."""
+        if self._task is None:
+            return
+        if not self._task.done():
+            await self._queue.put(_CLOSE)
+        try:
+            await self._task
+        finally:
+            self._task = None
+            # Sırası gelmeyen (eksik indeksli) satırlar da kaybolmasın
+            for index in sorted(self._reorder_buffer):
+                self._accept(*self._reorder_buffer.pop(index))
+            self._flush()
+            await self._fsync()
+            self._file.close()
+            logger.info(f"CSV yazıcısı kapatıldı: {self.file_path} {self.stats()}")
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                item = await asyncio.wait_for(self._queue.get(), timeout=self.fsync_interval)
+            except asyncio.TimeoutError:
+                # Uzun süre yeni ürün gelmezse bekleyen satırlar da diske yazılsın
+                await self._fsync()
+                continue
+            if item is _CLOSE:
+                return
+            index, rows, key = item
+            if self.ordered:
+                self._reorder_buffer[index] = (rows, key)
+                self.max_reorder_buffer = max(self.max_reorder_buffer, len(self._reorder_buffer))
+                while self._next_index in self._reorder_buffer:
+                    self._accept(*self._reorder_buffer.pop(self._next_index))
+                    self._next_index += 1
+            else:
+                self._accept(rows, key)
+            if len(self._pending_rows) >= self.batch_size:
+                self._flush()
+            if time.monotonic() - self._last_fsync >= self.fsync_interval:
+                await self._fsync()
+
+    def _accept(self, rows: List[Dict[str, Any]], key: Any = None) -> None:
+        if rows:
+            self.products_written += 1
+            self._pending_rows.extend(rows)
+        if key is not None:
+            self._pending_keys.append(key)
+
+    def _flush(self) -> None:
+        self._unsynced_keys.extend(self._pending_keys)
+        self._pending_keys = []
+        if not self._pending_rows:
+            return
+        self._writer.writerows(self._pending_rows)
+        self._file.flush()
+        self.rows_written += len(self._pending_rows)
+        self.batches += 1
+        self._pending_rows = []
+        self._unsynced = True
+
+    async def _fsync(self) -> None:
+        self._flush()
+        self._last_fsync = time.monotonic()
+        if not self._unsynced and not self._unsynced_keys:
+            return
+        keys, self._unsynced_keys = self._unsynced_keys, []
+        if self._unsynced:
+            self._unsynced = False
+            # fsync bloklayıcıdır, event loop'u durdurmamak için thread'de çalıştır
+            await asyncio.to_thread(os.fsync, self._file.fileno())
+            self.fsyncs += 1
+        if self.on_sync is not None:
+            await self.on_sync(keys, os.fstat(self._file.fileno()).st_size)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "ordered": self.ordered,
+            "products_written": self.products_written,
+            "rows_written": self.rows_written,
+            "batches": self.batches,
+            "fsyncs": self.fsyncs,
+            "pending_rows": len(self._pending_rows),
+            "reorder_buffer": len(self._reorder_buffer),
+            "max_reorder_buffer": self.max_reorder_buffer,
+        }
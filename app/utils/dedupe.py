@@ -0,0 +1,326 @@
+import bisect
+import hashlib
+import json
+import logging
+import math
+import os
+import sys
+from array import array
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Pazaryeri bazında yorumun kararlı kimlik alanı ve kimlik yoksa kullanılacak alanlar
+REVIEW_IDENTITY_FIELDS = {
+    "trendyol": ("id", ("userFullName", "comment")),
+    "hepsiburada": ("id", ("customer.displayName", "review.content", "createdAt")),
+}
+
+
+def _get_path(data: Dict[str, Any], dotted: str) -> Any:
+    for part in dotted.split("."):
+        if not isinstance(data, dict):
+            return None
+        data = data.get(part)
+    return data
+
+
+def review_digest(marketplace: str, product_id: str, review: Dict[str, Any]) -> bytes:
+    """
+    Yorum için 128 bit'lik kararlı bir özet üretir. Mümkünse upstream yorum
+    kimliği kullanılır; yoksa yazar/metin alanları özetlenir. Hash modunda özetin
+    ilk 64 bit'i, bloom modunda tamamı kullanılır; bellekte yorum metni tutulmaz.
+    """
+    id_field, fallback_fields = REVIEW_IDENTITY_FIELDS[marketplace]
+    review_id = review.get(id_field)
+    if review_id is not None:
+        identity = f"{marketplace}|{product_id}|id:{review_id}"
+    else:
+        identity = f"{marketplace}|{product_id}|" + "|".join(str(_get_path(review, field) or "") for field in fallback_fields)
+    return hashlib.blake2b(identity.encode("utf-8"), digest_size=16).digest()
+
+
+class BloomFilter:
+    """Sabit kapasiteli Bloom filtresi (double hashing ile k adet bit pozisyonu)."""
+
+    def __init__(self, capacity: int, error_rate: float, bits: Optional[bytearray] = None, count: int = 0):
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.num_bits = max(8, int(math.ceil(-capacity * math.log(error_rate) / (math.log(2) ** 2))))
+        self.num_hashes = max(1, int(round(self.num_bits / capacity * math.log(2))))
+        self.bits = bits if bits is not None else bytearray((self.num_bits + 7) // 8)
+        self.count = count
+
+    def _positions(self, digest: bytes):
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:16], "little") | 1
+        for i in range(self.num_hashes):
+            yield (h1 + i * h2) % self.num_bits
+
+    def __contains__(self, digest: bytes) -> bool:
+        return all(self.bits[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(digest))
+
+    def add(self, digest: bytes) -> None:
+        for pos in self._positions(digest):
+            self.bits[pos >> 3] |= 1 << (pos & 7)
+        self.count += 1
+
+
+class ScalableBloomFilter:
+    """
+    Dolunca yeni (2 kat büyük, daha sıkı hata oranlı) katman ekleyen Bloom filtresi.
+    Toplam yanlış pozitif oranı yaklaşık `error_rate` ile sınırlı kalır.
+    """
+
+    GROWTH = 2
+    TIGHTENING = 0.9
+
+    def __init__(self, initial_capacity: int, error_rate: float):
+        self.initial_capacity = initial_capacity
+        self.error_rate = error_rate
+        self.layers: List[BloomFilter] = []
+
+    def _add_layer(self) -> BloomFilter:
+        index = len(self.layers)
+        layer = BloomFilter(
+            self.initial_capacity * (self.GROWTH ** index),
+            self.error_rate * (1 - self.TIGHTENING) * (self.TIGHTENING ** index),
+        )
+        self.layers.append(layer)
+        return layer
+
+    def __contains__(self, digest: bytes) -> bool:
+        return any(digest in layer for layer in self.layers)
+
+    def add(self, digest: bytes) -> None:
+        layer = self.layers[-1] if self.layers else self._add_layer()
+        if layer.count >= layer.capacity:
+            layer = self._add_layer()
+        layer.add(digest)
+
+    def __len__(self) -> int:
+        return sum(layer.count for layer in self.layers)
+
+    def memory_bytes(self) -> int:
+        return sum(len(layer.bits) for layer in self.layers)
+
+
+class SortedHashSet:
+    """
+    64 bit'lik anahtarlar için kompakt küme.
+
+    Anahtarlar üst BUCKET_BITS bit'lerine göre kovalara ayrılır; her kova sıralı bir
+    array('Q')'dur (anahtar başına 8 byte). Sorgu ve ekleme kova içinde ikili
+    aramayla yapılır; kovalar küçük kaldığı için eklemedeki kaydırma maliyeti düşüktür. Kovalar sırayla birleştirildiğinde tüm
+    anahtarlar sıralı olur.
+    """
+
+    BUCKET_BITS = 12
+
+    def __init__(self):
+        self._shift = 64 - self.BUCKET_BITS
+        self._buckets: List[Optional[array]] = [None] * (1 << self.BUCKET_BITS)
+        self._count = 0
+
+    @classmethod
+    def from_bytes(cls, payload: bytes, is_sorted: bool = True) -> "SortedHashSet":
+        keys = array("Q")
+        keys.frombytes(payload)
+        if not is_sorted:
+            # Eski sürümlerin yazdığı sırasız durum dosyası
+            keys = array("Q", sorted(set(keys)))
+        hash_set = cls()
+        start = 0
+        for index in range(len(hash_set._buckets)):
+            end = bisect.bisect_left(keys, (index + 1) << hash_set._shift, start)
+            if end > start:
+                hash_set._buckets[index] = keys[start:end]
+            start = end
+        hash_set._count = len(keys)
+        return hash_set
+
+    def __contains__(self, key: int) -> bool:
+        bucket = self._buckets[key >> self._shift]
+        if bucket is None:
+            return False
+        index = bisect.bisect_left(bucket, key)
+        return index < len(bucket) and bucket[index] == key
+
+    def add(self, key: int) -> None:
+        index = key >> self._shift
+        bucket = self._buckets[index]
+        if bucket is None:
+            self._buckets[index] = array("Q", [key])
+            self._count += 1
+            return
+        position = bisect.bisect_left(bucket, key)
+        if position < len(bucket) and bucket[position] == key:
+            return
+        bucket.insert(position, key)
+        self._count += 1
+
+    def __len__(self) -> int:
+        return self._count
+
+    def to_bytes(self) -> bytes:
+        return b"".join(bucket.tobytes() for bucket in self._buckets if bucket is not None)
+
+    def memory_bytes(self) -> int:
+        return sys.getsizeof(self._buckets) + sum(sys.getsizeof(bucket) for bucket in self._buckets if bucket is not None)
+
+
+class ReviewDeduplicator:
+    """
+    Trendyol ve Hepsiburada için ortak yorum tekilleştirici.
+
+    - "hash" modu: her yorumun 64 bit'lik özeti sıralı bir dizide tutulur
+      (büyük taramalarda yorum başına ~9 byte; 64 bit'te çakışma olasılığı ihmal edilebilir).
+    - "bloom" modu: ölçeklenebilir Bloom filtresi kullanılır; çok büyük taramalarda
+      bellek sabit kalır, karşılığında çok küçük bir oranda (DEDUPE_BLOOM_ERROR_RATE)
+      yeni yorum yanlışlıkla tekrar sayılabilir.
+
+    Durum `save()` / `load()` ile diske yazılıp devam ettirilen işlerde geri yüklenebilir.
+    """
+
+    def __init__(
+        self,
+        mode: str = settings.DEDUPE_MODE,
+        bloom_initial_capacity: int = settings.DEDUPE_BLOOM_INITIAL_CAPACITY,
+        bloom_error_rate: float = settings.DEDUPE_BLOOM_ERROR_RATE,
+    ):
+        if mode not in ("hash", "bloom"):
+            raise ValueError(f"Geçersiz tekilleştirme modu: {mode}")
+        self.mode = mode
+        self._hashes = SortedHashSet()
+        self._bloom = ScalableBloomFilter(bloom_initial_capacity, bloom_error_rate) if mode == "bloom" else None
+        self.seen = 0
+        self.duplicates = 0
+
+    def _contains(self, digest: bytes) -> bool:
+        if self._bloom is not None:
+            return digest in self._bloom
+        return int.from_bytes(digest[:8], "little") in self._hashes
+
+    def _insert(self, digest: bytes) -> None:
+        if self._bloom is not None:
+            self._bloom.add(digest)
+        else:
+            self._hashes.add(int.from_bytes(digest[:8], "little"))
+
+    def add(self, marketplace: str, product_id: str, review: Dict[str, Any]) -> bool:
+        """Yorum ilk kez görülüyorsa kaydeder ve True döner."""
+        digest = review_digest(marketplace, str(product_id), review)
+        self.seen += 1
+        if self._contains(digest):
+            self.duplicates += 1
+            return False
+        self._insert(digest)
+        return True
+
+    def check(self, marketplace: str, product_id: str, reviews: List[Dict[str, Any]]) -> Tuple[List[Dict[str, Any]], List[bytes]]:
+        """
+        Daha önce görülmemiş yorumları ve özetlerini döndürür, durumu değiştirmez.
+        Yorumlar yazıldıktan sonra özetler `commit()` ile kaydedilmelidir.
+        """
+        product_id = str(product_id)
+        new_reviews: List[Dict[str, Any]] = []
+        digests: List[bytes] = []
+        batch = set()
+        for review in reviews:
+            digest = review_digest(marketplace, product_id, review)
+            self.seen += 1
+            if digest in batch or self._contains(digest):
+                self.duplicates += 1
+                continue
+            batch.add(digest)
+            new_reviews.append(review)
+            digests.append(digest)
+        return new_reviews, digests
+
+    def commit(self, digests: Iterable[bytes]) -> None:
+        for digest in digests:
+            self._insert(digest)
+
+    def filter(self, marketplace: str, product_id: str, reviews: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Daha önce görülmemiş yorumları döndürür ve görülmüş olarak kaydeder."""
+        new_reviews, digests = self.check(marketplace, product_id, reviews)
+        self.commit(digests)
+        return new_reviews
+
+    def __len__(self) -> int:
+        return len(self._bloom) if self._bloom is not None else len(self._hashes)
+
+    # --- Kalıcılık ---
+
+    def to_bytes(self) -> bytes:
+        """
+        Durumu ikili forma çevirir: ilk satır JSON başlık, ardından ham veri
+        (hash modunda 64 bit'lik özetler, bloom modunda katman bitleri).
+        Event loop içinde çağrılmalıdır; böylece yazma sırasında küme değişmez.
+        """
+        header: Dict[str, Any] = {"mode": self.mode, "seen": self.seen, "duplicates": self.duplicates, "sorted": True}
+        if self._bloom is not None:
+            header["bloom"] = {
+                "initial_capacity": self._bloom.initial_capacity,
+                "error_rate": self._bloom.error_rate,
+                "layers": [{"capacity": layer.capacity, "error_rate": layer.error_rate, "count": layer.count} for layer in self._bloom.layers],
+            }
+            payload = b"".join(bytes(layer.bits) for layer in self._bloom.layers)
+        else:
+            payload = self._hashes.to_bytes()
+        return json.dumps(header).encode("utf-8") + b"\n" + payload
+
+    @staticmethod
+    def write_bytes(data: bytes, path: str) -> str:
+        """`to_bytes()` çıktısını dosyaya atomik olarak yazar (thread'de çalıştırılabilir)."""
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+        return path
+
+    def save(self, path: str) -> str:
+        return self.write_bytes(self.to_bytes(), path)
+
+    @classmethod
+    def load(cls, path: str) -> "ReviewDeduplicator":
+        """`save()` ile yazılmış durumu yükler; dosya yoksa boş bir tekilleştirici döner."""
+        if not os.path.exists(path):
+            return cls()
+        with open(path, "rb") as f:
+            header = json.loads(f.readline())
+            payload = f.read()
+        if header["mode"] == "bloom":
+            bloom_header = header["bloom"]
+            dedupe = cls("bloom", bloom_header["initial_capacity"], bloom_header["error_rate"])
+            offset = 0
+            for layer_header in bloom_header["layers"]:
+                layer = BloomFilter(layer_header["capacity"], layer_header["error_rate"], count=layer_header["count"])
+                size = len(layer.bits)
+                layer.bits = bytearray(payload[offset:offset + size])
+                offset += size
+                dedupe._bloom.layers.append(layer)
+        else:
+            dedupe = cls("hash")
+            dedupe._hashes = SortedHashSet.from_bytes(payload, is_sorted=header.get("sorted", False))
+        dedupe.seen = header.get("seen", 0)
+        dedupe.duplicates = header.get("duplicates", 0)
+        return dedupe
+
+    def stats(self) -> Dict[str, Any]:
+        if self._bloom is not None:
+            memory = self._bloom.memory_bytes()
+        else:
+            memory = self._hashes.memory_bytes()
+        return {
+            "mode": self.mode,
+            "unique": len(self),
+            "seen": self.seen,
+            "duplicates": self.duplicates,
+            "approx_payload_bytes": memory,
+        }
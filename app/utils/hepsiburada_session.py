@@ -0,0 +1,147 @@
+import asyncio
+import logging
+import time
+from typing import Dict, Optional
+
+from app.core.config import settings
+from app.utils.hepsiburada_cookie_fetcher import fetch_hepsiburada_cookies_async
+
+logger = logging.getLogger(__name__)
+
+
+class HepsiburadaSession:
+    """Tek bir cookie ısınmasından elde edilen Akamai cookie seti ve User-Agent."""
+
+    def __init__(self, cookies: Dict[str, str], user_agent: str, generation: int):
+        self.cookies = cookies
+        self.user_agent = user_agent
+        self.generation = generation
+        self.created_at = time.monotonic()
+
+    @property
+    def cookie_string(self) -> str:
+        return "; ".join([f"{k}={v}" for k, v in self.cookies.items()])
+
+    def age(self) -> float:
+        return time.monotonic() - self.created_at
+
+
+class HepsiburadaSessionProvider:
+    """
+    Hepsiburada cookie/oturum sağlayıcısı.
+
+    Cookie ısınması (sayfaya gitme, kaydırma, 3-7 sn bekleme) her API çağrısında
+    değil, sadece oturum süresi (TTL) dolduğunda veya 403 alındığında yapılır.
+    Aynı anda bekleyen tüm çağrılar tek bir yenileme işlemini paylaşır (singleflight).
+    Arka plan görevi, oturum süresi dolmadan önce proaktif olarak yeniler.
+    """
+
+    def __init__(self, ttl: float = settings.HEPSIBURADA_SESSION_TTL, refresh_margin: float = settings.HEPSIBURADA_SESSION_REFRESH_MARGIN):
+        self.ttl = ttl
+        self.refresh_margin = refresh_margin
+        self._session: Optional[HepsiburadaSession] = None
+        self._refresh_task: Optional[asyncio.Task] = None
+        self._background_task: Optional[asyncio.Task] = None
+        self._session_ready = asyncio.Event()
+        self._generation = 0
+
+        # İstatistikler
+        self.refreshes = 0
+        self.failed_refreshes = 0
+        self.invalidations = 0
+        self.hits = 0
+
+    def _is_fresh(self, session: Optional[HepsiburadaSession]) -> bool:
+        return session is not None and session.age() < self.ttl
+
+    async def get(self) -> Optional[HepsiburadaSession]:
+        """Geçerli oturumu döndürür; yoksa veya süresi dolduysa yeniler."""
+        session = self._session
+        if self._is_fresh(session):
+            self.hits += 1
+            return session
+        return await self._refresh()
+
+    async def invalidate(self, stale: Optional[HepsiburadaSession]) -> Optional[HepsiburadaSession]:
+        """
+        403 gibi bir hatadan sonra çağrılır. Eğer başka bir çağrı oturumu zaten
+        yenilediyse yeni oturumu döndürür, aksi halde tek bir yenileme başlatır.
+        """
+        current = self._session
+        if stale is not None and current is not None and current.generation != stale.generation:
+            return current
+        self.invalidations += 1
+        self._session = None
+        return await self._refresh()
+
+    async def _refresh(self) -> Optional[HepsiburadaSession]:
+        # Devam eden bir yenileme varsa ona katıl, yenisini başlatma
+        if self._refresh_task is None or self._refresh_task.done():
+            self._refresh_task = asyncio.create_task(self._do_refresh())
+        # shield: bekleyen çağrılardan biri iptal edilse bile yenileme yarıda kalmaz
+        return await asyncio.shield(self._refresh_task)
+
+    async def _do_refresh(self) -> Optional[HepsiburadaSession]:
+        cookies, user_agent = await fetch_hepsiburada_cookies_async()
+        if not cookies:
+            self.failed_refreshes += 1
+            logger.error("Hepsiburada oturumu yenilenemedi, cookie'ler alınamadı.")
+            return None
+        self._generation += 1
+        self._session = HepsiburadaSession(cookies, user_agent, self._generation)
+        self.refreshes += 1
+        self._session_ready.set()
+        logger.info(f"Hepsiburada oturumu yenilendi (nesil {self._generation}).")
+        return self._session
+
+    async def start(self) -> None:
+        """Süresi dolmadan önce oturumu yenileyen arka plan görevini başlatır."""
+        if self._background_task is None or self._background_task.done():
+            self._background_task = asyncio.create_task(self._background_loop())
+
+    async def stop(self) -> None:
+        for task in (self._background_task, self._refresh_task):
+            if task and not task.done():
+                task.cancel()
+                try:
+                    await task
+                except asyncio.CancelledError:
+                    pass
+        self._background_task = None
+        self._refresh_task = None
+
+    async def _background_loop(self) -> None:
+        while True:
+            # Hiç oturum kullanılmadıysa Chrome'u boşuna başlatma, ilk oturumu bekle
+            await self._session_ready.wait()
+            session = self._session
+            if session is None:
+                self._session_ready.clear()
+                continue
+            delay = max(self.ttl - self.refresh_margin - session.age(), 0)
+            await asyncio.sleep(delay)
+            if self._session is session:
+                try:
+                    refreshed = await self._refresh()
+                except Exception as e:
+                    logger.error(f"Arka plan oturum yenilemesi başarısız: {e}", exc_info=True)
+                    refreshed = None
+                if refreshed is None:
+                    # Başarısız yenilemeyi hemen tekrarlama, bir sonraki denemeye kadar bekle
+                    await asyncio.sleep(self.refresh_margin)
+
+    def stats(self) -> Dict[str, object]:
+        session = self._session
+        return {
+            "has_session": session is not None,
+            "generation": session.generation if session else None,
+            "age_seconds": round(session.age(), 1) if session else None,
+            "ttl_seconds": self.ttl,
+            "hits": self.hits,
+            "refreshes": self.refreshes,
+            "failed_refreshes": self.failed_refreshes,
+            "invalidations": self.invalidations,
+        }
+
+
+hepsiburada_session = HepsiburadaSessionProvider()
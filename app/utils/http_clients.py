@@ -0,0 +1,131 @@
+import logging
+from collections import Counter
+from http.cookiejar import CookieJar, DefaultCookiePolicy
+from typing import Any, Dict, Optional
+from urllib.parse import urlparse
+
+import httpx
+
+from app.core.config import settings
+from app.utils.rate_limiter import rate_limiter, parse_retry_after
+
+logger = logging.getLogger(__name__)
+
+try:
+    import h2  # noqa: F401  HTTP/2 desteği için httpx[http2] gerekir
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+
+class HttpClientRegistry:
+    """
+    Uygulama genelinde paylaşılan, host bazlı httpx.AsyncClient kayıt defteri.
+
+    Her upstream host (veya "www.*" gibi bir desen) için tek bir client tutulur.
+    Böylece TCP/TLS bağlantıları keep-alive ile yeniden kullanılır ve HTTP/2
+    çoklama (multiplexing) devreye girer. Havuz limitleri, keep-alive süresi,
+    HTTP/2 ve zaman aşımları host bazında ayarlardan okunur.
+    """
+
+    def __init__(self, host_configs: Optional[Dict[str, Dict[str, Any]]] = None, defaults: Optional[Dict[str, Any]] = None):
+        self.host_configs = host_configs if host_configs is not None else settings.HTTP_CLIENT_HOSTS
+        self.defaults = defaults if defaults is not None else settings.HTTP_CLIENT_DEFAULTS
+        self._clients: Dict[str, httpx.AsyncClient] = {}
+        self._stats: Dict[str, Counter] = {}
+
+    def _resolve_key(self, host: str) -> str:
+        if host in self.host_configs:
+            return host
+        for pattern in self.host_configs:
+            if pattern.endswith(".*") and host.startswith(pattern[:-1]):
+                return pattern
+        return "default"
+
+    def _build_client(self, key: str) -> httpx.AsyncClient:
+        config = {**self.defaults, **self.host_configs.get(key, {})}
+        stats = self._stats.setdefault(key, Counter())
+
+        async def trace(event_name: str, info: Dict[str, Any]) -> None:
+            # httpcore trace olayları: yeni TCP bağlantısı ve TLS el sıkışmasını say
+            if event_name == "connection.connect_tcp.complete":
+                stats["new_connections"] += 1
+            elif event_name == "connection.start_tls.complete":
+                stats["tls_handshakes"] += 1
+
+        async def on_request(request: httpx.Request) -> None:
+            # Tüm httpx istekleri host bazındaki adaptif hız sınırlayıcıdan geçer
+            await rate_limiter.acquire(request.url.host)
+            stats["requests"] += 1
+            request.extensions["trace"] = trace
+
+        async def on_response(response: httpx.Response) -> None:
+            stats[response.http_version] += 1
+            rate_limiter.record(
+                response.request.url.host,
+                response.status_code,
+                retry_after=parse_retry_after(response.headers.get("retry-after")),
+            )
+
+        cookies = None
+        if config.get("cookies"):
+            cookies = httpx.Cookies()
+            for name, value in config["cookies"].items():
+                cookies.set(name, value, domain=config.get("cookie_domain", ""))
+        elif not config.get("persist_cookies", True):
+            # Cookie'ler her istekte header ile gönderiliyorsa, yanıtlardaki Set-Cookie'leri biriktirme
+            cookies = CookieJar(policy=DefaultCookiePolicy(allowed_domains=[]))
+
+        http2 = config.get("http2", False)
+        if http2 and not HTTP2_AVAILABLE:
+            logger.warning("HTTP/2 için 'h2' paketi kurulu değil, HTTP/1.1 kullanılacak.")
+            http2 = False
+
+        return httpx.AsyncClient(
+            http2=http2,
+            verify=config.get("verify", True),
+            cookies=cookies,
+            timeout=httpx.Timeout(config["timeout"], connect=config["connect_timeout"]),
+            limits=httpx.Limits(
+                max_connections=config["max_connections"],
+                max_keepalive_connections=config["max_keepalive_connections"],
+                keepalive_expiry=config["keepalive_expiry"],
+            ),
+            event_hooks={"request": [on_request], "response": [on_response]},
+        )
+
+    def get(self, url_or_host: str) -> httpx.AsyncClient:
+        """URL'nin (veya host'un) ait olduğu paylaşılan client'ı döndürür, yoksa oluşturur."""
+        host = urlparse(url_or_host).hostname if "://" in url_or_host else url_or_host
+        key = self._resolve_key(host or "")
+        client = self._clients.get(key)
+        if client is None or client.is_closed:
+            client = self._build_client(key)
+            self._clients[key] = client
+        return client
+
+    async def start(self) -> None:
+        """Ayarlarda tanımlı tüm host'lar için client'ları önceden oluşturur."""
+        for key in self.host_configs:
+            if key not in self._clients:
+                self._clients[key] = self._build_client(key)
+
+    async def aclose(self) -> None:
+        for client in self._clients.values():
+            await client.aclose()
+        self._clients.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        result = {}
+        for key, stats in self._stats.items():
+            requests = stats["requests"]
+            new_connections = stats["new_connections"]
+            result[key] = {
+                **stats,
+                "reused_connections": max(requests - new_connections, 0),
+                "reuse_ratio": round(1 - new_connections / requests, 3) if requests else None,
+            }
+        return result
+
+
+http_clients = HttpClientRegistry()
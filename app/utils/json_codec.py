@@ -0,0 +1,58 @@
+import json
+from typing import Any, Union
+
+from fastapi.responses import JSONResponse
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:  # orjson yoksa standart json modülü kullanılır
+    orjson = None
+    ORJSON_AVAILABLE = False
+
+# orjson: str olmayan sözlük anahtarlarına (ör. int) izin ver
+_ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS if ORJSON_AVAILABLE else 0
+
+
+def loads(data: Union[str, bytes, bytearray, memoryview]) -> Any:
+    """JSON çözer (orjson varsa onunla). Hata durumunda json.JSONDecodeError (ValueError) yükselir."""
+    if ORJSON_AVAILABLE:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def dumps_bytes(obj: Any) -> bytes:
+    """
+    Nesneyi kompakt UTF-8 JSON byte'larına çevirir (ensure_ascii=False ile aynı çıktı).
+    Bilinmeyen tipler str() ile yazılır. orjson'un desteklemediği değerlerde
+    (ör. 64 bitten büyük tamsayılar) standart json'a geri dönülür.
+    """
+    if ORJSON_AVAILABLE:
+        try:
+            return orjson.dumps(obj, default=str, option=_ORJSON_OPTIONS)
+        except TypeError:
+            pass
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":"), default=str).encode("utf-8")
+
+
+def dumps(obj: Any) -> str:
+    """`dumps_bytes` ile aynı, str döndürür (CSV hücreleri, NDJSON/SSE satırları için)."""
+    if ORJSON_AVAILABLE:
+        try:
+            return orjson.dumps(obj, default=str, option=_ORJSON_OPTIONS).decode("utf-8")
+        except TypeError:
+            pass
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":"), default=str)
+
+
+class FastJSONResponse(JSONResponse):
+    """
+    İçeriği `dumps_bytes` (orjson varsa orjson) ile serileştiren yanıt sınıfı.
+
+    Uygulamanın varsayılan yanıt sınıfıdır. Endpoint'ler büyük sonuçları bu sınıfla
+    doğrudan döndürürse FastAPI'nin saf Python `jsonable_encoder` geçişi de atlanır.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return dumps_bytes(content)
+
@@ -0,0 +1,109 @@
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, Tuple
+
+from app.core.config import settings
+
+
+async def fetch_pages_concurrently(
+    fetch_page: Callable[[int], Awaitable[Any]],
+    page_indices: Iterable[int],
+    extract_items: Callable[[Any], List[Any]],
+    concurrency: int = settings.REVIEW_PAGE_CONCURRENCY,
+    on_page: Optional[Callable[[int, List[Any]], Awaitable[None]]] = None,
+) -> List[Any]:
+    """
+    Sayfa indeksleri önceden bilinen bir listeyi sınırlı eşzamanlılıkla çeker.
+
+    - Aynı anda en fazla `concurrency` sayfa istenir; hız sınırlaması fetcher'ların
+      kendi içindeki paylaşılan rate limiter ile yapılır.
+    - `fetch_page` None dönerse sayfa başarısız sayılır ve atlanır.
+    - Bir sayfa boş gelirse, ondan sonraki sayfalar artık istenmez ve sonuçları atılır.
+    - Sayfalar sırası gelince `on_page(index, items)` ile sink'e aktarılır: bir sayfa,
+      listede kendinden önceki tüm sayfalar sonuçlanana kadar bekletilir. Böylece
+      sonradan boş çıkan önceki bir sayfanın keseceği sayfalar sink'e hiç ulaşmaz.
+
+    Dönüş değeri, sink'e verilen sayfaların sayfa sırasıyla birleştirilmiş öğeleridir.
+    """
+    indices = list(page_indices)
+    if not indices:
+        return []
+
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+    # Sonuçlanmış ama sırası henüz gelmemiş sayfalar (başarısız sayfalar için None)
+    pending: Dict[int, Optional[List[Any]]] = {}
+    order = sorted(indices)
+    next_position = 0
+    collected: List[Any] = []
+    stop_at = float("inf")
+
+    async def run(index: int):
+        nonlocal stop_at
+        async with semaphore:
+            # Daha önceki bir sayfa boş geldiyse bu sayfayı hiç isteme
+            if index > stop_at:
+                return index, None
+            data = await fetch_page(index)
+            if data is None:
+                return index, None
+            items = extract_items(data) or []
+            # Sınır, semaphore bırakılmadan güncellenir ki sıradaki sayfalar istenmesin
+            if not items:
+                stop_at = min(stop_at, index)
+            return index, items
+
+    tasks = [asyncio.create_task(run(index)) for index in indices]
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            index, items = await next_done
+            pending[index] = items
+            # Önündeki tüm sayfalar sonuçlanmış sayfaları sırayla sink'e ver
+            while next_position < len(order) and order[next_position] in pending:
+                index = order[next_position]
+                items = pending.pop(index)
+                next_position += 1
+                if index >= stop_at:
+                    return collected
+                if items:
+                    collected.extend(items)
+                    if on_page:
+                        await on_page(index, items)
+    finally:
+        for task in tasks:
+            if not task.done():
+                task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    return collected
+
+
+async def fetch_pages_until(
+    fetch_page: Callable[[int], Awaitable[Any]],
+    page_indices: Iterable[int],
+    extract_items: Callable[[Any], List[Any]],
+    split_new: Callable[[List[Any]], Tuple[List[Any], bool]],
+    on_page: Optional[Callable[[int, List[Any]], Awaitable[None]]] = None,
+) -> Tuple[List[Any], bool]:
+    """
+    En yeniden eskiye sıralı bir listeyi sayfa sayfa (sırayla) çeker ve
+    `split_new(items)` su seviyesinin aşıldığını bildirdiği ilk sayfada durur.
+
+    Dönüş değeri (yeni öğeler, tamamlandı_mı) ikilisidir. Bir sayfa alınamazsa
+    (`fetch_page` None dönerse) tarama yarıda kalır ve ikinci değer False olur;
+    bu durumda su seviyesi ilerletilmemelidir.
+    """
+    collected: List[Any] = []
+    for index in page_indices:
+        data = await fetch_page(index)
+        if data is None:
+            return collected, False
+        items = extract_items(data) or []
+        if not items:
+            return collected, True
+        new_items, crossed = split_new(items)
+        if new_items:
+            collected.extend(new_items)
+            if on_page:
+                await on_page(index, new_items)
+        if crossed:
+            return collected, True
+    return collected, True
@@ -0,0 +1,211 @@
+import asyncio
+import logging
+import os
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from app.core.config import settings
+from app.utils.review_store import feature_items, normalize_review_date
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    PYARROW_AVAILABLE = True
+except ImportError:  # Parquet dışa aktarımı için pyarrow gerekir
+    pa = None
+    pq = None
+    PYARROW_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+# Dosyaya dışa aktarım biçimleri
+EXPORT_FORMATS = ("csv", "parquet")
+
+
+def _to_float(value: Any) -> Optional[float]:
+    try:
+        return float(value) if value is not None and value != "" else None
+    except (TypeError, ValueError):
+        return None
+
+
+def _to_int(value: Any) -> Optional[int]:
+    number = _to_float(value)
+    return int(number) if number is not None else None
+
+
+def _to_str(value: Any) -> Optional[str]:
+    return str(value) if value is not None and value != "" else None
+
+
+def _to_timestamp(value: Any) -> Optional[datetime]:
+    """Epoch, ISO ve "14 Temmuz 2023" biçimlerindeki tarihleri UTC zaman damgasına çevirir."""
+    text = normalize_review_date(value)
+    if not text:
+        return None
+    try:
+        parsed = datetime.fromisoformat(text.replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    if parsed.tzinfo is None:
+        return parsed.replace(tzinfo=timezone.utc)
+    return parsed.astimezone(timezone.utc)
+
+
+def _to_map(value: Any) -> List[Tuple[str, Optional[str]]]:
+    return feature_items(value)
+
+
+def _to_str_list(value: Any) -> List[str]:
+    return [str(item) for item in value or [] if item is not None]
+
+
+# Sütun tipleri: (pyarrow tipi fabrikası, Python dönüştürücü)
+_COLUMN_TYPES: Dict[str, Tuple[Callable[[], Any], Callable[[Any], Any]]] = {
+    "string": (lambda: pa.string(), _to_str),
+    "float": (lambda: pa.float64(), _to_float),
+    "int": (lambda: pa.int32(), _to_int),
+    "timestamp": (lambda: pa.timestamp("s", tz="UTC"), _to_timestamp),
+    "map": (lambda: pa.map_(pa.string(), pa.string()), _to_map),
+    "list": (lambda: pa.list_(pa.string()), _to_str_list),
+}
+
+# Pazaryeri bazında dışa aktarım şemaları: (sütun, tip, sözlük kodlaması)
+# Ürün düzeyindeki sütunlar her yorum satırında tekrarlandığı için sözlükle kodlanır.
+EXPORT_SCHEMAS: Dict[str, List[Tuple[str, str, bool]]] = {
+    "trendyol": [
+        ("product_name", "string", True),
+        ("product_url", "string", True),
+        ("content_id", "string", True),
+        ("merchant_id", "string", True),
+        ("boutique_id", "string", True),
+        ("user_full_name", "string", False),
+        ("review_date", "timestamp", False),
+        ("rate", "int", False),
+        ("comment", "string", False),
+        ("like_count", "int", False),
+        ("product_features", "map", False),
+    ],
+    "hepsiburada": [
+        ("product_name", "string", True),
+        ("sku", "string", True),
+        ("price", "float", False),
+        ("product_url", "string", True),
+        ("review_content", "string", False),
+        ("review_star", "int", False),
+        ("review_created_at", "timestamp", False),
+        ("customer_name", "string", False),
+        ("customer_surname", "string", False),
+        ("customer_display_name", "string", False),
+        ("media_urls", "list", False),
+        ("product_features", "map", False),
+    ],
+}
+
+
+class ParquetWriterStage:
+    """
+    Tarama ilerledikçe satırları tipli sütunlar halinde Parquet dosyasına yazan aşama.
+
+    CsvWriterStage ile aynı arayüzü sunar (`put(index, rows, key)`, async context
+    manager). Satırlar `row_group_size` adet birikince tek bir row group olarak
+    thread'de yazılır; bellekte en fazla bir row group tutulur. Özellikler
+    map<string, string>, medya URL'leri list<string> sütunu olarak saklanır.
+    Bir ürün birden fazla `put` ile (ör. Trendyol'da yorum sayfası başına) yazılabilir;
+    ürün sayısı `key` ile ayırt edilir, `key` verilmeyen her `put` ayrı ürün sayılır.
+    """
+
+    def __init__(
+        self,
+        file_path: str,
+        marketplace: str,
+        row_group_size: int = settings.PARQUET_ROW_GROUP_SIZE,
+        compression: str = settings.PARQUET_COMPRESSION,
+        compression_level: Optional[int] = settings.PARQUET_COMPRESSION_LEVEL,
+    ):
+        if not PYARROW_AVAILABLE:
+            raise RuntimeError("Parquet dışa aktarımı için pyarrow kurulu olmalıdır (pip install pyarrow)")
+        self.file_path = file_path
+        self.columns = EXPORT_SCHEMAS[marketplace]
+        self.row_group_size = max(1, row_group_size)
+        self.compression = compression
+        self.compression_level = compression_level
+        self.schema = pa.schema([(name, _COLUMN_TYPES[kind][0]()) for name, kind, _ in self.columns])
+        self._converters = [(name, _COLUMN_TYPES[kind][1]) for name, kind, _ in self.columns]
+        self._writer = None
+        self._rows: List[Dict[str, Any]] = []
+        self._lock = asyncio.Lock()
+
+        # İstatistikler
+        self._product_keys: set = set()
+        self._unkeyed_products = 0
+        self.rows_written = 0
+        self.row_groups = 0
+
+    async def __aenter__(self) -> "ParquetWriterStage":
+        await self.start()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        await self.close()
+
+    async def start(self) -> None:
+        os.makedirs(os.path.dirname(self.file_path), exist_ok=True)
+        dictionary_columns = [name for name, _, dictionary in self.columns if dictionary]
+        self._writer = pq.ParquetWriter(
+            self.file_path,
+            self.schema,
+            compression=self.compression,
+            compression_level=self.compression_level,
+            use_dictionary=dictionary_columns,
+        )
+
+    async def put(self, index: int, rows: List[Dict[str, Any]], key: Any = None) -> None:
+        """Bir ürünün satırlarını ekler; row group dolunca diske yazar (yazma bitene kadar bekler)."""
+        if self._writer is None:
+            raise RuntimeError("Parquet yazıcısı çalışmıyor")
+        if rows:
+            if key is not None:
+                self._product_keys.add(key)
+            else:
+                self._unkeyed_products += 1
+            self._rows.extend(rows)
+        if len(self._rows) >= self.row_group_size:
+            await self._flush()
+
+    @property
+    def products_written(self) -> int:
+        return len(self._product_keys) + self._unkeyed_products
+
+    async def _flush(self) -> None:
+        async with self._lock:
+            rows, self._rows = self._rows, []
+            if rows:
+                await asyncio.to_thread(self._write_rows, rows)
+
+    def _write_rows(self, rows: List[Dict[str, Any]]) -> None:
+        columns = {name: [convert(row.get(name)) for row in rows] for name, convert in self._converters}
+        table = pa.Table.from_pydict(columns, schema=self.schema)
+        self._writer.write_table(table, row_group_size=len(rows))
+        self.rows_written += len(rows)
+        self.row_groups += 1
+
+    async def close(self) -> None:
+        """Kalan satırları yazar ve dosya footer'ını kapatır."""
+        if self._writer is None:
+            return
+        try:
+            await self._flush()
+        finally:
+            writer, self._writer = self._writer, None
+            await asyncio.to_thread(writer.close)
+            logger.info(f"Parquet yazıcısı kapatıldı: {self.file_path} {self.stats()}")
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "compression": self.compression,
+            "products_written": self.products_written,
+            "rows_written": self.rows_written,
+            "row_groups": self.row_groups,
+            "pending_rows": len(self._rows),
+        }
@@ -0,0 +1,190 @@
+import asyncio
+import logging
+from typing import Any, Awaitable, Callable, Dict, Hashable, List, Optional, Set
+
+logger = logging.getLogger(__name__)
+
+# İşçilere "iş bitti" sinyali vermek için kullanılan nesne
+_DONE = object()
+
+
+class UniqueWorkQueue:
+    """
+    Aynı anahtarın yalnızca bir kez kabul edildiği iş kuyruğu.
+
+    Arama sayfaları (producer) buldukları ürünleri `put(key, item)` ile ekler;
+    daha önce görülen anahtarlar sessizce reddedilir. Böylece her ürün,
+    kaç arama sayfasında görünürse görünsün tam olarak bir kez işlenir.
+    """
+
+    def __init__(self, maxsize: int = 0):
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize)
+        self._seen: Set[Hashable] = set()
+        self.enqueued = 0
+        self.duplicates = 0
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._seen
+
+    async def put(self, key: Hashable, item: Any) -> bool:
+        """Anahtar ilk kez görülüyorsa öğeyi kuyruğa ekler ve True döner."""
+        if key in self._seen:
+            self.duplicates += 1
+            return False
+        self._seen.add(key)
+        self.enqueued += 1
+        await self._queue.put(item)
+        return True
+
+    async def get(self) -> Any:
+        return await self._queue.get()
+
+    def task_done(self) -> None:
+        self._queue.task_done()
+
+    async def close(self, workers: int) -> None:
+        """Her işçi için bir bitiş sinyali ekler."""
+        for _ in range(workers):
+            await self._queue.put(_DONE)
+
+    def stats(self) -> Dict[str, int]:
+        return {"enqueued": self.enqueued, "duplicates": self.duplicates, "pending": self._queue.qsize()}
+
+
+class Stage:
+    """
+    Çok aşamalı hattın bir aşaması.
+
+    `handler(item)` bir sonraki aşamaya aktarılacak öğeyi döndürür; None dönerse
+    öğe hattan düşer. Son aşamanın dönüş değeri kullanılmaz. Aşamanın giriş
+    kuyruğu `queue_maxsize` ile sınırlıdır; kuyruk dolunca bir önceki aşama
+    (veya producer) bekler, böylece bellek kullanımı öngörülebilir kalır.
+
+    `on_error(item, error)` verilirse handler hata verdiğinde öğe sessizce
+    düşürülmez: dönüş değeri (ör. "başarısız" işaretli bir öğe) sonucun yerine
+    sonraki aşamaya aktarılır. Sıralı yazıcı gibi her öğeyi bekleyen son
+    aşamalara böylece başarısız öğeler de ulaşır. Async olabilir.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        handler: Callable[[Any], Awaitable[Any]],
+        workers: int = 1,
+        queue_maxsize: int = 0,
+        on_error: Optional[Callable[[Any, Exception], Any]] = None,
+    ):
+        self.name = name
+        self.handler = handler
+        self.on_error = on_error
+        self.workers = max(1, workers)
+        self.queue_maxsize = queue_maxsize
+        self.processed = 0
+        self.failed = 0
+        self.dropped = 0
+        self.active = 0
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "workers": self.workers,
+            "active": self.active,
+            "processed": self.processed,
+            "failed": self.failed,
+            "dropped": self.dropped,
+        }
+
+
+async def run_staged_pipeline(
+    producer: Callable[[UniqueWorkQueue], Awaitable[None]],
+    stages: List[Stage],
+    queue: Optional[UniqueWorkQueue] = None,
+) -> UniqueWorkQueue:
+    """
+    Producer'ı ve ardışık aşamaları, her aşama kendi işçi sayısıyla çalışacak şekilde yürütür.
+
+    - `producer(queue)` yeni işleri ilk aşamanın (tekilleştiren) kuyruğuna ekler.
+    - Her aşamanın işçileri kendi sınırlı kuyruğundan okur, sonucu bir sonraki
+      aşamanın kuyruğuna yazar (backpressure).
+    - Tek bir işte oluşan hata loglanır, hattın geri kalanı devam eder; aşamanın
+      `on_error`'u varsa öğenin yerine onun döndürdüğü değer sonraki aşamaya geçer.
+    - Producer hata verirse veya çağıran görev iptal edilirse tüm işçiler iptal edilir.
+
+    İlk aşamanın kuyruğu (istatistikleri için) döndürülür.
+    """
+    if not stages:
+        raise ValueError("En az bir aşama gerekli")
+    queue = queue or UniqueWorkQueue(stages[0].queue_maxsize)
+    # Sonraki aşamaların kuyrukları tekilleştirme yapmaz, sadece sınırlıdır
+    queues: List[Any] = [queue] + [asyncio.Queue(stage.queue_maxsize) for stage in stages[1:]]
+
+    async def worker(index: int) -> None:
+        stage = stages[index]
+        in_queue = queues[index]
+        out_queue = queues[index + 1] if index + 1 < len(stages) else None
+        while True:
+            item = await in_queue.get()
+            try:
+                if item is _DONE:
+                    return
+                stage.active += 1
+                try:
+                    result = await stage.handler(item)
+                    stage.processed += 1
+                except Exception as e:
+                    if stage.on_error is None:
+                        raise
+                    stage.failed += 1
+                    logger.error(f"Pipeline '{stage.name}' aşaması bir işi tamamlayamadı, başarısız olarak iletiliyor: {e}", exc_info=True)
+                    result = stage.on_error(item, e)
+                    if asyncio.iscoroutine(result):
+                        result = await result
+                finally:
+                    stage.active -= 1
+                if out_queue is not None:
+                    if result is None:
+                        stage.dropped += 1
+                    else:
+                        await out_queue.put(result)
+            except Exception as e:
+                stage.failed += 1
+                logger.error(f"Pipeline '{stage.name}' aşaması bir işi tamamlayamadı: {e}", exc_info=True)
+            finally:
+                in_queue.task_done()
+
+    stage_tasks = [
+        [asyncio.create_task(worker(index)) for _ in range(stage.workers)]
+        for index, stage in enumerate(stages)
+    ]
+    all_tasks = [task for tasks in stage_tasks for task in tasks]
+    try:
+        await producer(queue)
+        # Aşamalar sırayla kapatılır: bir aşamanın tüm işçileri bitince sonrakine bitiş sinyali gider
+        for index, stage in enumerate(stages):
+            if index == 0:
+                await queue.close(stage.workers)
+            else:
+                for _ in range(stage.workers):
+                    await queues[index].put(_DONE)
+            await asyncio.gather(*stage_tasks[index])
+    finally:
+        for task in all_tasks:
+            if not task.done():
+                task.cancel()
+        await asyncio.gather(*all_tasks, return_exceptions=True)
+    return queue
+
+
+async def run_pipeline(
+    producer: Callable[[UniqueWorkQueue], Awaitable[None]],
+    consumer: Callable[[Any], Awaitable[None]],
+    workers: int,
+    queue_maxsize: int = 0,
+    queue: Optional[UniqueWorkQueue] = None,
+) -> UniqueWorkQueue:
+    """
+    Tek aşamalı producer/consumer hattını çalıştırır.
+
+    `producer(queue)` yeni işleri kuyruğa ekler, `workers` adet işçi kuyruktan
+    iş alıp `consumer(item)` çağırır. Ayrıntılar için `run_staged_pipeline`.
+    """
+    return await run_staged_pipeline(producer, [Stage("default", consumer, workers, queue_maxsize)], queue)
@@ -0,0 +1,83 @@
+import time
+from collections import deque
+from typing import Any, Deque, Dict, Optional, Tuple
+
+
+class CrawlProgress:
+    """
+    Bir taramanın ilerleme sayaçları (arama sayfaları, ürünler, yorumlar).
+
+    Servisler sayaçları artırır; `snapshot()` son `rate_window` saniyedeki
+    örneklerden anlık hızı ve kalan ürün sayısına göre tahmini bitiş süresini (ETA) hesaplar.
+    """
+
+    def __init__(self, rate_window: float = 60.0):
+        self.rate_window = rate_window
+        self.started_at = time.time()
+        self.pages_done = 0
+        self.pages_total: Optional[int] = None
+        self.products_done = 0
+        self.products_total = 0
+        self.reviews_done = 0
+        # (monotonic zaman, tamamlanan ürün, yorum) örnekleri
+        self._samples: Deque[Tuple[float, int, int]] = deque()
+        self._sample()
+
+    def _sample(self) -> None:
+        now = time.monotonic()
+        self._samples.append((now, self.products_done, self.reviews_done))
+        while len(self._samples) > 2 and now - self._samples[0][0] > self.rate_window:
+            self._samples.popleft()
+
+    def restore(self, products_done: int) -> None:
+        """Kontrol noktasından devam eden taramada önceki çalışmada biten ürünleri sayar."""
+        self.products_done += products_done
+        self.products_total += products_done
+        # Hız, devam eden çalışmanın kendi örneklerinden hesaplansın
+        self._samples.clear()
+        self._sample()
+
+    def set_pages_total(self, total: int) -> None:
+        self.pages_total = total
+
+    def page_done(self, count: int = 1) -> None:
+        self.pages_done += count
+
+    def products_found(self, count: int = 1) -> None:
+        self.products_total += count
+
+    def product_done(self) -> None:
+        self.products_done += 1
+        self._sample()
+
+    def reviews_added(self, count: int) -> None:
+        self.reviews_done += count
+        self._sample()
+
+    def snapshot(self) -> Dict[str, Any]:
+        self._sample()
+        first_time, first_products, first_reviews = self._samples[0]
+        last_time, last_products, last_reviews = self._samples[-1]
+        elapsed = last_time - first_time
+        products_per_second = (last_products - first_products) / elapsed if elapsed > 0 else 0.0
+        reviews_per_second = (last_reviews - first_reviews) / elapsed if elapsed > 0 else 0.0
+
+        remaining = self.products_total - self.products_done
+        eta_seconds = None
+        # Arama sayfaları bitmeden toplam ürün sayısı kesin değildir, ETA alt sınırdır
+        if remaining > 0 and products_per_second > 0:
+            eta_seconds = round(remaining / products_per_second, 1)
+        elif remaining == 0 and self.pages_total is not None and self.pages_done >= self.pages_total:
+            eta_seconds = 0.0
+
+        return {
+            "pages_done": self.pages_done,
+            "pages_total": self.pages_total,
+            "products_done": self.products_done,
+            "products_total": self.products_total,
+            "reviews_done": self.reviews_done,
+            "elapsed_seconds": round(time.time() - self.started_at, 1),
+            "products_per_second": round(products_per_second, 3),
+            "reviews_per_second": round(reviews_per_second, 2),
+            "eta_seconds": eta_seconds,
+        }
@@ -0,0 +1,176 @@
+import asyncio
+import logging
+import time
+from typing import Any, Dict, Optional
+from urllib.parse import urlparse
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Bu durum kodları upstream'in bizi yavaşlatmak istediğini gösterir
+THROTTLE_STATUS_CODES = {403, 429, 503}
+# Cloudflare / bot koruma sayfalarını tanımak için kullanılan işaretler
+BLOCK_PAGE_MARKERS = ("Cloudflare", "Checking your browser", "Attention Required!")
+
+
+def is_block_page(html_content: Optional[str]) -> bool:
+    """HTML içeriğinin bir Cloudflare/bot koruma sayfası olup olmadığını kontrol eder."""
+    if not html_content:
+        return False
+    return any(marker in html_content for marker in BLOCK_PAGE_MARKERS)
+
+
+class TokenBucket:
+    """
+    Basit token bucket. `rate` saniyede eklenen token sayısıdır ve dışarıdan
+    (AIMD kontrolcüsü tarafından) anlık olarak değiştirilebilir.
+    """
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self._last = time.monotonic()
+        self._paused_until = 0.0
+        self._lock = asyncio.Lock()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self._last) * self.rate)
+        self._last = now
+
+    def pause(self, seconds: float) -> None:
+        """Bucket'ı belirtilen süre boyunca token vermeyecek şekilde dondurur."""
+        self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+        self.tokens = 0
+
+    async def acquire(self) -> float:
+        """Bir token alana kadar bekler, beklenen süreyi döndürür."""
+        started = time.monotonic()
+        # Kilit sayesinde bekleyenler sırayla (FIFO) token alır
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                if now < self._paused_until:
+                    await asyncio.sleep(self._paused_until - now)
+                    self._last = time.monotonic()
+                    continue
+                self._refill()
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return time.monotonic() - started
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+
+class AIMDController:
+    """
+    Additive-increase / multiplicative-decrease hız kontrolcüsü.
+    Başarılı yanıtlarda hızı yavaşça artırır, 403/429 veya Cloudflare
+    sayfalarında hızı çarpanla düşürür.
+    """
+
+    def __init__(self, bucket: TokenBucket, min_rate: float, max_rate: float,
+                 additive_increase: float, decrease_factor: float, decrease_cooldown: float):
+        self.bucket = bucket
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.additive_increase = additive_increase
+        self.decrease_factor = decrease_factor
+        self.decrease_cooldown = decrease_cooldown
+        self._last_decrease = 0.0
+
+    def on_success(self) -> None:
+        self.bucket.rate = min(self.max_rate, self.bucket.rate + self.additive_increase)
+
+    def on_throttle(self, retry_after: Optional[float] = None) -> bool:
+        """Hızı düşürür. Aynı engel dalgasında art arda düşürmemek için bekleme süresi uygulanır."""
+        now = time.monotonic()
+        if retry_after:
+            self.bucket.pause(retry_after)
+        if now - self._last_decrease < self.decrease_cooldown:
+            return False
+        self._last_decrease = now
+        self.bucket.rate = max(self.min_rate, self.bucket.rate * self.decrease_factor)
+        return True
+
+
+class RateLimiter:
+    """
+    Host bazında token bucket + AIMD hız sınırlayıcı.
+
+    Tüm fetcher'lar istekten önce `acquire()`, yanıttan sonra `record()` çağırır.
+    Böylece sabit `asyncio.sleep` beklemeleri yerine her upstream'in tolere
+    ettiği en yüksek hızda çalışılır.
+    """
+
+    def __init__(self, host_configs: Optional[Dict[str, Dict[str, Any]]] = None, defaults: Optional[Dict[str, Any]] = None):
+        self.host_configs = host_configs if host_configs is not None else settings.RATE_LIMIT_HOSTS
+        self.defaults = defaults if defaults is not None else settings.RATE_LIMIT_DEFAULTS
+        self._controllers: Dict[str, AIMDController] = {}
+        self._stats: Dict[str, Dict[str, float]] = {}
+
+    @staticmethod
+    def _host(url_or_host: str) -> str:
+        if "://" in url_or_host:
+            return urlparse(url_or_host).hostname or ""
+        return url_or_host
+
+    def _controller(self, host: str) -> AIMDController:
+        controller = self._controllers.get(host)
+        if controller is None:
+            config = {**self.defaults, **self.host_configs.get(host, {})}
+            bucket = TokenBucket(config["initial_rate"], config["burst"])
+            controller = AIMDController(
+                bucket,
+                min_rate=config["min_rate"],
+                max_rate=config["max_rate"],
+                additive_increase=config["additive_increase"],
+                decrease_factor=config["decrease_factor"],
+                decrease_cooldown=config["decrease_cooldown"],
+            )
+            self._controllers[host] = controller
+            self._stats[host] = {"requests": 0, "successes": 0, "throttled": 0, "decreases": 0, "waited_seconds": 0.0}
+        return controller
+
+    async def acquire(self, url_or_host: str) -> None:
+        """İlgili host için bir istek hakkı alınana kadar bekler."""
+        host = self._host(url_or_host)
+        controller = self._controller(host)
+        waited = await controller.bucket.acquire()
+        stats = self._stats[host]
+        stats["requests"] += 1
+        stats["waited_seconds"] += waited
+
+    def record(self, url_or_host: str, status_code: Optional[int] = None, blocked: bool = False, retry_after: Optional[float] = None) -> None:
+        """Yanıt sonucunu kontrolcüye bildirir."""
+        host = self._host(url_or_host)
+        controller = self._controller(host)
+        stats = self._stats[host]
+        if blocked or status_code in THROTTLE_STATUS_CODES:
+            stats["throttled"] += 1
+            if controller.on_throttle(retry_after):
+                stats["decreases"] += 1
+                logger.warning(f"{host} için hız düşürüldü: {controller.bucket.rate:.2f} istek/sn (durum={status_code}, engel={blocked})")
+        elif status_code is not None and status_code < 400:
+            stats["successes"] += 1
+            controller.on_success()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            host: {**self._stats[host], "current_rate": round(controller.bucket.rate, 3)}
+            for host, controller in self._controllers.items()
+        }
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Retry-After header'ını saniyeye çevirir (sadece saniye formatı desteklenir)."""
+    if not value:
+        return None
+    try:
+        return float(value)
+    except ValueError:
+        return None
+
+
+rate_limiter = RateLimiter()
@@ -0,0 +1,104 @@
+import logging
+from collections import Counter
+from typing import Any, Dict, Iterable, Optional
+from urllib.parse import urlparse
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class RequestBlocker:
+    """
+    Playwright context/sayfaları için istek engelleme katmanı.
+
+    Sadece HTML'e (JSON-LD / reduxStore script'ine) ihtiyaç duyduğumuz sayfalarda
+    görsel, font, medya gibi kaynakları ve reklam/analitik alan adlarına giden
+    istekleri iptal eder. Engellenen istek sayısı ve tahmini tasarruf edilen
+    byte miktarı sayaçlarda tutulur.
+    """
+
+    def __init__(
+        self,
+        resource_types: Optional[Iterable[str]] = None,
+        blocked_domains: Optional[Iterable[str]] = None,
+        estimated_bytes: Optional[Dict[str, int]] = None,
+    ):
+        self.resource_types = set(resource_types if resource_types is not None else settings.BLOCKED_RESOURCE_TYPES)
+        self.blocked_domains = tuple(blocked_domains if blocked_domains is not None else settings.BLOCKED_DOMAINS)
+        self.estimated_bytes = estimated_bytes if estimated_bytes is not None else settings.BLOCKED_RESOURCE_ESTIMATED_BYTES
+
+        self.allowed_requests = 0
+        self.blocked_by_type: Counter = Counter()
+        self.blocked_by_domain: Counter = Counter()
+        self.estimated_bytes_saved = 0
+
+    def _is_blocked_host(self, host: str) -> Optional[str]:
+        for domain in self.blocked_domains:
+            if host == domain or host.endswith("." + domain):
+                return domain
+        return None
+
+    async def _handle_route(self, route) -> None:
+        request = route.request
+        resource_type = request.resource_type
+        host = urlparse(request.url).hostname or ""
+
+        blocked_domain = self._is_blocked_host(host)
+        if resource_type in self.resource_types or blocked_domain:
+            if blocked_domain:
+                self.blocked_by_domain[blocked_domain] += 1
+            self.blocked_by_type[resource_type] += 1
+            self.estimated_bytes_saved += self.estimated_bytes.get(resource_type, self.estimated_bytes.get("other", 0))
+            try:
+                await route.abort()
+            except Exception:
+                # Sayfa kapanırken gelen route'lar hata verebilir, önemsiz
+                pass
+            return
+
+        self.allowed_requests += 1
+        try:
+            await route.continue_()
+        except Exception:
+            pass
+
+    async def install(self, target) -> None:
+        """Verilen BrowserContext veya Page üzerine engelleme kuralını kurar."""
+        await target.route("**/*", self._handle_route)
+
+    def stats(self) -> Dict[str, Any]:
+        blocked_total = sum(self.blocked_by_type.values())
+        return {
+            "allowed_requests": self.allowed_requests,
+            "blocked_requests": blocked_total,
+            "blocked_by_type": dict(self.blocked_by_type),
+            "blocked_by_domain": dict(self.blocked_by_domain),
+            "estimated_bytes_saved": self.estimated_bytes_saved,
+        }
+
+
+async def goto_and_wait_for_target(page, url: str, target_selector: str, strategy: str = None, timeout: int = 60000) -> bool:
+    """
+    Sayfaya gider ve seçilen stratejiye göre bekler.
+
+    - "networkidle": Eski davranış; tüm ağ trafiği durulana kadar bekler.
+    - "target": DOM yüklenince döner ve sadece hedef script'in DOM'a eklenmesini bekler.
+
+    Hedef bulunduysa (veya networkidle stratejisinde) True döner.
+    """
+    strategy = strategy or settings.PAGE_WAIT_STRATEGY
+    if strategy == "networkidle":
+        await page.goto(url, wait_until="networkidle", timeout=timeout)
+        return True
+
+    await page.goto(url, wait_until="domcontentloaded", timeout=timeout)
+    try:
+        await page.wait_for_selector(target_selector, state="attached", timeout=settings.PAGE_TARGET_WAIT_TIMEOUT)
+        return True
+    except Exception:
+        logger.warning(f"Hedef script ({target_selector}) zamanında bulunamadı: {url}")
+        return False
+
+
+request_blocker = RequestBlocker()
@@ -0,0 +1,266 @@
+import asyncio
+import fnmatch
+import functools
+import logging
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from collections import Counter
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+from urllib.parse import parse_qsl, urlencode, urlparse, urlunparse
+
+from app.core.config import settings
+from app.utils import json_codec
+
+logger = logging.getLogger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    key TEXT PRIMARY KEY,
+    endpoint TEXT NOT NULL,
+    host TEXT NOT NULL,
+    url TEXT NOT NULL,
+    payload BLOB NOT NULL,
+    size INTEGER NOT NULL,
+    created_at REAL NOT NULL,
+    expires_at REAL NOT NULL,
+    last_access REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_responses_last_access ON responses (last_access);
+CREATE INDEX IF NOT EXISTS idx_responses_host ON responses (host);
+"""
+
+
+def normalize_url(url: str, params: Optional[Dict[str, Any]] = None) -> str:
+    """
+    URL ve parametreleri önbellek anahtarı olarak kullanılabilecek tek bir forma getirir:
+    şema/host küçük harf, fragment atılır, sorgu parametreleri (URL'dekiler + `params`) sıralanır.
+    """
+    parsed = urlparse(url)
+    query = parse_qsl(parsed.query, keep_blank_values=True)
+    if params:
+        query.extend((str(k), str(v)) for k, v in params.items() if v is not None)
+    query.sort()
+    return urlunparse((parsed.scheme.lower(), parsed.netloc.lower(), parsed.path, "", urlencode(query), ""))
+
+
+def _is_cacheable(result: Any) -> bool:
+    # Boş sonuçlar ve hata içeren yanıtlar (ör. arama fallback'inin {"error": ...} dönüşü) saklanmaz
+    if not result:
+        return False
+    if isinstance(result, dict) and result.get("error"):
+        return False
+    return True
+
+
+class ResponseCache:
+    """
+    Upstream JSON/HTML yanıtları için SQLite tabanlı kalıcı önbellek.
+
+    - Anahtar: endpoint + normalize edilmiş URL/parametreler.
+    - Değer: fetcher'ın döndürdüğü çözümlenmiş veri, JSON olarak zlib ile sıkıştırılmış.
+    - TTL endpoint bazında RESPONSE_CACHE_TTLS'den okunur.
+    - Toplam boyut RESPONSE_CACHE_MAX_BYTES'ı aşınca en uzun süredir okunmayan kayıtlar silinir (LRU).
+    - Offline modda süresi dolmuş kayıtlar da döndürülür ve upstream'e hiç gidilmez.
+
+    SQLite çağrıları event loop'u bloklamamak için thread'de çalıştırılır.
+    """
+
+    def __init__(
+        self,
+        path: str = settings.RESPONSE_CACHE_PATH,
+        ttls: Optional[Dict[str, float]] = None,
+        max_bytes: int = settings.RESPONSE_CACHE_MAX_BYTES,
+        enabled: bool = settings.RESPONSE_CACHE_ENABLED,
+        offline: bool = settings.RESPONSE_CACHE_OFFLINE,
+    ):
+        self.path = path
+        self.ttls = ttls if ttls is not None else settings.RESPONSE_CACHE_TTLS
+        self.max_bytes = max_bytes
+        self.enabled = enabled
+        self.offline = offline
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+        self._stats: Dict[str, Counter] = {}
+        self.evictions = 0
+
+    # --- SQLite (thread içinde çalışan senkron yardımcılar) ---
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            conn = sqlite3.connect(self.path, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.executescript(_SCHEMA)
+            self._conn = conn
+        return self._conn
+
+    def _get_sync(self, key: str, ignore_expiry: bool) -> Optional[bytes]:
+        with self._lock:
+            conn = self._connect()
+            row = conn.execute("SELECT payload, expires_at FROM responses WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return None
+            payload, expires_at = row
+            now = time.time()
+            if not ignore_expiry and expires_at < now:
+                return None
+            conn.execute("UPDATE responses SET last_access = ? WHERE key = ?", (now, key))
+            conn.commit()
+            return payload
+
+    def _set_sync(self, key: str, endpoint: str, url: str, payload: bytes, ttl: float) -> None:
+        now = time.time()
+        host = urlparse(url).hostname or ""
+        with self._lock:
+            conn = self._connect()
+            conn.execute(
+                "INSERT OR REPLACE INTO responses (key, endpoint, host, url, payload, size, created_at, expires_at, last_access) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (key, endpoint, host, url, payload, len(payload), now, now + ttl, now),
+            )
+            self._evict_locked(conn)
+            conn.commit()
+
+    def _evict_locked(self, conn: sqlite3.Connection) -> None:
+        total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        # Boyut sınırının %90'ına inene kadar en eski erişilen kayıtları sil
+        target = self.max_bytes * 0.9
+        for key, size in conn.execute("SELECT key, size FROM responses ORDER BY last_access ASC").fetchall():
+            if total <= target:
+                break
+            conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+            total -= size
+            self.evictions += 1
+
+    def _purge_sync(self, host: Optional[str], pattern: Optional[str]) -> int:
+        with self._lock:
+            conn = self._connect()
+            if host:
+                rows = conn.execute("SELECT key, url FROM responses WHERE host = ?", (host,)).fetchall()
+            else:
+                rows = conn.execute("SELECT key, url FROM responses").fetchall()
+            keys = [key for key, url in rows if not pattern or fnmatch.fnmatch(url, pattern)]
+            conn.executemany("DELETE FROM responses WHERE key = ?", [(key,) for key in keys])
+            conn.commit()
+            return len(keys)
+
+    def _summary_sync(self) -> Tuple[int, int]:
+        with self._lock:
+            conn = self._connect()
+            return conn.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses").fetchone()
+
+    # --- Async API ---
+
+    @staticmethod
+    def make_key(endpoint: str, url: str, params: Optional[Dict[str, Any]] = None) -> str:
+        return f"{endpoint}:{normalize_url(url, params)}"
+
+    async def get(self, endpoint: str, url: str, params: Optional[Dict[str, Any]] = None) -> Optional[Any]:
+        """Önbellekteki geçerli veriyi döndürür; yoksa None."""
+        stats = self._stats.setdefault(endpoint, Counter())
+        payload = await asyncio.to_thread(self._get_sync, self.make_key(endpoint, url, params), self.offline)
+        if payload is None:
+            stats["misses"] += 1
+            return None
+        stats["hits"] += 1
+        return json_codec.loads(zlib.decompress(payload))
+
+    async def set(self, endpoint: str, url: str, value: Any, params: Optional[Dict[str, Any]] = None) -> None:
+        ttl = self.ttls.get(endpoint, self.ttls.get("default", 600))
+        payload = zlib.compress(json_codec.dumps_bytes(value))
+        await asyncio.to_thread(self._set_sync, self.make_key(endpoint, url, params), endpoint, normalize_url(url, params), payload, ttl)
+        self._stats.setdefault(endpoint, Counter())["writes"] += 1
+
+    async def get_or_fetch(
+        self,
+        endpoint: str,
+        url: str,
+        fetch: Callable[[], Awaitable[Any]],
+        params: Optional[Dict[str, Any]] = None,
+    ) -> Any:
+        """
+        Önbellekte varsa onu, yoksa `fetch()` sonucunu döndürür ve saklar.
+        Offline modda önbellekte olmayan istekler için upstream'e gidilmez, None döner.
+        """
+        if not self.enabled:
+            return await fetch()
+        try:
+            cached = await self.get(endpoint, url, params)
+        except Exception as e:
+            logger.warning(f"Önbellek okunamadı ({endpoint}): {e}")
+            cached = None
+        if cached is not None:
+            return cached
+        if self.offline:
+            self._stats[endpoint]["offline_misses"] += 1
+            return None
+
+        result = await fetch()
+        if _is_cacheable(result):
+            try:
+                await self.set(endpoint, url, result, params)
+            except Exception as e:
+                logger.warning(f"Önbelleğe yazılamadı ({endpoint}): {e}")
+        return result
+
+    def cached(
+        self,
+        endpoint: str,
+        key: Callable[..., Tuple[str, Optional[Dict[str, Any]]]],
+        bypass: Optional[Callable[..., bool]] = None,
+    ):
+        """
+        Fetcher fonksiyonlarını önbelleğe alan decorator.
+        `key(*args, **kwargs)` çağrının (url, params) ikilisini döndürür.
+        `bypass(*args, **kwargs)` True dönen çağrılar (ör. artımlı taramanın en yeniden
+        eskiye sıralı sayfaları) önbellekten okunmaz ve yazılmaz; offline modda bu
+        çağrılar için de önbellek kullanılır.
+        """
+        def decorator(func):
+            @functools.wraps(func)
+            async def wrapper(*args, **kwargs):
+                if bypass is not None and not self.offline and bypass(*args, **kwargs):
+                    self._stats.setdefault(endpoint, Counter())["bypassed"] += 1
+                    return await func(*args, **kwargs)
+                url, params = key(*args, **kwargs)
+                return await self.get_or_fetch(endpoint, url, lambda: func(*args, **kwargs), params)
+            return wrapper
+        return decorator
+
+    async def purge(self, host: Optional[str] = None, pattern: Optional[str] = None) -> int:
+        """
+        Host'a ve/veya URL desenine (fnmatch, ör. '*productId=123*') uyan kayıtları siler.
+        İkisi de verilmezse tüm önbellek temizlenir. Silinen kayıt sayısını döndürür.
+        """
+        return await asyncio.to_thread(self._purge_sync, host, pattern)
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    async def stats(self) -> Dict[str, Any]:
+        entries, size = await asyncio.to_thread(self._summary_sync)
+        endpoints = {}
+        for endpoint, stats in self._stats.items():
+            lookups = stats["hits"] + stats["misses"]
+            endpoints[endpoint] = {**stats, "hit_ratio": round(stats["hits"] / lookups, 3) if lookups else None}
+        return {
+            "enabled": self.enabled,
+            "offline": self.offline,
+            "entries": entries,
+            "bytes": size,
+            "max_bytes": self.max_bytes,
+            "evictions": self.evictions,
+            "endpoints": endpoints,
+        }
+
+
+response_cache = ResponseCache()
@@ -0,0 +1,436 @@
+import asyncio
+import hashlib
+import logging
+import os
+import re
+import sqlite3
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from app.core.config import settings
+from app.utils import json_codec
+
+logger = logging.getLogger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS products (
+    marketplace TEXT NOT NULL,
+    product_id TEXT NOT NULL,
+    name TEXT,
+    url TEXT,
+    price REAL,
+    merchant_id TEXT,
+    extra TEXT,
+    updated_at REAL NOT NULL,
+    PRIMARY KEY (marketplace, product_id)
+);
+CREATE TABLE IF NOT EXISTS product_features (
+    marketplace TEXT NOT NULL,
+    product_id TEXT NOT NULL,
+    name TEXT NOT NULL,
+    value TEXT,
+    PRIMARY KEY (marketplace, product_id, name)
+);
+CREATE TABLE IF NOT EXISTS reviews (
+    marketplace TEXT NOT NULL,
+    review_id TEXT NOT NULL,
+    product_id TEXT NOT NULL,
+    author TEXT,
+    rating REAL,
+    content TEXT,
+    review_date TEXT,
+    like_count INTEGER,
+    media_urls TEXT,
+    updated_at REAL NOT NULL,
+    PRIMARY KEY (marketplace, review_id)
+);
+CREATE INDEX IF NOT EXISTS idx_reviews_product_date ON reviews (marketplace, product_id, review_date);
+"""
+
+# Yorum metni üzerinde tam metin arama. Metin Python tarafında Türkçe kurallarıyla
+# katlanır (turkish_fold) ve tetikleyicilerle her upsert'te artımlı olarak indekslenir.
+_FTS_SCHEMA = """
+CREATE VIRTUAL TABLE IF NOT EXISTS reviews_fts USING fts5(content, tokenize = 'unicode61 remove_diacritics 2');
+CREATE TRIGGER IF NOT EXISTS reviews_fts_insert AFTER INSERT ON reviews BEGIN
+    INSERT INTO reviews_fts (rowid, content) VALUES (new.rowid, turkish_fold(new.content));
+END;
+CREATE TRIGGER IF NOT EXISTS reviews_fts_update AFTER UPDATE OF content ON reviews BEGIN
+    DELETE FROM reviews_fts WHERE rowid = old.rowid;
+    INSERT INTO reviews_fts (rowid, content) VALUES (new.rowid, turkish_fold(new.content));
+END;
+CREATE TRIGGER IF NOT EXISTS reviews_fts_delete AFTER DELETE ON reviews BEGIN
+    DELETE FROM reviews_fts WHERE rowid = old.rowid;
+END;
+"""
+
+# Türkçe büyük/küçük harf dönüşümünden sonra tüm harfler ASCII karşılığına indirilir;
+# böylece "KIRIK", "kırık" ve "kirik" aynı terime düşer.
+_TURKISH_UPPER_TO_LOWER = str.maketrans({"I": "ı", "İ": "i"})
+_TURKISH_DIACRITICS = str.maketrans({"ı": "i", "ş": "s", "ğ": "g", "ü": "u", "ö": "o", "ç": "c", "â": "a", "î": "i", "û": "u"})
+_SEARCH_TOKEN_RE = re.compile(r"\w+\*?")
+
+
+def turkish_fold(text: Optional[str]) -> str:
+    """Metni Türkçe kurallarıyla küçük harfe çevirir ve aksanlarını kaldırır."""
+    if not text:
+        return ""
+    return text.translate(_TURKISH_UPPER_TO_LOWER).lower().translate(_TURKISH_DIACRITICS)
+
+
+def build_fts_query(query: str) -> str:
+    """
+    Kullanıcı sorgusunu güvenli bir FTS5 ifadesine çevirir: her kelime tırnak içine
+    alınır (FTS sözdizimi hatası olmasın diye), sonda '*' varsa önek araması yapılır.
+    Kelimeler AND ile birleştirilir.
+    """
+    terms = []
+    for token in _SEARCH_TOKEN_RE.findall(turkish_fold(query)):
+        prefix = token.endswith("*")
+        word = token.rstrip("*")
+        if word:
+            terms.append(f'"{word}"*' if prefix else f'"{word}"')
+    return " ".join(terms)
+
+
+_TURKISH_MONTHS = {
+    "ocak": 1, "şubat": 2, "mart": 3, "nisan": 4, "mayıs": 5, "haziran": 6,
+    "temmuz": 7, "ağustos": 8, "eylül": 9, "ekim": 10, "kasım": 11, "aralık": 12,
+}
+_TURKISH_DATE_RE = re.compile(r"^(\d{1,2})\s+(\w+)\s+(\d{4})$")
+
+
+def normalize_review_date(value: Any) -> Optional[str]:
+    """
+    Yorum tarihini sıralanabilir ISO formatına çevirir.
+    Epoch (sn/ms), ISO string ve "14 Temmuz 2023" biçimleri desteklenir.
+    """
+    if value is None or value == "":
+        return None
+    if isinstance(value, (int, float)):
+        seconds = value / 1000 if value > 1e11 else value
+        return datetime.fromtimestamp(seconds, tz=timezone.utc).strftime("%Y-%m-%dT%H:%M:%S")
+    text = str(value).strip()
+    match = _TURKISH_DATE_RE.match(text)
+    if match:
+        month = _TURKISH_MONTHS.get(match.group(2).lower())
+        if month:
+            return f"{int(match.group(3)):04d}-{month:02d}-{int(match.group(1)):02d}"
+    return text
+
+
+def _fallback_review_id(product_id: str, author: Any, content: Any) -> str:
+    # Kimliği olmayan yorumlar için kararlı bir kimlik üret (upsert'in idempotent olması için)
+    digest = hashlib.blake2b(f"{product_id}|{author}|{content}".encode("utf-8"), digest_size=8)
+    return f"h:{digest.hexdigest()}"
+
+
+def _to_float(value: Any) -> Optional[float]:
+    try:
+        return float(value) if value is not None else None
+    except (TypeError, ValueError):
+        return None
+
+
+def feature_items(features: Any) -> List[Tuple[str, Optional[str]]]:
+    """Özellikleri (dict veya JSON-LD additionalProperty listesi) (isim, değer) çiftlerine çevirir."""
+    if isinstance(features, dict):
+        items: Iterable[Tuple[Any, Any]] = features.items()
+    elif isinstance(features, list):
+        items = [
+            (feature.get("name"), feature.get("value", feature.get("unitText")))
+            for feature in features if isinstance(feature, dict)
+        ]
+    else:
+        items = []
+    pairs = []
+    for name, value in items:
+        if not name:
+            continue
+        if not isinstance(value, str) and value is not None:
+            value = json_codec.dumps(value)
+        pairs.append((str(name), value))
+    return pairs
+
+
+def _feature_rows(marketplace: str, product_id: str, features: Any) -> List[Tuple]:
+    return [(marketplace, product_id, name, value) for name, value in feature_items(features)]
+
+
+class ReviewStore:
+    """
+    Her iki pazaryeri için normalize edilmiş ürün/yorum/özellik deposu (SQLite, WAL modu).
+
+    Yazmalar önce bellekte biriktirilir ve REVIEW_STORE_BATCH_SIZE satıra
+    ulaşınca tek bir transaction ile upsert edilir; aynı taramanın tekrar
+    çalıştırılması kayıt çoğaltmaz. SQLite çağrıları thread'de çalıştırılır.
+    """
+
+    def __init__(self, path: str = settings.REVIEW_STORE_PATH, batch_size: int = settings.REVIEW_STORE_BATCH_SIZE, enabled: bool = settings.REVIEW_STORE_ENABLED):
+        self.path = path
+        self.batch_size = max(1, batch_size)
+        self.enabled = enabled
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+        self._pending_products: Dict[Tuple[str, str], Tuple] = {}
+        self._pending_features: Dict[Tuple[str, str], List[Tuple]] = {}
+        self._pending_reviews: List[Tuple] = []
+        self._flush_lock = asyncio.Lock()
+
+        # İstatistikler
+        self.products_written = 0
+        self.reviews_written = 0
+        self.flushes = 0
+
+    # --- SQLite (thread içinde çalışan senkron yardımcılar) ---
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            conn = sqlite3.connect(self.path, check_same_thread=False)
+            conn.row_factory = sqlite3.Row
+            conn.create_function("turkish_fold", 1, turkish_fold, deterministic=True)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.executescript(_SCHEMA)
+            fts_exists = conn.execute("SELECT 1 FROM sqlite_master WHERE name = 'reviews_fts'").fetchone()
+            conn.executescript(_FTS_SCHEMA)
+            if not fts_exists:
+                # Arama indeksinden önce yazılmış yorumları bir kez indeksle
+                with conn:
+                    conn.execute("INSERT INTO reviews_fts (rowid, content) SELECT rowid, turkish_fold(content) FROM reviews")
+            self._conn = conn
+        return self._conn
+
+    def _write_sync(self, products: List[Tuple], features: Dict[Tuple[str, str], List[Tuple]], reviews: List[Tuple]) -> None:
+        with self._lock:
+            conn = self._connect()
+            with conn:
+                conn.executemany(
+                    "INSERT INTO products (marketplace, product_id, name, url, price, merchant_id, extra, updated_at) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?) "
+                    "ON CONFLICT (marketplace, product_id) DO UPDATE SET "
+                    "name = excluded.name, url = excluded.url, price = excluded.price, "
+                    "merchant_id = excluded.merchant_id, extra = excluded.extra, updated_at = excluded.updated_at",
+                    products,
+                )
+                # Bir ürünün özellik seti her taramada bütün olarak yenilenir
+                for (marketplace, product_id), rows in features.items():
+                    conn.execute("DELETE FROM product_features WHERE marketplace = ? AND product_id = ?", (marketplace, product_id))
+                    conn.executemany("INSERT OR REPLACE INTO product_features (marketplace, product_id, name, value) VALUES (?, ?, ?, ?)", rows)
+                conn.executemany(
+                    "INSERT INTO reviews (marketplace, review_id, product_id, author, rating, content, review_date, like_count, media_urls, updated_at) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?) "
+                    "ON CONFLICT (marketplace, review_id) DO UPDATE SET "
+                    "product_id = excluded.product_id, author = excluded.author, rating = excluded.rating, "
+                    "content = excluded.content, review_date = excluded.review_date, like_count = excluded.like_count, "
+                    "media_urls = excluded.media_urls, updated_at = excluded.updated_at",
+                    reviews,
+                )
+
+    def _query_sync(self, sql: str, params: Tuple) -> List[Dict[str, Any]]:
+        with self._lock:
+            conn = self._connect()
+            return [dict(row) for row in conn.execute(sql, params).fetchall()]
+
+    # --- Yazma API'si ---
+
+    def _pending_count(self) -> int:
+        return len(self._pending_products) + len(self._pending_reviews) + sum(len(rows) for rows in self._pending_features.values())
+
+    async def _maybe_flush(self) -> None:
+        if self._pending_count() >= self.batch_size:
+            await self.flush()
+
+    async def add_product(
+        self,
+        marketplace: str,
+        product_id: str,
+        name: Optional[str] = None,
+        url: Optional[str] = None,
+        price: Any = None,
+        merchant_id: Any = None,
+        features: Any = None,
+        extra: Optional[Dict[str, Any]] = None,
+    ) -> None:
+        if not self.enabled or not product_id:
+            return
+        product_id = str(product_id)
+        self._pending_products[(marketplace, product_id)] = (
+            marketplace, product_id, name, url, _to_float(price),
+            str(merchant_id) if merchant_id is not None else None,
+            json_codec.dumps(extra) if extra else None,
+            time.time(),
+        )
+        if features is not None:
+            self._pending_features[(marketplace, product_id)] = _feature_rows(marketplace, product_id, features)
+        await self._maybe_flush()
+
+    async def add_reviews(self, marketplace: str, product_id: str, reviews: List[Dict[str, Any]]) -> None:
+        """Ham yorum listesini pazaryerine göre normalize edip yazma kuyruğuna ekler."""
+        if not self.enabled or not product_id or not reviews:
+            return
+        product_id = str(product_id)
+        now = time.time()
+        for review in reviews:
+            if marketplace == "trendyol":
+                author = review.get("userFullName")
+                content = review.get("comment")
+                rating = review.get("rate")
+                review_date = review.get("lastModifiedDate")
+                like_count = review.get("reviewLikeCount")
+                media_urls = [media.get("url") for media in review.get("mediaFiles", []) or [] if isinstance(media, dict) and media.get("url")]
+            else:
+                customer = review.get("customer", {}) or {}
+                author = customer.get("displayName")
+                content = (review.get("review", {}) or {}).get("content")
+                rating = review.get("star")
+                review_date = review.get("createdAt")
+                like_count = review.get("likeCount")
+                media_urls = [
+                    media.get("fullMediaUrl").removesuffix(":webp")
+                    for media in review.get("media", []) or []
+                    if isinstance(media, dict) and media.get("fullMediaUrl")
+                ]
+            review_id = review.get("id")
+            review_id = str(review_id) if review_id is not None else _fallback_review_id(product_id, author, content)
+            self._pending_reviews.append((
+                marketplace, review_id, product_id, author, _to_float(rating), content,
+                normalize_review_date(review_date), like_count,
+                json_codec.dumps(media_urls) if media_urls else None, now,
+            ))
+        await self._maybe_flush()
+
+    async def flush(self) -> None:
+        """Bekleyen tüm satırları tek transaction ile upsert eder."""
+        async with self._flush_lock:
+            if not self._pending_count():
+                return
+            products = list(self._pending_products.values())
+            features = self._pending_features
+            reviews = self._pending_reviews
+            self._pending_products, self._pending_features, self._pending_reviews = {}, {}, []
+            try:
+                await asyncio.to_thread(self._write_sync, products, features, reviews)
+            except Exception as e:
+                logger.error(f"Yorum deposuna yazılamadı ({len(products)} ürün, {len(reviews)} yorum): {e}", exc_info=True)
+                return
+            self.products_written += len(products)
+            self.reviews_written += len(reviews)
+            self.flushes += 1
+
+    # --- Okuma API'si ---
+
+    async def list_products(self, marketplace: Optional[str] = None, limit: int = 50, offset: int = 0) -> List[Dict[str, Any]]:
+        sql = (
+            "SELECT p.*, (SELECT COUNT(*) FROM reviews r WHERE r.marketplace = p.marketplace AND r.product_id = p.product_id) AS review_count "
+            "FROM products p"
+        )
+        params: Tuple = ()
+        if marketplace:
+            sql += " WHERE p.marketplace = ?"
+            params = (marketplace,)
+        sql += " ORDER BY p.updated_at DESC LIMIT ? OFFSET ?"
+        return await asyncio.to_thread(self._query_sync, sql, params + (limit, offset))
+
+    async def get_product(self, marketplace: str, product_id: str) -> Optional[Dict[str, Any]]:
+        rows = await asyncio.to_thread(self._query_sync, "SELECT * FROM products WHERE marketplace = ? AND product_id = ?", (marketplace, product_id))
+        if not rows:
+            return None
+        product = rows[0]
+        features = await asyncio.to_thread(
+            self._query_sync,
+            "SELECT name, value FROM product_features WHERE marketplace = ? AND product_id = ? ORDER BY name",
+            (marketplace, product_id),
+        )
+        product["features"] = {feature["name"]: feature["value"] for feature in features}
+        product["extra"] = json_codec.loads(product["extra"]) if product.get("extra") else None
+        return product
+
+    async def get_reviews(
+        self,
+        marketplace: str,
+        product_id: str,
+        since: Optional[str] = None,
+        until: Optional[str] = None,
+        limit: int = 100,
+        offset: int = 0,
+    ) -> List[Dict[str, Any]]:
+        """Bir ürünün yorumlarını (marketplace, product_id, review_date) indeksiyle, en yeniden eskiye döndürür."""
+        sql = "SELECT * FROM reviews WHERE marketplace = ? AND product_id = ?"
+        params: Tuple = (marketplace, product_id)
+        if since:
+            sql += " AND review_date >= ?"
+            params += (since,)
+        if until:
+            sql += " AND review_date <= ?"
+            params += (until,)
+        sql += " ORDER BY review_date DESC LIMIT ? OFFSET ?"
+        rows = await asyncio.to_thread(self._query_sync, sql, params + (limit, offset))
+        for row in rows:
+            row["media_urls"] = json_codec.loads(row["media_urls"]) if row.get("media_urls") else []
+        return rows
+
+    async def search(
+        self,
+        query: str,
+        marketplace: Optional[str] = None,
+        product_id: Optional[str] = None,
+        min_rating: Optional[float] = None,
+        max_rating: Optional[float] = None,
+        since: Optional[str] = None,
+        until: Optional[str] = None,
+        limit: int = 20,
+        offset: int = 0,
+    ) -> Dict[str, Any]:
+        """
+        Yorum metinlerinde tam metin arama yapar; sonuçlar bm25 skoruna göre
+        (en alakalı önce) sıralanır. Toplam eşleşme sayısı da döndürülür.
+        """
+        fts_query = build_fts_query(query)
+        if not fts_query:
+            return {"total": 0, "results": []}
+        where = ["reviews_fts MATCH ?"]
+        params: Tuple = (fts_query,)
+        for condition, value in (
+            ("r.marketplace = ?", marketplace),
+            ("r.product_id = ?", product_id),
+            ("r.rating >= ?", min_rating),
+            ("r.rating <= ?", max_rating),
+            ("r.review_date >= ?", since),
+            ("r.review_date <= ?", until),
+        ):
+            if value is not None:
+                where.append(condition)
+                params += (value,)
+        base = f"FROM reviews_fts JOIN reviews r ON r.rowid = reviews_fts.rowid WHERE {' AND '.join(where)}"
+        total = await asyncio.to_thread(self._query_sync, f"SELECT COUNT(*) AS total {base}", params)
+        rows = await asyncio.to_thread(
+            self._query_sync,
+            f"SELECT r.*, bm25(reviews_fts) AS score {base} ORDER BY score LIMIT ? OFFSET ?",
+            params + (limit, offset),
+        )
+        for row in rows:
+            row["media_urls"] = json_codec.loads(row["media_urls"]) if row.get("media_urls") else []
+            # bm25 negatif döner (küçük olan daha alakalı); dışarıya pozitif skor ver
+            row["score"] = round(-row["score"], 4)
+        return {"total": total[0]["total"], "results": rows}
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "enabled": self.enabled,
+            "products_written": self.products_written,
+            "reviews_written": self.reviews_written,
+            "flushes": self.flushes,
+            "pending_rows": self._pending_count(),
+        }
+
+
+review_store = ReviewStore()
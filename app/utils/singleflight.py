@@ -0,0 +1,105 @@
+import asyncio
+import functools
+import logging
+import time
+from collections import Counter, OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+from app.core.config import settings
+from app.utils.response_cache import normalize_url
+
+logger = logging.getLogger(__name__)
+
+
+class SingleFlight:
+    """
+    Aynı anahtar için eşzamanlı upstream isteklerini tek bir isteğe indirger.
+
+    Aynı URL/parametreleri isteyen çağrılar, devam eden tek bir görevin sonucunu
+    bekler. Görev bittikten sonra sonuç `window` saniye daha saklanır; bu pencere
+    içinde gelen çağrılar da aynı sonucu alır. Sonuç nesnesi çağıranlar arasında
+    paylaşıldığı için çağıranlar onu değiştirmemelidir.
+    """
+
+    def __init__(self, window: float = settings.SINGLEFLIGHT_WINDOW):
+        self.window = window
+        self._inflight: Dict[str, asyncio.Task] = {}
+        # Tamamlanma sırasına göre tutulur; pencere sabit olduğu için baştan temizlenebilir
+        self._recent: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+        self._stats: Dict[str, Counter] = {}
+
+    def _prune(self, now: float) -> None:
+        while self._recent:
+            key, (expires_at, _) = next(iter(self._recent.items()))
+            if expires_at > now:
+                break
+            self._recent.popitem(last=False)
+
+    async def do(self, name: str, key: str, fn: Callable[[], Awaitable[Any]]) -> Any:
+        """`key` için devam eden bir çağrı varsa onun sonucunu bekler, yoksa `fn()`i başlatır."""
+        stats = self._stats.setdefault(name, Counter())
+        stats["calls"] += 1
+        self._prune(time.monotonic())
+
+        recent = self._recent.get(key)
+        if recent is not None:
+            stats["window_hits"] += 1
+            return recent[1]
+
+        task = self._inflight.get(key)
+        if task is None:
+            stats["executions"] += 1
+            task = asyncio.create_task(self._run(key, fn))
+            # Bekleyen kalmazsa hata "retrieved" olarak işaretlensin
+            task.add_done_callback(lambda t: t.cancelled() or t.exception())
+            self._inflight[key] = task
+        else:
+            stats["coalesced"] += 1
+        # shield: çağıranlardan biri iptal edilirse paylaşılan istek yarıda kalmaz
+        return await asyncio.shield(task)
+
+    async def _run(self, key: str, fn: Callable[[], Awaitable[Any]]) -> Any:
+        try:
+            result = await fn()
+        finally:
+            self._inflight.pop(key, None)
+        if self.window > 0 and result is not None:
+            self._recent[key] = (time.monotonic() + self.window, result)
+            self._recent.move_to_end(key)
+        return result
+
+    def coalesce(
+        self,
+        name: str,
+        key: Callable[..., Tuple[str, Optional[Dict[str, Any]]]],
+        bypass: Optional[Callable[..., bool]] = None,
+    ):
+        """
+        Fetcher fonksiyonlarını singleflight ile saran decorator.
+        `key(*args, **kwargs)` çağrının (url, params) ikilisini döndürür.
+        `bypass(*args, **kwargs)` True dönen çağrılar birleştirilmez, her biri upstream'e gider.
+        """
+        def decorator(func):
+            @functools.wraps(func)
+            async def wrapper(*args, **kwargs):
+                if bypass is not None and bypass(*args, **kwargs):
+                    self._stats.setdefault(name, Counter())["bypassed"] += 1
+                    return await func(*args, **kwargs)
+                url, params = key(*args, **kwargs)
+                return await self.do(name, f"{name}:{normalize_url(url, params)}", lambda: func(*args, **kwargs))
+            return wrapper
+        return decorator
+
+    def stats(self) -> Dict[str, Any]:
+        result = {}
+        for name, stats in self._stats.items():
+            deduplicated = stats["coalesced"] + stats["window_hits"]
+            result[name] = {
+                **stats,
+                "deduplicated": deduplicated,
+                "dedupe_ratio": round(deduplicated / stats["calls"], 3) if stats["calls"] else None,
+            }
+        return {"window_seconds": self.window, "in_flight": len(self._inflight), "endpoints": result}
+
+
+singleflight = SingleFlight()
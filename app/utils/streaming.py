@@ -0,0 +1,83 @@
+import asyncio
+import logging
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict
+
+from fastapi.responses import StreamingResponse
+
+from app.core.config import settings
+from app.utils import json_codec
+
+logger = logging.getLogger(__name__)
+
+STREAM_FORMATS = ("json", "ndjson", "sse")
+_MEDIA_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "sse": "text/event-stream",
+}
+# Kuyruğun sonunu işaretleyen nesne
+_DONE = object()
+
+ProductSink = Callable[[Dict[str, Any]], Awaitable[None]]
+
+
+def _encode(fmt: str, event: str, payload: Dict[str, Any]) -> str:
+    if fmt == "sse":
+        return f"event: {event}\ndata: {json_codec.dumps(payload)}\n\n"
+    # NDJSON: ürünler olduğu gibi yazılır, diğer kayıtlar "type" alanıyla ayrılır
+    if event != "product":
+        payload = {"type": event, **payload}
+    return json_codec.dumps(payload) + "\n"
+
+
+async def _iter_products(run: Callable[[ProductSink], Awaitable[Dict[str, Any]]], fmt: str) -> AsyncIterator[str]:
+    """
+    Taramayı arka planda başlatır ve işlenen her ürünü geldiği anda kodlayıp verir.
+
+    Ürünler küçük, sınırlı bir kuyruktan geçer: istemci yavaş okursa tarama
+    bekler, böylece bellekte en fazla STREAM_QUEUE_SIZE ürün tutulur. İstemci
+    bağlantıyı keserse tarama iptal edilir.
+    """
+    queue: asyncio.Queue = asyncio.Queue()
+    # Kuyruk sınırı semaphore ile uygulanır; bitiş işareti her zaman beklemeden eklenebilsin
+    slots = asyncio.Semaphore(max(1, settings.STREAM_QUEUE_SIZE))
+
+    async def on_product(product: Dict[str, Any]) -> None:
+        await slots.acquire()
+        queue.put_nowait(product)
+
+    task = asyncio.create_task(run(on_product))
+    task.add_done_callback(lambda _: queue.put_nowait(_DONE))
+    products = 0
+    try:
+        while True:
+            product = await queue.get()
+            if product is _DONE:
+                break
+            slots.release()
+            products += 1
+            yield _encode(fmt, "product", product)
+
+        try:
+            result = task.result()
+        except Exception as e:
+            logger.error(f"Akış modunda tarama hatası: {e}", exc_info=True)
+            result = {"success": False, "error": str(e)}
+        if not result.get("success", False):
+            yield _encode(fmt, "error", {"error": result.get("error", "Bilinmeyen bir hata oluştu")})
+        # Son kayıt: ürün listesi hariç özet (ürünler zaten akışta gönderildi)
+        summary = {key: value for key, value in result.items() if key not in ("products", "data")}
+        yield _encode(fmt, "end", {**summary, "streamedProducts": products})
+    finally:
+        if not task.done():
+            task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+
+
+def stream_products(run: Callable[[ProductSink], Awaitable[Dict[str, Any]]], fmt: str) -> StreamingResponse:
+    """
+    `run(on_product)` taramasını NDJSON (satır başına bir ürün, sonda
+    `{"type": "end", ...}` özeti) veya SSE (`product` / `error` / `end` olayları)
+    olarak akıtan StreamingResponse döndürür.
+    """
+    headers = {"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    return StreamingResponse(_iter_products(run, fmt), media_type=_MEDIA_TYPES[fmt], headers=headers)
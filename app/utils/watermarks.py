@@ -0,0 +1,114 @@
+import logging
+import re
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from app.core.config import settings
+from app.utils.common import load_json_from_file, save_json_to_file
+
+logger = logging.getLogger(__name__)
+
+# Tarihler sadece sayı (epoch) veya ISO formatındaysa karşılaştırılabilir ("14 Temmuz 2023" değil)
+_ISO_DATE_RE = re.compile(r"^\d{4}-\d{2}-\d{2}")
+# Pazaryeri bazında yorum kimliği ve tarih alanları
+REVIEW_FIELDS = {
+    "trendyol": ("id", "lastModifiedDate"),
+    "hepsiburada": ("id", "createdAt"),
+}
+
+
+def _comparable(value: Any) -> Optional[Any]:
+    if isinstance(value, (int, float)):
+        return value
+    if isinstance(value, str) and _ISO_DATE_RE.match(value):
+        return value
+    return None
+
+
+class Watermark:
+    """Bir ürün için son taramada görülen en yeni yorumlar (kimlikler + en yeni tarih)."""
+
+    def __init__(self, review_ids: Iterable[str], latest_date: Any = None):
+        self.review_ids = [str(review_id) for review_id in review_ids]
+        self._id_set = set(self.review_ids)
+        self.latest_date = latest_date
+
+    def split_new(self, reviews: List[Dict[str, Any]], id_field: str, date_field: str) -> Tuple[List[Dict[str, Any]], bool]:
+        """
+        En yeniden eskiye sıralı bir yorum sayfasını su seviyesine göre böler.
+        Su seviyesinden yeni yorumları ve seviyenin aşılıp aşılmadığını döndürür.
+        """
+        latest = _comparable(self.latest_date)
+        for position, review in enumerate(reviews):
+            review_id = review.get(id_field)
+            if review_id is not None and str(review_id) in self._id_set:
+                return reviews[:position], True
+            review_date = _comparable(review.get(date_field))
+            if latest is not None and review_date is not None and type(review_date) is type(latest) and review_date <= latest:
+                return reviews[:position], True
+        return reviews, False
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"review_ids": self.review_ids, "latest_date": self.latest_date}
+
+
+class WatermarkStore:
+    """
+    Ürün bazında yorum su seviyelerini (watermark) JSON dosyasında saklar.
+
+    Artımlı (incremental) taramada yorumlar en yeniden eskiye istenir ve su
+    seviyesini geçen ilk sayfada durulur. Tarama başarıyla biterse su seviyesi
+    yeni gelen yorumlarla ilerletilir ve `save()` ile diske yazılır.
+    """
+
+    def __init__(self, path: str = settings.WATERMARK_FILE, max_ids: int = settings.WATERMARK_MAX_IDS):
+        self.path = path
+        self.max_ids = max_ids
+        self._data: Optional[Dict[str, Dict[str, Dict[str, Any]]]] = None
+
+    def _load(self) -> Dict[str, Dict[str, Dict[str, Any]]]:
+        if self._data is None:
+            try:
+                self._data = load_json_from_file(self.path)
+            except Exception as e:
+                logger.error(f"Su seviyesi dosyası okunamadı, sıfırdan başlanıyor: {e}")
+                self._data = {}
+        return self._data
+
+    def get(self, marketplace: str, product_id: str) -> Optional[Watermark]:
+        entry = self._load().get(marketplace, {}).get(str(product_id))
+        if not entry:
+            return None
+        return Watermark(entry.get("review_ids", []), entry.get("latest_date"))
+
+    def split_new(self, marketplace: str, watermark: Optional[Watermark], reviews: List[Dict[str, Any]]) -> Tuple[List[Dict[str, Any]], bool]:
+        if watermark is None:
+            return reviews, False
+        id_field, date_field = REVIEW_FIELDS[marketplace]
+        return watermark.split_new(reviews, id_field, date_field)
+
+    def advance(self, marketplace: str, product_id: str, new_reviews: List[Dict[str, Any]]) -> None:
+        """
+        Su seviyesini, en yeniden eskiye sıralı yeni yorumlarla ilerletir.
+        Kayıtlı en fazla `max_ids` kimlik tutulur (en yeni yorum silinse bile seviye bulunabilsin diye).
+        """
+        if not new_reviews:
+            return
+        id_field, date_field = REVIEW_FIELDS[marketplace]
+        previous = self.get(marketplace, product_id)
+        new_ids = [str(review[id_field]) for review in new_reviews if review.get(id_field) is not None]
+        review_ids = (new_ids + (previous.review_ids if previous else []))[: self.max_ids]
+        latest_date = new_reviews[0].get(date_field)
+        if latest_date is None and previous:
+            latest_date = previous.latest_date
+        self._load().setdefault(marketplace, {})[str(product_id)] = Watermark(review_ids, latest_date).to_dict()
+
+    def save(self) -> None:
+        if self._data is None:
+            return
+        try:
+            save_json_to_file(self._data, self.path)
+        except Exception as e:
+            logger.error(f"Su seviyesi dosyası yazılamadı: {e}")
+
+
+watermark_store = WatermarkStore()
@@ -0,0 +1,133 @@
+"""
+Kıyaslama betiklerinin okuduğu fixture dosyaları (benchmarks/fixtures/).
+
+Gerçek sayfalar tarayıcıdan kaydedilip bu dizine konabilir (ör. trendyol_telefon.html,
+hepsiburada_telefon.html); büyük bir API yanıtı da JSON olarak kaydedilebilir
+(ör. trendyol_reviews.json). Gerçek sayfa yoksa aynı yapıda sentetik dosyalar üretilir:
+
+    python -m benchmarks.fixtures
+"""
+import glob
+import json
+import os
+import sys
+from typing import Callable, Dict, List
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+
+PRODUCT_STATE_VARIABLE = "window.__PRODUCT_DETAIL_APP_INITIAL_STATE__"
+
+
+def fixture_paths(argv: List[str], pattern: str) -> List[str]:
+    """Komut satırında verilen yolları, yoksa fixture dizininde `pattern`e uyan dosyaları döndürür."""
+    paths = argv or sorted(glob.glob(os.path.join(FIXTURES_DIR, pattern)))
+    if not paths:
+        raise SystemExit(
+            f"{os.path.join(FIXTURES_DIR, pattern)} bulunamadı. Kaydedilmiş dosya yolu verin "
+            "veya sentetik fixture'ları üretin: python -m benchmarks.fixtures"
+        )
+    return paths
+
+
+def read_text(path: str) -> str:
+    with open(path, encoding="utf-8") as f:
+        return f.read()
+
+
+def _trendyol_product_page(with_json_ld: bool) -> str:
+    # ~1 MB: çok sayıda küçük script ve ürün kartı, JSON-LD ve iç içe initial state
+    filler = "".join(
+        f'<div class="p-card" data-id="{i}"><span>Ürün {i}</span><a href="/urun-{i}">detay</a></div>\n'
+        for i in range(12000)
+    )
+    scripts = "".join(
+        f'<script src="/static/chunk-{i}.js" defer></script><script>window.__chunk_{i}={{"a":[{i},{{"b":"x"}}]}};</script>\n'
+        for i in range(200)
+    )
+    product = {
+        "@context": "https://schema.org", "@type": "Product", "name": "Telefon",
+        "description": "Kılıf dahil {hediye}; kutu içeriği",
+        "additionalProperty": [{"@type": "PropertyValue", "name": f"Özellik {i}", "unitText": f"Değer {i}"} for i in range(40)],
+    }
+    state = {"product": {"id": 1, "name": "Telefon", "description": "Not: {a}; b", "attributes": [{"key": {"name": f"k{i}"}, "value": {"name": f"v{i}"}} for i in range(40)]}}
+    json_ld = ""
+    if with_json_ld:
+        json_ld = (
+            '<script type="application/ld+json">{"@context":"https://schema.org","@type":"BreadcrumbList","itemListElement":[]}</script>\n'
+            f'<script type="application/ld+json">{json.dumps(product, ensure_ascii=False)}</script>\n'
+        )
+    return (
+        "<html><head>" + scripts[: len(scripts) // 2] + "</head><body>" + filler + json_ld
+        + f"<script>{PRODUCT_STATE_VARIABLE}={json.dumps(state, ensure_ascii=False)};window.x={{}};</script>"
+        + scripts[len(scripts) // 2:] + "</body></html>"
+    )
+
+
+def _hepsiburada_product_page() -> str:
+    # Büyük bir reduxStore: varyantlar ve yorumlar arasında tırnak içi köşeli parantezler
+    state = {
+        "product": {
+            "name": "Telefon",
+            "variants": [{"sku": f"HBV{i}", "images": [f"https://img/{i}/{j}.jpg" for j in range(8)]} for i in range(1500)],
+            "expends": [
+                {"name": f"Grup {g}", "properties": [{"name": f"Özellik {g}-{i}", "property": f"Değer [{i}]"} for i in range(30)]}
+                for g in range(10)
+            ],
+            "reviews": [{"text": f"Yorum {i} [güzel] {{ok}}", "star": i % 5} for i in range(3000)],
+        }
+    }
+    filler = "".join(f'<div class="c{i}"><a href="/p-{i}">Ürün {i}</a></div>' for i in range(20000))
+    return f'<html><body>{filler}<script id="reduxStore" type="application/json">{json.dumps(state, ensure_ascii=False)}</script></body></html>'
+
+
+def _reviews_payload(products: int = 1000, reviews_per_product: int = 100) -> str:
+    # /trendyol/products yanıtı biçiminde 100 bin yorumluk sonuç
+    payload = {
+        "success": True,
+        "totalProducts": products,
+        "totalPages": products // 24,
+        "products": [
+            {
+                "productInfo": {
+                    "name": f"Ürün {p}", "url": f"https://www.trendyol.com/urun-p-{p}",
+                    "contentId": p, "merchantId": 1000 + p, "boutiqueId": None,
+                    "properties": [{"name": f"Özellik {i}", "value": f"Değer {i}"} for i in range(15)],
+                },
+                "reviews": [
+                    {
+                        "id": p * 1000 + r, "userFullName": "A** B**", "rate": r % 5 + 1,
+                        "comment": f"Ürün çok güzel, hızlı kargo için teşekkürler. ({p}-{r})",
+                        "lastModifiedDate": "14 Temmuz 2023", "reviewLikeCount": r % 7,
+                        "mediaFiles": [], "sellerName": "Mağaza", "trusted": True,
+                    }
+                    for r in range(reviews_per_product)
+                ],
+            }
+            for p in range(products)
+        ],
+    }
+    return json.dumps(payload, ensure_ascii=False)
+
+
+# Dosya adı -> içerik üreticisi
+SYNTHETIC_FIXTURES: Dict[str, Callable[[], str]] = {
+    "trendyol_json_ld.synthetic.html": lambda: _trendyol_product_page(True),
+    "trendyol_initial_state.synthetic.html": lambda: _trendyol_product_page(False),
+    "hepsiburada_redux_store.synthetic.html": _hepsiburada_product_page,
+    "reviews_100k.synthetic.json": _reviews_payload,
+}
+
+
+def write_synthetic_fixtures(overwrite: bool = False) -> None:
+    os.makedirs(FIXTURES_DIR, exist_ok=True)
+    for name, build in SYNTHETIC_FIXTURES.items():
+        path = os.path.join(FIXTURES_DIR, name)
+        if os.path.exists(path) and not overwrite:
+            continue
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(build())
+        print(f"yazıldı: {path} ({os.path.getsize(path) / 1e6:.2f} MB)")
+
+
+if __name__ == "__main__":
+    write_synthetic_fixtures(overwrite="--overwrite" in sys.argv[1:])
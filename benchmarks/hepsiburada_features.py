@@ -0,0 +1,62 @@
+"""
+Hepsiburada reduxStore 'expends' listesinin sayfa başına ayrıştırma süresi.
+
+    python -m benchmarks.hepsiburada_features [kaydedilmiş_sayfa.html ...]
+
+Yol verilmezse benchmarks/fixtures/hepsiburada_*.html okunur. Eski yol, script
+metni bulunduktan sonra karakter karakter parantez sayıp pyjson5 ile çözer.
+"""
+import html
+import sys
+import timeit
+
+import pyjson5
+
+from app.parsers.hepsiburada_parser import parse_product_features
+from app.parsers.script_extractor import find_script_by_id
+from benchmarks.fixtures import fixture_paths, read_text
+
+
+def legacy_parse(script_text):
+    # Eski yol: unescape + tırnakları bilmeyen parantez sayma döngüsü + pyjson5
+    unescaped_content = html.unescape(script_text)
+    open_bracket_index = unescaped_content.find('[', unescaped_content.find('"expends":'))
+    bracket_level = 1
+    current_pos = open_bracket_index + 1
+    while bracket_level > 0 and current_pos < len(unescaped_content):
+        char = unescaped_content[current_pos]
+        if char == '[':
+            bracket_level += 1
+        elif char == ']':
+            bracket_level -= 1
+        current_pos += 1
+    expends_list = pyjson5.loads(unescaped_content[open_bracket_index:current_pos])
+    return {prop['name']: prop['property'] for group in expends_list for prop in group.get('properties', []) if 'name' in prop and 'property' in prop}
+
+
+def main(argv):
+    number = 10
+    for path in fixture_paths(argv, "hepsiburada_*.html"):
+        html_page = read_text(path)
+        print(f"{path}: {len(html_page) / 1e6:.2f} MB")
+        script_text = find_script_by_id(html_page, "reduxStore")
+        if script_text is None:
+            print("  reduxStore script'i bulunamadı, atlandı")
+            continue
+        lookup_ms = timeit.timeit(lambda: find_script_by_id(html_page, "reduxStore"), number=number) / number * 1000
+        fast = parse_product_features(script_text)
+        # page.evaluate ile script metni doğrudan alındığında sadece ayrıştırma kalır
+        fast_ms = timeit.timeit(lambda: parse_product_features(script_text), number=number) / number * 1000
+        print(f"  script araması (HTML'den): {lookup_ms:8.2f} ms")
+        print(f"  hızlı yol:                 {fast_ms:8.2f} ms  ({len(fast or {})} özellik)")
+        try:
+            legacy = legacy_parse(script_text)
+        except Exception as e:
+            print(f"  eski yol başarısız: {e}")
+            continue
+        legacy_ms = timeit.timeit(lambda: legacy_parse(script_text), number=number) / number * 1000
+        print(f"  eski yol (döngü + pyjson5): {legacy_ms:7.2f} ms  ({len(legacy)} özellik)  x{legacy_ms / fast_ms:.1f}")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
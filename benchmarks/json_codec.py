@@ -0,0 +1,54 @@
+"""
+Büyük bir sonucun uçtan uca serileştirme/çözme süresi: FastAPI varsayılanı
+(jsonable_encoder + json.dumps), standart json ve app.utils.json_codec.
+
+    python -m benchmarks.json_codec [kaydedilmiş_yanıt.json ...]
+
+Yol verilmezse benchmarks/fixtures/*.json okunur.
+"""
+import gc
+import json
+import sys
+import time
+
+from fastapi.encoders import jsonable_encoder
+
+from app.utils import json_codec
+from benchmarks.fixtures import fixture_paths
+
+
+def timed(name, func, baseline=None):
+    # Çok sayıda nesne oluşturan çözme ölçümlerini GC duraklamaları bozmasın
+    gc.collect()
+    gc.disable()
+    try:
+        started = time.perf_counter()
+        result = func()
+        elapsed = time.perf_counter() - started
+    finally:
+        gc.enable()
+    size = f"{len(result) / 1e6:6.1f} MB" if isinstance(result, bytes) else " " * 9
+    ratio = f"  x{baseline / elapsed:.1f}" if baseline else ""
+    print(f"{name:38s} {elapsed * 1000:9.1f} ms  {size}{ratio}")
+    return elapsed
+
+
+def main(argv):
+    print(f"orjson {'var' if json_codec.ORJSON_AVAILABLE else 'yok'}")
+    for path in fixture_paths(argv, "*.json"):
+        with open(path, "rb") as f:
+            encoded = f.read()
+        payload = json.loads(encoded)
+        print(f"\n{path} ({len(encoded) / 1e6:.1f} MB)")
+        baseline = timed(
+            "FastAPI varsayılanı (encoder + json)",
+            lambda: json.dumps(jsonable_encoder(payload), ensure_ascii=False, separators=(",", ":")).encode("utf-8"),
+        )
+        timed("json.dumps", lambda: json.dumps(payload, ensure_ascii=False, separators=(",", ":")).encode("utf-8"), baseline)
+        timed("json_codec.dumps_bytes", lambda: json_codec.dumps_bytes(payload), baseline)
+        decode_baseline = timed("json.loads", lambda: json.loads(encoded))
+        timed("json_codec.loads", lambda: json_codec.loads(encoded), decode_baseline)
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
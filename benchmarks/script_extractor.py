@@ -0,0 +1,52 @@
+"""
+Trendyol ürün sayfasından ürün JSON'unu çıkarma: eski regex yolu ve script_extractor.
+
+    python -m benchmarks.script_extractor [kaydedilmiş_sayfa.html ...]
+
+Yol verilmezse benchmarks/fixtures/trendyol_*.html okunur.
+"""
+import json
+import re
+import sys
+import timeit
+
+from app.parsers.script_extractor import extract_trendyol_product_details
+from benchmarks.fixtures import fixture_paths, read_text
+
+
+def legacy_extract(html_content):
+    # trendyol_parser'daki eski regex tabanlı yol
+    json_ld_matches = re.findall(r'<script type="application/ld\+json">(.*?)</script>', html_content, re.DOTALL)
+    for json_ld_text in json_ld_matches:
+        try:
+            data = json.loads(json_ld_text.strip())
+            if isinstance(data, dict) and data.get("@type") == "Product":
+                return data
+        except Exception:
+            continue
+    match = re.search(r'window\.__PRODUCT_DETAIL_APP_INITIAL_STATE__\s*=\s*({.*?});', html_content, re.DOTALL)
+    if match:
+        try:
+            return {"productData": json.loads(match.group(1)).get("product", {})}
+        except json.JSONDecodeError:
+            return None
+    return None
+
+
+def main(argv):
+    number = 20
+    for path in fixture_paths(argv, "trendyol_*.html"):
+        html_page = read_text(path)
+        legacy = legacy_extract(html_page)
+        fast = extract_trendyol_product_details(html_page)
+        legacy_ms = timeit.timeit(lambda: legacy_extract(html_page), number=number) / number * 1000
+        fast_ms = timeit.timeit(lambda: extract_trendyol_product_details(html_page), number=number) / number * 1000
+        print(f"{path}: {len(html_page) / 1e6:.2f} MB")
+        print(f"  regex:     {legacy_ms:8.2f} ms  (sonuç {'var' if legacy else 'yok'})")
+        print(f"  extractor: {fast_ms:8.2f} ms  (sonuç {'var' if fast else 'yok'})  x{legacy_ms / fast_ms:.1f}")
+        if legacy != fast:
+            print("  uyarı: sonuçlar farklı (regex iç içe JSON'u kesmiş olabilir)")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,77 @@
+"""
+Trendyol yorum API'sini çekme yöntemlerinin karşılaştırması: sayfa navigasyonu,
+APIRequestContext (context.request) ve düz httpx. Ağ erişimi ve Chromium gerekir.
+
+    python -m benchmarks.trendyol_api_fetch <contentId> <sellerId> [sayfa_sayısı]
+
+Her yöntem için gecikme ve engellenme oranı (durum >= 400 veya JSON olmayan yanıt)
+yazdırılır. TRENDYOL_API_FETCH_MODE varsayılanı bu sonuçlara göre seçilmelidir.
+"""
+import asyncio
+import sys
+import time
+from urllib.parse import urlencode
+
+from app.core.config import settings
+from app.parsers.trendyol_parser import TRENDYOL_REVIEW_API_HEADERS, fetch_api_json
+from app.utils import json_codec
+from app.utils.browser_pool import browser_pool
+from app.utils.http_clients import http_clients
+
+
+async def via_browser(mode, full_url):
+    status, data = await fetch_api_json(full_url, TRENDYOL_REVIEW_API_HEADERS, mode=mode)
+    return status, data if isinstance(data, dict) else None
+
+
+async def via_httpx(full_url):
+    headers = {**TRENDYOL_REVIEW_API_HEADERS, 'user-agent': settings.USER_AGENT}
+    response = await http_clients.get(full_url).get(full_url, headers=headers)
+    try:
+        data = json_codec.loads(response.content)
+    except ValueError:
+        data = None
+    return response.status_code, data if isinstance(data, dict) else None
+
+
+async def benchmark(content_id, seller_id, pages):
+    base_url = settings.TRENDYOL_REVIEW_API_URL
+    urls = [
+        f"{base_url}?{urlencode({'page': page, 'channelId': '1', 'sellerId': seller_id, 'contentId': content_id})}"
+        for page in range(pages)
+    ]
+    methods = {
+        "navigate": lambda full_url: via_browser("navigate", full_url),
+        "request": lambda full_url: via_browser("request", full_url),
+        "httpx": via_httpx,
+    }
+    await browser_pool.start()
+    try:
+        for name, fetch in methods.items():
+            await fetch(urls[0])  # ısınma
+            latencies, statuses, blocked, total_bytes = [], [], 0, 0
+            for full_url in urls:
+                started = time.perf_counter()
+                status, data = await fetch(full_url)
+                latencies.append((time.perf_counter() - started) * 1000)
+                statuses.append(status)
+                if data is None or (status or 0) >= 400:
+                    blocked += 1
+                else:
+                    total_bytes += len(json_codec.dumps_bytes(data))
+            latencies.sort()
+            print(
+                f"{name:9s} ort {sum(latencies) / len(latencies):8.1f} ms  "
+                f"p50 {latencies[len(latencies) // 2]:8.1f} ms  "
+                f"engellenen {blocked}/{len(urls)}  "
+                f"durumlar {sorted(set(statuses), key=str)}  {total_bytes / 1024:.0f} KiB"
+            )
+    finally:
+        await browser_pool.stop()
+        await http_clients.aclose()
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 3:
+        raise SystemExit(__doc__)
+    asyncio.run(benchmark(sys.argv[1], sys.argv[2], int(sys.argv[3]) if len(sys.argv) > 3 else 5))
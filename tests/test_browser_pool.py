@@ -0,0 +1,94 @@
+import asyncio
+
+from app.utils.browser_pool import BrowserPool
+
+
+class FakeContext:
+    async def add_cookies(self, cookies):
+        pass
+
+
+class FakeBrowser:
+    def __init__(self):
+        self.connected = True
+
+    async def new_context(self, **kwargs):
+        return FakeContext()
+
+    def is_connected(self):
+        return self.connected
+
+    async def close(self):
+        self.connected = False
+
+
+class FlakyChromium:
+    """İlk `failures` başlatmayı başarısız yapan sahte chromium."""
+
+    def __init__(self, failures=0):
+        self.failures = failures
+        self.launched = []
+
+    async def launch(self, **kwargs):
+        if self.failures > 0:
+            self.failures -= 1
+            raise RuntimeError("launch failed")
+        browser = FakeBrowser()
+        self.launched.append(browser)
+        return browser
+
+
+class FakePlaywright:
+    def __init__(self, chromium):
+        self.chromium = chromium
+
+
+def make_pool(chromium, size=1):
+    pool = BrowserPool(size=size, contexts_per_browser=1, max_navigations=1000, healthcheck_interval=0.05, checkout_timeout=2.0)
+    pool._playwright = FakePlaywright(chromium)
+    pool._queues = {"default": asyncio.Queue()}
+    pool._started = True
+    return pool
+
+
+def test_failed_replacement_is_refilled_in_background():
+    async def scenario():
+        chromium = FlakyChromium()
+        pool = make_pool(chromium)
+        await pool._launch_browser()
+        handle = pool._handles[0]
+
+        # Yedek tarayıcının ilk iki başlatması başarısız olur
+        chromium.failures = 2
+        handle.browser.connected = False
+        await pool._retire(handle, reason="test")
+        assert pool._handles == []
+
+        async with pool.checkout_context() as context:
+            assert isinstance(context, FakeContext)
+        assert len(pool._handles) == 1
+        assert pool.failed_launches == 2
+        pool._started = False
+
+    asyncio.run(scenario())
+
+
+def test_healthcheck_loop_restores_configured_size():
+    async def scenario():
+        chromium = FlakyChromium()
+        pool = make_pool(chromium, size=2)
+        await pool._launch_browser()
+        chromium.failures = 1
+        task = asyncio.create_task(pool._healthcheck_loop())
+        try:
+            for _ in range(100):
+                if len(pool._handles) == 2:
+                    break
+                await asyncio.sleep(0.05)
+        finally:
+            pool._started = False
+            task.cancel()
+            await asyncio.gather(task, pool._refill_task, return_exceptions=True)
+        assert len(pool._handles) == 2
+
+    asyncio.run(scenario())
@@ -0,0 +1,90 @@
+import asyncio
+
+from app.utils.checkpoint import CrawlCheckpoint
+from app.utils.dedupe import ReviewDeduplicator
+
+
+def paths(tmp_path):
+    return str(tmp_path / "job.checkpoint.json"), str(tmp_path / "job.dedupe.bin"), str(tmp_path / "out.csv")
+
+
+def test_resume_restores_progress_and_truncates_partial_rows(tmp_path):
+    checkpoint_path, dedupe_path, output = paths(tmp_path)
+    checkpoint = CrawlCheckpoint(checkpoint_path, dedupe_path)
+    assert checkpoint.prepare_output(output) == 0
+    with open(output, "wb") as f:
+        f.write(b"header\nrow1\n")
+    checkpoint.total_pages = 3
+    checkpoint.mark_search_page(1, [("a", {"url": "/a"}), ("b", {"url": "/b"})])
+    checkpoint.mark_review_page("a", 0)
+    checkpoint.mark_review_page("a", 1)
+    checkpoint.mark_review_page("b", 0)
+    checkpoint.mark_product_done("b")
+    dedupe = ReviewDeduplicator("hash")
+    dedupe.filter("trendyol", "a", [{"id": 1}, {"id": 2}])
+    asyncio.run(checkpoint.save(dedupe=dedupe))
+    # Kontrol noktasından sonra yarım kalmış bir satır
+    with open(output, "ab") as f:
+        f.write(b"row2-yar")
+
+    resumed = CrawlCheckpoint.load(checkpoint_path, dedupe_path)
+    assert resumed.resumed
+    assert resumed.total_pages == 3
+    assert resumed.search_page_done(1) and not resumed.search_page_done(2)
+    assert resumed.pending_products() == [("a", {"url": "/a"})]
+    assert resumed.product_done("b") and resumed.products_done == 1
+    assert resumed.review_pages("a") == {0, 1}
+    assert resumed.review_pages("b") == set()
+    assert resumed.prepare_output(output) == len(b"header\nrow1\n")
+    with open(output, "rb") as f:
+        assert f.read() == b"header\nrow1\n"
+    restored = ReviewDeduplicator.load(dedupe_path)
+    assert restored.filter("trendyol", "a", [{"id": 2}, {"id": 3}]) == [{"id": 3}]
+
+
+def test_done_products_are_not_requeued_from_search_pages(tmp_path):
+    checkpoint = CrawlCheckpoint(paths(tmp_path)[0])
+    checkpoint.mark_product_done("a")
+    checkpoint.mark_search_page(2, [("a", {}), ("c", {})])
+    assert checkpoint.pending_products() == [("c", {})]
+
+
+def test_output_shorter_than_checkpoint_restarts_crawl(tmp_path):
+    checkpoint_path, _, output = paths(tmp_path)
+    checkpoint = CrawlCheckpoint(checkpoint_path)
+    checkpoint.prepare_output(output)
+    checkpoint.mark_search_page(1, [("a", {})])
+    checkpoint.mark_product_done("a")
+    asyncio.run(checkpoint.save(output_offset=100))
+    with open(output, "wb") as f:
+        f.write(b"header\n")
+
+    resumed = CrawlCheckpoint.load(checkpoint_path)
+    assert resumed.prepare_output(output) == 0
+    assert not resumed.search_page_done(1)
+    assert resumed.products_done == 0
+
+
+def test_missing_or_corrupt_checkpoint_starts_fresh(tmp_path):
+    checkpoint_path, _, output = paths(tmp_path)
+    assert not CrawlCheckpoint.load(checkpoint_path).resumed
+    with open(checkpoint_path, "w") as f:
+        f.write("{bozuk")
+    checkpoint = CrawlCheckpoint.load(checkpoint_path)
+    assert not checkpoint.resumed
+    with open(output, "wb") as f:
+        f.write(b"eski\n")
+    assert checkpoint.prepare_output(output) == 0
+
+
+def test_maybe_save_respects_interval_and_delete_removes_files(tmp_path):
+    checkpoint_path, dedupe_path, _ = paths(tmp_path)
+    checkpoint = CrawlCheckpoint(checkpoint_path, dedupe_path, save_interval=3600)
+    asyncio.run(checkpoint.maybe_save(dedupe=ReviewDeduplicator("hash")))
+    assert checkpoint.saves == 0
+    checkpoint.save_interval = 0
+    asyncio.run(checkpoint.maybe_save(dedupe=ReviewDeduplicator("hash")))
+    assert checkpoint.saves == 1
+    assert (tmp_path / "job.checkpoint.json").exists() and (tmp_path / "job.dedupe.bin").exists()
+    checkpoint.delete()
+    assert not (tmp_path / "job.checkpoint.json").exists() and not (tmp_path / "job.dedupe.bin").exists()
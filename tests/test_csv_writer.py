@@ -0,0 +1,96 @@
+import asyncio
+import csv
+import os
+
+import pytest
+
+from app.utils.csv_writer import CsvWriterStage
+
+
+def read_values(path):
+    with open(path, newline="", encoding="utf-8") as f:
+        return [row["value"] for row in csv.DictReader(f)]
+
+
+def rows(index, count=1):
+    return [{"value": f"{index}-{i}"} for i in range(count)]
+
+
+def test_ordered_writer_reorders_out_of_order_puts(tmp_path):
+    path = str(tmp_path / "out" / "ordered.csv")
+
+    async def scenario():
+        async with CsvWriterStage(path, ["value"], ordered=True, batch_size=2, fsync_interval=60) as writer:
+            for index in [2, 0, 3, 1, 5, 4]:
+                await writer.put(index, rows(index, 2) if index != 3 else [])
+        return writer
+
+    writer = asyncio.run(scenario())
+    assert read_values(path) == ["0-0", "0-1", "1-0", "1-1", "2-0", "2-1", "4-0", "4-1", "5-0", "5-1"]
+    stats = writer.stats()
+    assert stats["products_written"] == 5 and stats["rows_written"] == 10
+    assert stats["max_reorder_buffer"] >= 2 and stats["reorder_buffer"] == 0
+
+
+def test_unordered_writer_keeps_completion_order(tmp_path):
+    path = str(tmp_path / "unordered.csv")
+
+    async def scenario():
+        async with CsvWriterStage(path, ["value"], ordered=False, batch_size=10, fsync_interval=60) as writer:
+            for index in [2, 0, 1]:
+                await writer.put(index, rows(index))
+
+    asyncio.run(scenario())
+    assert read_values(path) == ["2-0", "0-0", "1-0"]
+
+
+def test_close_writes_rows_stuck_behind_a_missing_index(tmp_path):
+    path = str(tmp_path / "gap.csv")
+
+    async def scenario():
+        async with CsvWriterStage(path, ["value"], ordered=True, fsync_interval=60) as writer:
+            await writer.put(0, rows(0))
+            await writer.put(3, rows(3))
+            await writer.put(2, rows(2))
+        with pytest.raises(RuntimeError):
+            await writer.put(4, rows(4))
+
+    asyncio.run(scenario())
+    assert read_values(path) == ["0-0", "2-0", "3-0"]
+
+
+def test_resume_offset_truncates_and_appends_without_header(tmp_path):
+    path = str(tmp_path / "resume.csv")
+
+    async def first_run():
+        async with CsvWriterStage(path, ["value"], ordered=True, fsync_interval=60) as writer:
+            await writer.put(0, rows(0))
+        return os.path.getsize(path)
+
+    offset = asyncio.run(first_run())
+    with open(path, "a", encoding="utf-8") as f:
+        f.write("yarım sat")
+
+    async def second_run():
+        async with CsvWriterStage(path, ["value"], ordered=True, fsync_interval=60, resume_offset=offset) as writer:
+            await writer.put(0, rows(1))
+
+    asyncio.run(second_run())
+    assert read_values(path) == ["0-0", "1-0"]
+
+
+def test_on_sync_reports_keys_and_file_size(tmp_path):
+    path = str(tmp_path / "sync.csv")
+    synced = []
+
+    async def on_sync(keys, offset):
+        synced.append((keys, offset))
+
+    async def scenario():
+        async with CsvWriterStage(path, ["value"], ordered=True, fsync_interval=60, on_sync=on_sync) as writer:
+            await writer.put(1, rows(1), key="b")
+            await writer.put(0, [], key="a")
+
+    asyncio.run(scenario())
+    assert [key for keys, _ in synced for key in keys] == ["a", "b"]
+    assert synced[-1][1] == os.path.getsize(path)
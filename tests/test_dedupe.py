@@ -0,0 +1,114 @@
+from array import array
+
+import pytest
+
+from app.utils.dedupe import BloomFilter, ReviewDeduplicator, ScalableBloomFilter, SortedHashSet, review_digest
+
+
+def reviews(start, stop):
+    return [{"id": i, "comment": f"yorum {i}"} for i in range(start, stop)]
+
+
+def test_review_digest_prefers_id_and_falls_back_to_fields():
+    assert review_digest("trendyol", "1", {"id": 5, "comment": "a"}) == review_digest("trendyol", "1", {"id": 5, "comment": "b"})
+    assert review_digest("trendyol", "1", {"id": 5}) != review_digest("trendyol", "2", {"id": 5})
+    first = {"customer": {"displayName": "A"}, "review": {"content": "güzel"}, "createdAt": "2024-01-01"}
+    second = {"customer": {"displayName": "A"}, "review": {"content": "kötü"}, "createdAt": "2024-01-01"}
+    assert review_digest("hepsiburada", "HB1", first) != review_digest("hepsiburada", "HB1", second)
+
+
+@pytest.mark.parametrize("mode", ["hash", "bloom"])
+def test_filter_drops_duplicates_within_and_across_pages(mode):
+    dedupe = ReviewDeduplicator(mode, bloom_initial_capacity=100, bloom_error_rate=0.001)
+    assert dedupe.filter("trendyol", "1", reviews(0, 10) + reviews(5, 10)) == reviews(0, 10)
+    assert dedupe.filter("trendyol", "1", reviews(8, 12)) == reviews(10, 12)
+    assert dedupe.filter("trendyol", "2", reviews(0, 2)) == reviews(0, 2)
+    assert len(dedupe) == 14
+    assert (dedupe.seen, dedupe.duplicates) == (21, 7)
+
+
+@pytest.mark.parametrize("mode", ["hash", "bloom"])
+def test_save_and_load_roundtrip(tmp_path, mode):
+    path = str(tmp_path / "state" / "dedupe.bin")
+    dedupe = ReviewDeduplicator(mode, bloom_initial_capacity=16, bloom_error_rate=0.001)
+    dedupe.filter("hepsiburada", "HB1", reviews(0, 50))
+    dedupe.filter("hepsiburada", "HB1", reviews(0, 5))
+    dedupe.save(path)
+
+    restored = ReviewDeduplicator.load(path)
+    assert restored.mode == mode
+    # Bellek tahmini dizilerin ayrılan kapasitesine göre farklı olabilir
+    restored_stats, stats = restored.stats(), dedupe.stats()
+    assert restored_stats.pop("approx_payload_bytes") <= stats.pop("approx_payload_bytes")
+    assert restored_stats == stats
+    assert restored.filter("hepsiburada", "HB1", reviews(45, 55)) == reviews(50, 55)
+    assert not (tmp_path / "state" / "dedupe.bin.tmp").exists()
+
+
+def test_load_missing_file_returns_empty(tmp_path):
+    dedupe = ReviewDeduplicator.load(str(tmp_path / "missing.bin"))
+    assert len(dedupe) == 0
+
+
+def test_invalid_mode_is_rejected():
+    with pytest.raises(ValueError):
+        ReviewDeduplicator("exact")
+
+
+def test_bloom_filter_has_no_false_negatives_and_bounded_false_positives():
+    bloom = BloomFilter(capacity=1000, error_rate=0.01)
+    added = [review_digest("trendyol", "1", {"id": i}) for i in range(1000)]
+    for digest in added:
+        bloom.add(digest)
+    assert all(digest in bloom for digest in added)
+    others = [review_digest("trendyol", "2", {"id": i}) for i in range(10000)]
+    false_positives = sum(digest in bloom for digest in others)
+    assert false_positives / len(others) < 0.03
+
+
+def test_scalable_bloom_filter_grows_in_layers():
+    bloom = ScalableBloomFilter(initial_capacity=10, error_rate=0.01)
+    digests = [review_digest("trendyol", "1", {"id": i}) for i in range(100)]
+    for digest in digests:
+        bloom.add(digest)
+    assert len(bloom) == 100
+    # 10 + 20 + 40 + 80 kapasiteli katmanlar
+    assert [layer.capacity for layer in bloom.layers] == [10, 20, 40, 80]
+    assert all(digest in bloom for digest in digests)
+    assert bloom.memory_bytes() == sum(len(layer.bits) for layer in bloom.layers)
+
+
+@pytest.mark.parametrize("mode", ["hash", "bloom"])
+def test_check_does_not_record_until_commit(mode):
+    dedupe = ReviewDeduplicator(mode, bloom_initial_capacity=100, bloom_error_rate=0.001)
+    new_reviews, digests = dedupe.check("trendyol", "1", reviews(0, 3) + reviews(1, 2))
+    assert new_reviews == reviews(0, 3) and len(digests) == 3
+    assert len(dedupe) == 0
+    assert dedupe.check("trendyol", "1", reviews(0, 3))[0] == reviews(0, 3)
+    dedupe.commit(digests)
+    assert dedupe.filter("trendyol", "1", reviews(0, 4)) == reviews(3, 4)
+
+
+def test_sorted_hash_set_keeps_keys_sorted_across_buckets():
+    keys = SortedHashSet()
+    values = [(i * 11400714819323198485) % (1 << 64) for i in range(1, 1001)] + [0, (1 << 64) - 1]
+    for value in values + values[:10]:
+        keys.add(value)
+    assert len(keys) == len(values)
+    assert all(value in keys for value in values)
+    assert 12345 not in keys
+    payload = array("Q")
+    payload.frombytes(keys.to_bytes())
+    assert list(payload) == sorted(values)
+    restored = SortedHashSet.from_bytes(keys.to_bytes())
+    assert len(restored) == len(values) and all(value in restored for value in values)
+    # Sırasız (eski biçim) durum da yüklenebilir
+    legacy = SortedHashSet.from_bytes(array("Q", [5, 1, 3, 1]).tobytes(), is_sorted=False)
+    assert len(legacy) == 3 and 3 in legacy and 4 not in legacy
+
+
+def test_hash_mode_memory_is_reported_per_entry():
+    dedupe = ReviewDeduplicator("hash")
+    dedupe.filter("trendyol", "1", reviews(0, 50000))
+    per_entry = dedupe.stats()["approx_payload_bytes"] / len(dedupe)
+    assert 8 <= per_entry < 20
@@ -0,0 +1,71 @@
+import asyncio
+
+from app.services import hepsiburada_service
+from app.utils.dedupe import ReviewDeduplicator
+
+
+def product_reviews(sku):
+    return [{"id": f"{sku}-{i}", "review": {"content": "güzel"}} for i in range(3)]
+
+
+def patch_stages(monkeypatch):
+    async def fetch_features(product, sku):
+        return {"sku": sku}
+
+    async def fetch_reviews(product_info, incremental=False):
+        return {**product_info, "reviews": product_reviews(product_info["sku"])}
+
+    async def store_product(processed_product):
+        return None
+
+    monkeypatch.setattr(hepsiburada_service, "fetch_single_product_features", fetch_features)
+    monkeypatch.setattr(hepsiburada_service, "fetch_single_product_reviews", fetch_reviews)
+    monkeypatch.setattr(hepsiburada_service, "_store_product", store_product)
+
+
+async def produce(queue, skus):
+    for sku in skus:
+        await queue.put(sku, (queue.enqueued, {}, sku))
+
+
+def test_reviews_are_marked_seen_only_after_sink_accepts_them(monkeypatch):
+    patch_stages(monkeypatch)
+    dedupe = ReviewDeduplicator("hash")
+    written = []
+
+    async def scenario():
+        blocked = asyncio.Event()
+
+        async def sink(index, processed_product):
+            if processed_product["sku"] == "HB2":
+                # Dolu yazıcı kuyruğunda bekleyen put
+                blocked.set()
+                await asyncio.Event().wait()
+            written.append((processed_product["sku"], len(processed_product["reviews"])))
+
+        task = asyncio.create_task(
+            hepsiburada_service.run_product_scheduler(lambda queue: produce(queue, ["HB1", "HB2"]), sink, dedupe=dedupe)
+        )
+        await asyncio.wait_for(blocked.wait(), timeout=5)
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+
+    asyncio.run(scenario())
+    assert written == [("HB1", 3)]
+    # Yazılamayan ürünün yorumları devam eden taramada tekrar yazılabilmeli
+    assert dedupe.filter("hepsiburada", "HB2", product_reviews("HB2")) == product_reviews("HB2")
+    assert dedupe.filter("hepsiburada", "HB1", product_reviews("HB1")) == []
+
+
+def test_scheduler_filters_reviews_seen_in_earlier_runs(monkeypatch):
+    patch_stages(monkeypatch)
+    dedupe = ReviewDeduplicator("hash")
+    dedupe.filter("hepsiburada", "HB1", product_reviews("HB1")[:2])
+    written = {}
+
+    async def sink(index, processed_product):
+        written[processed_product["sku"]] = [review["id"] for review in processed_product["reviews"]]
+
+    asyncio.run(hepsiburada_service.run_product_scheduler(lambda queue: produce(queue, ["HB1", "HB2"]), sink, dedupe=dedupe))
+    assert written == {"HB1": ["HB1-2"], "HB2": ["HB2-0", "HB2-1", "HB2-2"]}
+    assert len(dedupe) == 6
@@ -0,0 +1,91 @@
+import asyncio
+import os
+
+import pytest
+
+from app.core.config import settings
+from app.services import job_service
+from app.services.job_service import FINISHED_STATUSES, JOB_SUCCEEDED, JobManager
+from app.utils.common import load_json_from_file
+from app.utils.dedupe import ReviewDeduplicator
+
+REVIEWS = [{"id": i} for i in range(3)]
+
+
+class StubCrawler:
+    """İlk çalışmada yorumları tekilleştiriciden geçirip iptal edilene kadar bekler."""
+
+    def __init__(self):
+        self.runs = []
+
+    async def __call__(self, url, export_csv, incremental, dedupe=None, progress=None, checkpoint=None, export_format="csv"):
+        reviews = dedupe.filter("hepsiburada", "HB1", REVIEWS)
+        self.runs.append(reviews)
+        if checkpoint is not None:
+            await checkpoint.save(dedupe=dedupe)
+        if len(self.runs) == 1:
+            await asyncio.Event().wait()
+        return {"success": True, "reviews": reviews}
+
+
+async def wait_until(predicate):
+    for _ in range(500):
+        if predicate():
+            return
+        await asyncio.sleep(0.01)
+    raise AssertionError("zaman aşımı")
+
+
+@pytest.fixture
+def crawler(tmp_path, monkeypatch):
+    stub = StubCrawler()
+    monkeypatch.setitem(job_service.CRAWLERS, "hepsiburada", stub)
+    monkeypatch.setattr(settings, "DEDUPE_STATE_DIR", str(tmp_path / "dedupe"))
+    return stub
+
+
+def restart_mid_crawl(tmp_path, crawler, export_csv, between_runs=None):
+    state_dir = str(tmp_path / "jobs")
+
+    async def scenario():
+        first = JobManager(state_dir=state_dir, workers=1, save_interval=0.01)
+        await first.start()
+        job = await first.submit("hepsiburada", "https://www.hepsiburada.com/ara?q=telefon", export_csv=export_csv)
+        await wait_until(lambda: crawler.runs)
+        await first.stop()
+        if between_runs is not None:
+            between_runs(first, job.id)
+
+        second = JobManager(state_dir=state_dir, workers=1, save_interval=0.01)
+        await second.start()
+        await wait_until(lambda: second.get(job.id).status in FINISHED_STATUSES)
+        await second.stop()
+        return second, second.get(job.id)
+
+    return asyncio.run(scenario())
+
+
+def test_restarted_json_job_starts_with_fresh_dedupe(tmp_path, crawler):
+    def between_runs(manager, job_id):
+        dedupe_path = manager._dedupe_path(job_id)
+        # Kontrol noktası olmayan iş kapanırken tekilleştirme durumu yazılmaz
+        assert not os.path.exists(dedupe_path)
+        # Eski bir sürümden kalmış durum dosyası da yok sayılmalı
+        stale = ReviewDeduplicator("hash")
+        stale.filter("hepsiburada", "HB1", REVIEWS)
+        stale.save(dedupe_path)
+
+    manager, job = restart_mid_crawl(tmp_path, crawler, export_csv=False, between_runs=between_runs)
+    assert job.status == JOB_SUCCEEDED and job.attempts == 2
+    assert crawler.runs == [REVIEWS, REVIEWS]
+    assert load_json_from_file(manager.result_path(job.id))["reviews"] == REVIEWS
+    assert not os.path.exists(manager._dedupe_path(job.id))
+
+
+def test_restarted_csv_job_resumes_dedupe_from_checkpoint(tmp_path, crawler):
+    manager, job = restart_mid_crawl(tmp_path, crawler, export_csv=True)
+    assert job.status == JOB_SUCCEEDED
+    # İlk çalışmada CSV'ye yazılan yorumlar devam eden çalışmada tekrar yazılmaz
+    assert crawler.runs == [REVIEWS, []]
+    assert not os.path.exists(manager._dedupe_path(job.id))
+    assert not os.path.exists(manager._checkpoint_path(job.id))
@@ -0,0 +1,72 @@
+import asyncio
+
+from app.utils.pagination import fetch_pages_concurrently, fetch_pages_until
+
+
+def make_fetcher(pages, delays, requested):
+    async def fetch_page(index):
+        requested.append(index)
+        await asyncio.sleep(delays.get(index, 0))
+        return pages.get(index)
+    return fetch_page
+
+
+def run_concurrently(pages, delays, indices, concurrency=4):
+    requested, sunk = [], []
+
+    async def on_page(index, items):
+        sunk.append((index, list(items)))
+
+    result = asyncio.run(fetch_pages_concurrently(
+        make_fetcher(pages, delays, requested),
+        indices,
+        extract_items=lambda data: data["items"],
+        concurrency=concurrency,
+        on_page=on_page,
+    ))
+    return result, sunk, requested
+
+
+def test_out_of_order_empty_page_never_reaches_sink():
+    pages = {1: {"items": ["a"]}, 2: {"items": []}, 3: {"items": ["c"]}, 4: {"items": ["d"]}}
+    # Boş 2. sayfa, 3. ve 4. sayfalardan sonra gelir
+    result, sunk, _ = run_concurrently(pages, {2: 0.05}, [1, 2, 3, 4])
+    assert sunk == [(1, ["a"])]
+    assert result == ["a"]
+
+
+def test_pages_are_sunk_in_index_order_and_match_result():
+    pages = {index: {"items": [f"r{index}"]} for index in range(1, 6)}
+    delays = {1: 0.04, 2: 0.01, 3: 0.03, 4: 0, 5: 0.02}
+    result, sunk, _ = run_concurrently(pages, delays, [1, 2, 3, 4, 5])
+    assert [index for index, _ in sunk] == [1, 2, 3, 4, 5]
+    assert result == [item for _, items in sunk for item in items]
+
+
+def test_failed_page_is_skipped_without_stopping():
+    pages = {1: {"items": ["a"]}, 3: {"items": ["c"]}}
+    result, sunk, _ = run_concurrently(pages, {}, [1, 2, 3])
+    assert sunk == [(1, ["a"]), (3, ["c"])]
+    assert result == ["a", "c"]
+
+
+def test_pages_after_an_empty_page_are_not_requested():
+    pages = {1: {"items": []}, 2: {"items": ["b"]}, 3: {"items": ["c"]}}
+    result, sunk, requested = run_concurrently(pages, {}, [1, 2, 3], concurrency=1)
+    assert result == [] and sunk == []
+    assert requested == [1]
+
+
+def test_fetch_pages_until_stops_at_watermark():
+    pages = {0: {"items": [5, 4]}, 1: {"items": [3, 2]}, 2: {"items": [1]}}
+    requested = []
+
+    def split_new(items):
+        new_items = [item for item in items if item > 3]
+        return new_items, len(new_items) < len(items)
+
+    result = asyncio.run(fetch_pages_until(
+        make_fetcher(pages, {}, requested), range(0, 3), lambda data: data["items"], split_new,
+    ))
+    assert result == ([5, 4], True)
+    assert requested == [0, 1]
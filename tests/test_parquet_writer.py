@@ -0,0 +1,94 @@
+import asyncio
+from datetime import datetime, timezone
+
+import pytest
+
+pa = pytest.importorskip("pyarrow")
+pq = pytest.importorskip("pyarrow.parquet")
+
+from app.services.hepsiburada_service import _build_product_rows
+from app.utils.parquet_writer import ParquetWriterStage
+
+
+def product(sku, reviews):
+    return {
+        "product_name": f"Telefon {sku}",
+        "sku": sku,
+        "price": "12.999,00" if sku == "HB3" else 12999.5,
+        "product_url": f"https://www.hepsiburada.com/telefon-p-{sku}",
+        "features": {"Renk": "Siyah", "Hafıza": 128},
+        "reviews": reviews,
+    }
+
+
+def review(content, star, created_at, media=()):
+    return {
+        "review": {"content": content},
+        "star": star,
+        "createdAt": created_at,
+        "customer": {"name": "Ayşe", "surname": "Y.", "displayName": "A** Y**"},
+        "media": [{"fullMediaUrl": f"{url}:webp"} for url in media],
+    }
+
+
+def test_rows_are_written_in_row_groups_with_typed_columns(tmp_path):
+    path = str(tmp_path / "out" / "reviews.parquet")
+    first = product("HB1", [
+        review("Çok güzel", 5, "2024-03-01T10:00:00Z", media=["https://img/1.jpg", "https://img/2.jpg"]),
+        review("İdare eder", 3, "14 Temmuz 2023"),
+    ])
+    second_page = product("HB1", [review("Kargo hızlı", "4", 1700000000000)])
+    second = product("HB2", [review("Kırık geldi", 1, None)])
+    without_reviews = product("HB3", [])
+
+    async def scenario():
+        async with ParquetWriterStage(path, "hepsiburada", row_group_size=2) as writer:
+            # Aynı ürün birden fazla put ile (ör. sayfa sayfa) yazılabilir
+            await writer.put(0, _build_product_rows(first, encode_nested=False), key="HB1")
+            await writer.put(1, _build_product_rows(second_page, encode_nested=False), key="HB1")
+            await writer.put(2, _build_product_rows(second, encode_nested=False), key="HB2")
+            await writer.put(3, [], key="HB4")
+            await writer.put(4, _build_product_rows(without_reviews, encode_nested=False))
+        return writer.stats()
+
+    stats = asyncio.run(scenario())
+    assert stats["products_written"] == 3
+    assert stats["rows_written"] == 5 and stats["pending_rows"] == 0
+    assert pq.ParquetFile(path).metadata.num_row_groups == stats["row_groups"] == 3
+
+    table = pq.read_table(path)
+    schema = table.schema
+    assert schema.field("product_features").type == pa.map_(pa.string(), pa.string())
+    assert schema.field("media_urls").type == pa.list_(pa.string())
+    # Parquet saniye birimini desteklemez; okunurken milisaniye olarak döner
+    created_at_type = schema.field("review_created_at").type
+    assert pa.types.is_timestamp(created_at_type) and created_at_type.tz == "UTC"
+    assert schema.field("review_star").type == pa.int32()
+    assert schema.field("price").type == pa.float64()
+
+    rows = table.to_pylist()
+    assert [row["sku"] for row in rows] == ["HB1", "HB1", "HB1", "HB2", "HB3"]
+    assert rows[0]["media_urls"] == ["https://img/1.jpg", "https://img/2.jpg"]
+    assert rows[1]["media_urls"] == []
+    assert rows[0]["product_features"] == [("Renk", "Siyah"), ("Hafıza", "128")]
+    assert [row["review_created_at"] for row in rows] == [
+        datetime(2024, 3, 1, 10, 0, tzinfo=timezone.utc),
+        datetime(2023, 7, 14, tzinfo=timezone.utc),
+        datetime.fromtimestamp(1700000000, tz=timezone.utc),
+        None,
+        None,
+    ]
+    assert [row["review_star"] for row in rows] == [5, 3, 4, 1, None]
+    assert rows[0]["price"] == 12999.5 and rows[4]["price"] is None
+    assert rows[4]["review_content"] is None
+
+
+def test_put_after_close_is_rejected(tmp_path):
+    async def scenario():
+        writer = ParquetWriterStage(str(tmp_path / "reviews.parquet"), "trendyol")
+        await writer.start()
+        await writer.close()
+        with pytest.raises(RuntimeError):
+            await writer.put(0, [{"comment": "geç"}])
+
+    asyncio.run(scenario())
@@ -0,0 +1,80 @@
+import asyncio
+import csv
+
+from app.utils.csv_writer import CsvWriterStage
+from app.utils.pipeline import Stage, UniqueWorkQueue, run_pipeline, run_staged_pipeline
+
+
+def test_unique_work_queue_processes_each_key_once():
+    processed = []
+
+    async def producer(queue):
+        for key in [1, 2, 1, 3, 2]:
+            await queue.put(key, key)
+
+    async def consumer(item):
+        processed.append(item)
+
+    queue = asyncio.run(run_pipeline(producer, consumer, workers=2))
+    assert sorted(processed) == [1, 2, 3]
+    assert queue.enqueued == 3 and queue.duplicates == 2
+
+
+def test_failed_item_reaches_ordered_writer_as_tombstone(tmp_path):
+    path = tmp_path / "out.csv"
+
+    async def scenario():
+        async with CsvWriterStage(str(path), ["value"], ordered=True, batch_size=1, fsync_interval=60) as writer:
+
+            async def producer(queue):
+                for index in range(5):
+                    await queue.put(index, index)
+
+            async def fetch(index):
+                await asyncio.sleep(0.001 * (5 - index))
+                if index == 1:
+                    raise RuntimeError("upstream failed")
+                return index, {"value": index}
+
+            async def sink(job):
+                index, row = job
+                await writer.put(index, [row] if row else [])
+
+            stages = [
+                Stage("fetch", fetch, workers=3, on_error=lambda index, error: (index, None)),
+                Stage("sink", sink),
+            ]
+            await run_staged_pipeline(producer, stages)
+            # Yazıcı kuyruğunu boşaltsın diye bekle; 1. indeks tampona takılmamalı
+            for _ in range(100):
+                if writer.rows_written == 4:
+                    break
+                await asyncio.sleep(0.01)
+            assert writer.stats()["reorder_buffer"] == 0
+            assert stages[0].failed == 1
+            return writer.rows_written
+
+    assert asyncio.run(scenario()) == 4
+    with open(path, newline="", encoding="utf-8") as f:
+        assert [row["value"] for row in csv.DictReader(f)] == ["0", "2", "3", "4"]
+
+
+def test_stage_without_on_error_drops_failed_item():
+    received = []
+
+    async def producer(queue):
+        for index in range(3):
+            await queue.put(index, index)
+
+    async def fail_on_one(index):
+        if index == 1:
+            raise ValueError("boom")
+        return index
+
+    async def sink(index):
+        received.append(index)
+
+    stages = [Stage("first", fail_on_one), Stage("sink", sink)]
+    asyncio.run(run_staged_pipeline(producer, stages))
+    assert sorted(received) == [0, 2]
+    assert stages[0].failed == 1
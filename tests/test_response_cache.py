@@ -0,0 +1,191 @@
+import asyncio
+from types import SimpleNamespace
+
+from app.parsers import hepsiburada_parser, trendyol_parser
+from app.core.config import settings
+from app.utils import response_cache as response_cache_module
+from app.utils.response_cache import ResponseCache, normalize_url
+from app.utils.singleflight import SingleFlight
+
+API_URL = "https://api.example.com/reviews"
+
+
+def make_cache(tmp_path, **kwargs):
+    return ResponseCache(path=str(tmp_path / "cache.sqlite3"), ttls={"default": 600}, **kwargs)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        self.now += 0.001
+        return self.now
+
+
+def test_normalize_url_sorts_params_and_drops_fragment():
+    assert normalize_url("HTTPS://API.Example.com/reviews?b=2&a=1#top") == "https://api.example.com/reviews?a=1&b=2"
+    assert normalize_url(API_URL + "?page=1", {"size": 20, "sort": None}) == normalize_url(API_URL, {"size": "20", "page": 1})
+    assert normalize_url(API_URL, {"q": "kırık ekran"}) == API_URL + "?q=k%C4%B1r%C4%B1k+ekran"
+
+
+def test_make_key_separates_endpoints_and_ignores_param_order():
+    assert ResponseCache.make_key("reviews", API_URL, {"page": 1, "size": 20}) == ResponseCache.make_key("reviews", API_URL + "?size=20", {"page": 1})
+    assert ResponseCache.make_key("reviews", API_URL, {"page": 1}) != ResponseCache.make_key("details", API_URL, {"page": 1})
+    assert ResponseCache.make_key("reviews", API_URL, {"page": 1}) != ResponseCache.make_key("reviews", API_URL, {"page": 2})
+
+
+def test_get_set_and_ttl_expiry(tmp_path, monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(response_cache_module, "time", SimpleNamespace(time=clock))
+    cache = ResponseCache(path=str(tmp_path / "cache.sqlite3"), ttls={"reviews": 60, "default": 600})
+
+    async def scenario():
+        await cache.set("reviews", API_URL, {"reviews": ["güzel"]}, {"page": 0})
+        await cache.set("details", API_URL, {"name": "Telefon"}, {"page": 0})
+        assert await cache.get("reviews", API_URL, {"page": 0}) == {"reviews": ["güzel"]}
+        assert await cache.get("reviews", API_URL, {"page": 1}) is None
+        clock.now += 61
+        expired = await cache.get("reviews", API_URL, {"page": 0})
+        default_ttl = await cache.get("details", API_URL, {"page": 0})
+        cache.offline = True
+        stale = await cache.get("reviews", API_URL, {"page": 0})
+        return expired, default_ttl, stale, await cache.stats()
+
+    expired, default_ttl, stale, stats = asyncio.run(scenario())
+    assert expired is None
+    assert default_ttl == {"name": "Telefon"}
+    assert stale == {"reviews": ["güzel"]}
+    assert stats["entries"] == 2
+    assert stats["endpoints"]["reviews"]["hits"] == 2 and stats["endpoints"]["reviews"]["misses"] == 2
+    cache.close()
+
+
+def test_lru_eviction_keeps_recently_read_entries(tmp_path, monkeypatch):
+    monkeypatch.setattr(response_cache_module, "time", SimpleNamespace(time=FakeClock()))
+    cache = make_cache(tmp_path)
+    value = {"body": "x" * 200}
+
+    async def scenario():
+        await cache.set("reviews", API_URL, value, {"page": 0})
+        entry_size = (await cache.stats())["bytes"]
+        # Üç kayıt sınırı aşar; sınırın %90'ına inmek için bir kayıt silinir
+        cache.max_bytes = entry_size * 3 - 1
+        await cache.set("reviews", API_URL, value, {"page": 1})
+        # page=0 okunduğu için page=1 en eski erişilen kayıt olur
+        assert await cache.get("reviews", API_URL, {"page": 0}) == value
+        await cache.set("reviews", API_URL, value, {"page": 2})
+        pages = [await cache.get("reviews", API_URL, {"page": page}) is not None for page in range(3)]
+        return pages, await cache.stats()
+
+    pages, stats = asyncio.run(scenario())
+    assert pages == [True, False, True]
+    assert stats["evictions"] == 1 and stats["entries"] == 2
+    cache.close()
+
+
+def test_get_or_fetch_skips_empty_and_error_results(tmp_path):
+    cache = make_cache(tmp_path)
+    results = iter([{"error": "engellendi"}, [], {"ok": True}, {"ok": False}])
+    calls = []
+
+    async def fetch():
+        calls.append(1)
+        return next(results)
+
+    async def scenario():
+        return [await cache.get_or_fetch("search", API_URL, fetch, {"q": "telefon"}) for _ in range(4)]
+
+    assert asyncio.run(scenario()) == [{"error": "engellendi"}, [], {"ok": True}, {"ok": True}]
+    assert len(calls) == 3
+    cache.close()
+
+
+def test_offline_miss_does_not_call_upstream(tmp_path):
+    cache = make_cache(tmp_path, offline=True)
+
+    async def fetch():
+        raise AssertionError("offline modda upstream'e gidilmemeli")
+
+    assert asyncio.run(cache.get_or_fetch("search", API_URL, fetch)) is None
+    cache.close()
+
+
+def test_purge_by_host_and_pattern(tmp_path):
+    cache = make_cache(tmp_path)
+
+    async def scenario():
+        await cache.set("reviews", API_URL, {"a": 1}, {"productId": "123"})
+        await cache.set("reviews", API_URL, {"a": 2}, {"productId": "456"})
+        await cache.set("search", "https://www.example.org/ara", {"a": 3}, {"q": "telefon"})
+        removed_pattern = await cache.purge(pattern="*productId=123*")
+        removed_host = await cache.purge(host="www.example.org")
+        return removed_pattern, removed_host, (await cache.stats())["entries"]
+
+    assert asyncio.run(scenario()) == (1, 1, 1)
+    cache.close()
+
+
+def test_bypassed_calls_always_reach_upstream(tmp_path):
+    cache = make_cache(tmp_path)
+    calls = []
+
+    @cache.cached("reviews", key=lambda params: ("https://api.example.com/reviews", params), bypass=lambda params: params.get("order") == "new")
+    async def fetch(params):
+        calls.append(dict(params))
+        return {"page": params["page"], "call": len(calls)}
+
+    async def scenario():
+        first = await fetch({"page": 0, "order": "new"})
+        second = await fetch({"page": 0, "order": "new"})
+        assert first != second
+        # Bypass edilmeyen istekler önbellekten döner
+        assert await fetch({"page": 0, "order": "score"}) == await fetch({"page": 0, "order": "score"})
+        return (await cache.stats())["endpoints"]["reviews"]
+
+    stats = asyncio.run(scenario())
+    assert len(calls) == 3
+    assert stats["bypassed"] == 2 and stats["hits"] == 1
+    cache.close()
+
+
+def test_offline_mode_still_reads_bypassed_calls_from_cache(tmp_path):
+    cache = make_cache(tmp_path)
+
+    async def seed():
+        await cache.set("reviews", "https://api.example.com/reviews", {"cached": True}, {"page": 0})
+
+    asyncio.run(seed())
+    cache.offline = True
+
+    @cache.cached("reviews", key=lambda params: ("https://api.example.com/reviews", params), bypass=lambda params: True)
+    async def fetch(params):
+        raise AssertionError("offline modda upstream'e gidilmemeli")
+
+    assert asyncio.run(fetch({"page": 0})) == {"cached": True}
+    cache.close()
+
+
+def test_singleflight_bypass_runs_every_call():
+    flight = SingleFlight(window=60)
+    calls = []
+
+    @flight.coalesce("reviews", key=lambda params: ("https://api.example.com/reviews", params), bypass=lambda params: True)
+    async def fetch(params):
+        calls.append(params)
+        await asyncio.sleep(0.01)
+        return {"page": 0}
+
+    async def scenario():
+        await asyncio.gather(fetch({"page": 0}), fetch({"page": 0}))
+
+    asyncio.run(scenario())
+    assert len(calls) == 2
+    assert flight.stats()["endpoints"]["reviews"]["bypassed"] == 2
+
+
+def test_incremental_review_requests_are_recognised_as_newest_first():
+    assert trendyol_parser._is_newest_first({"page": 0, "contentId": "1", **settings.TRENDYOL_NEWEST_FIRST_PARAMS})
+    assert not trendyol_parser._is_newest_first({"page": 0, "contentId": "1", "order": "DESC", "orderBy": "Score"})
+    assert hepsiburada_parser._is_newest_first("SKU1", 0, 100, sort_params=settings.HEPSIBURADA_NEWEST_FIRST_PARAMS)
+    assert not hepsiburada_parser._is_newest_first("SKU1", 0, 100)
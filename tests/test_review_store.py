@@ -0,0 +1,84 @@
+import asyncio
+
+from app.utils.review_store import ReviewStore, build_fts_query, normalize_review_date, turkish_fold
+
+
+def trendyol_review(review_id, comment, rate=5, date="14 Temmuz 2023"):
+    return {"id": review_id, "userFullName": "A** B**", "comment": comment, "rate": rate, "lastModifiedDate": date}
+
+
+def test_turkish_fold_handles_dotted_and_dotless_i():
+    assert turkish_fold("KIRIK") == turkish_fold("kırık") == turkish_fold("kirik") == "kirik"
+    assert turkish_fold("İYİ") == "iyi"
+    assert turkish_fold("Şarj GÜÇLÜ, çok Öğrenci") == "sarj guclu, cok ogrenci"
+    assert turkish_fold(None) == ""
+
+
+def test_build_fts_query_quotes_terms_and_keeps_prefix():
+    assert build_fts_query("Kırık EKRAN") == '"kirik" "ekran"'
+    assert build_fts_query('şarj* "OR" -') == '"sarj"* "or"'
+    assert build_fts_query("  *  ") == ""
+
+
+def test_normalize_review_date():
+    assert normalize_review_date("14 Temmuz 2023") == "2023-07-14"
+    assert normalize_review_date(None) is None
+
+
+def test_search_matches_across_turkish_case_and_diacritics(tmp_path):
+    async def scenario():
+        store = ReviewStore(path=str(tmp_path / "store.db"), batch_size=1000, enabled=True)
+        try:
+            await store.add_product("trendyol", "1", name="Telefon")
+            await store.add_reviews("trendyol", "1", [
+                trendyol_review(1, "Ekranı KIRIK geldi", rate=1, date="1 Ocak 2024"),
+                trendyol_review(2, "Şarjı çok iyi dayanıyor", rate=5, date="2 Ocak 2024"),
+                trendyol_review(3, "kirik kutu, ürün sağlam", rate=4, date="3 Ocak 2024"),
+            ])
+            await store.add_reviews("trendyol", "2", [trendyol_review(4, "Kırık", rate=2)])
+            await store.flush()
+
+            folded = await store.search("kırık")
+            prefix = await store.search("sarj*")
+            filtered = await store.search("KIRIK", product_id="1", min_rating=3)
+            empty = await store.search("**")
+
+            # Aynı yorum tekrar yazılırsa indeks güncellenir, kayıt çoğalmaz
+            await store.add_reviews("trendyol", "1", [trendyol_review(1, "Ekran sorunsuz", rate=1, date="1 Ocak 2024")])
+            await store.flush()
+            after_update = await store.search("kırık", product_id="1")
+            reviews = await store.get_reviews("trendyol", "1")
+            return folded, prefix, filtered, empty, after_update, reviews
+        finally:
+            store.close()
+
+    folded, prefix, filtered, empty, after_update, reviews = asyncio.run(scenario())
+    assert folded["total"] == 3
+    assert {row["review_id"] for row in folded["results"]} == {"1", "3", "4"}
+    assert all(row["score"] >= 0 for row in folded["results"])
+    assert [row["review_id"] for row in prefix["results"]] == ["2"]
+    assert [row["review_id"] for row in filtered["results"]] == ["3"]
+    assert empty == {"total": 0, "results": []}
+    assert [row["review_id"] for row in after_update["results"]] == ["3"]
+    assert [row["review_id"] for row in reviews] == ["3", "2", "1"]
+
+
+def test_existing_reviews_are_indexed_when_fts_table_is_created(tmp_path):
+    path = str(tmp_path / "store.db")
+
+    async def write_and_search():
+        store = ReviewStore(path=path, enabled=True)
+        await store.add_reviews("hepsiburada", "HB1", [{"id": "r1", "review": {"content": "Kargo HIZLI"}, "star": 5}])
+        await store.flush()
+        with store._lock:
+            conn = store._connect()
+            conn.executescript("DROP TABLE reviews_fts;")
+        store.close()
+        reopened = ReviewStore(path=path, enabled=True)
+        try:
+            return await reopened.search("hızlı", marketplace="hepsiburada")
+        finally:
+            reopened.close()
+
+    result = asyncio.run(write_and_search())
+    assert [row["review_id"] for row in result["results"]] == ["r1"]
@@ -0,0 +1,107 @@
+import json
+import shutil
+import subprocess
+
+import pytest
+
+from app.parsers.hepsiburada_parser import _FEATURE_SCRIPT_IDS, _FEATURES_JS, parse_product_features
+from app.parsers.script_extractor import (
+    PRODUCT_STATE_VARIABLE,
+    extract_assigned_json,
+    extract_product_json_ld,
+    extract_trendyol_product_details,
+    find_script_by_id,
+    find_value_span,
+    find_value_start,
+)
+
+EXPENDS = [{"name": "Genel", "properties": [{"name": "Renk", "property": "Siyah"}, {"name": "Garanti", "property": "2 Yıl"}]}]
+
+
+def test_find_value_start_skips_string_value_occurrences():
+    text = '{"tab": "expends", "label": {"expends": "yok"}, "expends": [1, 2]}'
+    start = find_value_start(text, "expends")
+    assert text[start:start + 6] == "[1, 2]"
+    assert find_value_start('{"expends": "sadece metin"}', "expends") == -1
+
+
+def test_find_value_span_uses_first_closed_value():
+    text = '{"expends": [1, {"a": "]"}], "rest": {"expends": {"x": 1}}}'
+    start, end = find_value_span(text, "expends")
+    assert json.loads(text[start:end]) == [1, {"a": "]"}]
+
+
+def test_json_ld_product_inside_graph():
+    graph = {"@context": "https://schema.org", "@graph": [
+        {"@type": "BreadcrumbList", "itemListElement": []},
+        {"@type": ["Product", "Thing"], "name": "Telefon", "additionalProperty": [{"name": "Renk", "unitText": "Mavi"}]},
+    ]}
+    html = (
+        '<script type="application/ld+json">{"@type": "Organization", "name": "Product Inc"}</script>'
+        f'<script type="application/ld+json">{json.dumps(graph)}</script>'
+    )
+    product = extract_product_json_ld(html)
+    assert product["name"] == "Telefon"
+    assert extract_trendyol_product_details(html) == product
+
+
+def test_initial_state_with_nested_closing_sequence_is_not_truncated():
+    state = {"product": {"id": 7, "description": "Kutu içeriği: {kılıf}; şarj aleti", "attributes": [{"key": {"name": "k"}, "value": {"name": "};"}}]}}
+    html = (
+        f"<script>if (window.{PRODUCT_STATE_VARIABLE.split('.', 1)[1]}) {{}}</script>"
+        f"<script>{PRODUCT_STATE_VARIABLE} = {json.dumps(state, ensure_ascii=False)};window.other={{}};</script>"
+    )
+    assert extract_trendyol_product_details(html) == {"productData": state["product"]}
+
+
+def test_extract_assigned_json_skips_comparisons():
+    html = f"<script>if ({PRODUCT_STATE_VARIABLE} == null) {{}}; {PRODUCT_STATE_VARIABLE}={{\"product\": {{}}}};</script>"
+    assert extract_assigned_json(html, PRODUCT_STATE_VARIABLE) == {"product": {}}
+    assert extract_assigned_json("<script></script>", PRODUCT_STATE_VARIABLE) is None
+
+
+def test_find_script_by_id_ignores_other_scripts():
+    html = '<div id="reduxStore"></div><script id="other">1</script><script type="application/json" id="reduxStore">{"a": 1}</script>'
+    assert find_script_by_id(html, "reduxStore") == '{"a": 1}'
+    assert find_script_by_id(html, "missing") is None
+
+
+def test_parse_product_features_after_string_and_nested_occurrences():
+    script = json.dumps({
+        "ui": {"activeTab": "expends", "expends": ["özellikler"]},
+        "product": {"expends": EXPENDS},
+    }, ensure_ascii=False)
+    assert parse_product_features(script) == {"Renk": "Siyah", "Garanti": "2 Yıl"}
+    assert evaluate_features_js(script) == {"Renk": "Siyah", "Garanti": "2 Yıl"}
+
+
+def evaluate_features_js(script):
+    """_FEATURES_JS'i PAGE_EXTRACTION_MODE="evaluate" ile sayfada çalışır gibi node'da çalıştırır."""
+    if shutil.which("node") is None:
+        pytest.skip("node kurulu değil")
+    program = (
+        f"const elements = {{reduxStore: {json.dumps(script)}}};\n"
+        "const document = {getElementById: (id) => id in elements ? {textContent: elements[id]} : null};\n"
+        f"const result = ({_FEATURES_JS})([{json.dumps(list(_FEATURE_SCRIPT_IDS))}, true]);\n"
+        "process.stdout.write(JSON.stringify(result));\n"
+    )
+    output = subprocess.run(["node", "-e", program], capture_output=True, text=True, check=True).stdout
+    return json.loads(output)["features"]
+
+
+def test_features_skip_primitive_groups_and_properties():
+    expends = [
+        {"name": "Genel", "properties": ["Renk", 3, None, {"name": "Renk", "property": "Siyah"}]},
+        {"name": "Boş", "properties": "yok"},
+    ]
+    script = json.dumps({"product": {"expends": expends}, "tabs": {"expends": [{"name": "x"}, "y"]}}, ensure_ascii=False)
+    assert parse_product_features(script) == {"Renk": "Siyah"}
+    assert evaluate_features_js(script) == {"Renk": "Siyah"}
+
+
+def test_parse_product_features_json5_and_html_escaped():
+    json5_script = "window.store = {expendsCount: 1, 'x': 1, \"expends\": [{name: 'Genel', properties: [{name: 'Renk', property: 'Siyah',},],},]}"
+    assert parse_product_features(json5_script) == {"Renk": "Siyah"}
+    escaped = json.dumps({"expends": EXPENDS}, ensure_ascii=False).replace('"', "&quot;")
+    assert parse_product_features(escaped)["Garanti"] == "2 Yıl"
+    assert parse_product_features('{"expends": "yok"}') is None
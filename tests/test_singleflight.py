@@ -0,0 +1,113 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from app.utils import singleflight as singleflight_module
+from app.utils.singleflight import SingleFlight
+
+API_URL = "https://api.example.com/reviews"
+
+
+def test_concurrent_calls_share_one_execution():
+    flight = SingleFlight(window=0)
+    calls = []
+
+    @flight.coalesce("reviews", key=lambda params: (API_URL, params))
+    async def fetch(params):
+        calls.append(params)
+        await asyncio.sleep(0.01)
+        return {"page": params["page"]}
+
+    async def scenario():
+        # Parametre sırası farklı olsa da anahtar aynı
+        return await asyncio.gather(
+            fetch({"page": 0, "size": 20}),
+            fetch({"size": 20, "page": 0}),
+            fetch({"page": 0, "size": 20}),
+            fetch({"page": 1, "size": 20}),
+        )
+
+    results = asyncio.run(scenario())
+    assert results == [{"page": 0}, {"page": 0}, {"page": 0}, {"page": 1}]
+    assert len(calls) == 2
+    stats = flight.stats()
+    assert stats["in_flight"] == 0
+    assert stats["endpoints"]["reviews"]["executions"] == 2
+    assert stats["endpoints"]["reviews"]["coalesced"] == 2
+    assert stats["endpoints"]["reviews"]["dedupe_ratio"] == 0.5
+
+
+def test_window_serves_recent_result_until_it_expires(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr(singleflight_module, "time", SimpleNamespace(monotonic=lambda: now[0]))
+    flight = SingleFlight(window=5)
+    calls = []
+
+    async def fetch():
+        calls.append(1)
+        return {"call": len(calls)}
+
+    async def scenario():
+        first = await flight.do("details", "k", fetch)
+        now[0] += 4
+        second = await flight.do("details", "k", fetch)
+        now[0] += 2
+        third = await flight.do("details", "k", fetch)
+        return first, second, third
+
+    assert asyncio.run(scenario()) == ({"call": 1}, {"call": 1}, {"call": 2})
+    assert flight.stats()["endpoints"]["details"]["window_hits"] == 1
+
+
+def test_none_results_are_not_kept_in_window():
+    flight = SingleFlight(window=60)
+    calls = []
+
+    async def fetch():
+        calls.append(1)
+        return None
+
+    async def scenario():
+        await flight.do("details", "k", fetch)
+        await flight.do("details", "k", fetch)
+
+    asyncio.run(scenario())
+    assert len(calls) == 2
+
+
+def test_errors_propagate_to_all_waiters_and_are_not_cached():
+    flight = SingleFlight(window=60)
+    calls = []
+
+    async def fetch():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        raise RuntimeError("upstream 503")
+
+    async def scenario():
+        results = await asyncio.gather(flight.do("search", "k", fetch), flight.do("search", "k", fetch), return_exceptions=True)
+        with pytest.raises(RuntimeError):
+            await flight.do("search", "k", fetch)
+        return results
+
+    results = asyncio.run(scenario())
+    assert all(isinstance(result, RuntimeError) for result in results)
+    assert len(calls) == 2
+
+
+def test_cancelled_caller_does_not_cancel_shared_request():
+    flight = SingleFlight(window=0)
+
+    async def fetch():
+        await asyncio.sleep(0.02)
+        return "ok"
+
+    async def scenario():
+        first = asyncio.create_task(flight.do("search", "k", fetch))
+        second = asyncio.create_task(flight.do("search", "k", fetch))
+        await asyncio.sleep(0.005)
+        first.cancel()
+        return await second, first.cancelled()
+
+    assert asyncio.run(scenario()) == ("ok", True)
@@ -0,0 +1,79 @@
+import asyncio
+import json
+
+from app.utils.streaming import stream_products
+
+
+def test_ndjson_yields_each_product_as_it_is_produced():
+    async def scenario():
+        consumed = [asyncio.Event() for _ in range(3)]
+
+        async def run(on_product):
+            for index in range(3):
+                await on_product({"id": index, "name": f"Ürün {index}"})
+                # Bir sonraki ürün ancak istemci öncekini aldıktan sonra üretilir
+                await asyncio.wait_for(consumed[index].wait(), timeout=5)
+            return {"success": True, "totalProducts": 3, "products": ["büyük liste"]}
+
+        response = stream_products(run, "ndjson")
+        assert response.media_type == "application/x-ndjson"
+        lines = []
+        async for chunk in response.body_iterator:
+            lines.append(json.loads(chunk))
+            if len(lines) <= 3:
+                consumed[len(lines) - 1].set()
+        return lines
+
+    lines = asyncio.run(scenario())
+    assert lines == [
+        {"id": 0, "name": "Ürün 0"},
+        {"id": 1, "name": "Ürün 1"},
+        {"id": 2, "name": "Ürün 2"},
+        {"type": "end", "success": True, "totalProducts": 3, "streamedProducts": 3},
+    ]
+
+
+def test_sse_reports_errors_as_events():
+    async def run(on_product):
+        await on_product({"id": 1})
+        raise RuntimeError("arama sayfası alınamadı")
+
+    async def scenario():
+        response = stream_products(run, "sse")
+        assert response.media_type == "text/event-stream"
+        return [chunk async for chunk in response.body_iterator]
+
+    events = asyncio.run(scenario())
+    assert [event.split("\n")[0] for event in events] == ["event: product", "event: error", "event: end"]
+    assert json.loads(events[0].split("data: ", 1)[1]) == {"id": 1}
+    assert json.loads(events[1].split("data: ", 1)[1]) == {"error": "arama sayfası alınamadı"}
+    assert all(event.endswith("\n\n") for event in events)
+
+
+def test_client_disconnect_cancels_the_crawl():
+    async def scenario():
+        cancelled = asyncio.Event()
+        produced = []
+
+        async def run(on_product):
+            try:
+                for index in range(1000):
+                    await on_product({"id": index})
+                    produced.append(index)
+            except asyncio.CancelledError:
+                cancelled.set()
+                raise
+            return {"success": True}
+
+        response = stream_products(run, "ndjson")
+        iterator = response.body_iterator
+        first = await iterator.__anext__()
+        # İstemci bağlantıyı kesince Starlette üreteci kapatır
+        await iterator.aclose()
+        return json.loads(first), cancelled.is_set(), len(produced)
+
+    first, cancelled, produced = asyncio.run(scenario())
+    assert first == {"id": 0}
+    assert cancelled
+    # Sınırlı kuyruk sayesinde tarama istemcinin çok önüne geçmez
+    assert produced < 1000
@@ -0,0 +1,108 @@
+import asyncio
+import inspect
+import json
+from contextlib import asynccontextmanager
+
+import pytest
+
+from app.core.config import settings
+from app.parsers import trendyol_parser
+
+PRODUCT = {"@type": "Product", "name": "Telefon", "additionalProperty": [{"name": "Renk", "unitText": "Siyah"}]}
+PRODUCT_HTML = f'<html><script type="application/ld+json">{json.dumps(PRODUCT)}</script></html>'
+
+
+class FakeMouse:
+    async def move(self, x, y):
+        pass
+
+
+class FakeKeyboard:
+    async def press(self, key):
+        pass
+
+
+class FakePage:
+    def __init__(self, evaluated, html):
+        self.evaluated = evaluated
+        self.html = html
+        self.mouse = FakeMouse()
+        self.keyboard = FakeKeyboard()
+        self.content_calls = 0
+
+    async def set_extra_http_headers(self, headers):
+        pass
+
+    async def wait_for_timeout(self, ms):
+        pass
+
+    async def evaluate(self, script, arg):
+        return dict(self.evaluated)
+
+    async def content(self):
+        self.content_calls += 1
+        return self.html
+
+
+class FakePool:
+    def __init__(self, page):
+        self.page = page
+        self.checkouts = 0
+
+    @asynccontextmanager
+    async def checkout(self, profile="default"):
+        self.checkouts += 1
+        yield self.page
+
+
+class FakeRateLimiter:
+    async def acquire(self, url):
+        pass
+
+    def record(self, url, status, blocked=False):
+        pass
+
+
+@pytest.fixture
+def browser(monkeypatch):
+    def install(evaluated, html=PRODUCT_HTML):
+        pool = FakePool(FakePage(evaluated, html))
+
+        async def fake_goto(page, url, selector):
+            pass
+
+        async def no_sleep(seconds):
+            pass
+
+        monkeypatch.setattr(settings, "PAGE_EXTRACTION_MODE", "evaluate")
+        monkeypatch.setattr(trendyol_parser, "browser_pool", pool)
+        monkeypatch.setattr(trendyol_parser, "rate_limiter", FakeRateLimiter())
+        monkeypatch.setattr(trendyol_parser, "goto_and_wait_for_target", fake_goto)
+        monkeypatch.setattr(trendyol_parser.random, "randint", lambda a, b: 0)
+        monkeypatch.setattr(trendyol_parser.asyncio, "sleep", no_sleep)
+        return pool
+    return install
+
+
+# Önbellek ve singleflight katmanları olmadan asıl fetcher
+fetch_product_details = inspect.unwrap(trendyol_parser.fetch_product_details)
+
+
+def test_evaluate_mode_falls_back_to_html_after_last_blocked_attempt(browser):
+    pool = browser({"details": None, "blocked": True})
+    assert asyncio.run(fetch_product_details("https://www.trendyol.com/urun-p-1")) == PRODUCT
+    assert pool.checkouts == 3
+    # Sadece son denemede HTML Python'a taşınır
+    assert pool.page.content_calls == 1
+
+
+def test_evaluate_mode_uses_in_page_result_without_html(browser):
+    pool = browser({"details": PRODUCT})
+    assert asyncio.run(fetch_product_details("https://www.trendyol.com/urun-p-1")) == PRODUCT
+    assert pool.checkouts == 1 and pool.page.content_calls == 0
+
+
+def test_evaluate_mode_returns_none_when_html_has_no_product_either(browser):
+    pool = browser({"details": None}, html="<html></html>")
+    assert asyncio.run(fetch_product_details("https://www.trendyol.com/urun-p-1")) is None
+    assert pool.checkouts == 1 and pool.page.content_calls == 1
@@ -0,0 +1,87 @@
+import asyncio
+from collections import Counter
+
+import pytest
+
+from app.services import trendyol_service
+from app.utils.review_store import ReviewStore
+
+# Arama sayfası -> ürün kimlikleri (3 numaralı ürün 1. ve 2. sayfada, 2 numaralı 1. ve 3. sayfada tekrar eder)
+SEARCH_PAGES = {1: [1, 2, 3], 2: [3, 4], 3: [2, 5]}
+
+
+def review_page_count(content_id):
+    return int(content_id) % 3 + 1
+
+
+def product(content_id):
+    return {"name": f"Ürün {content_id}", "url": f"/marka/urun-p-{content_id}", "merchantId": 100 + content_id}
+
+
+@pytest.fixture
+def upstream(monkeypatch):
+    calls = {"search": Counter(), "details": Counter(), "reviews": Counter()}
+
+    async def fake_fetch_search_results(url, page=1):
+        calls["search"][page] += 1
+        await asyncio.sleep(0)
+        return {"products": [product(i) for i in SEARCH_PAGES.get(page, [])], "totalCount": 60, "page": page}
+
+    async def fake_fetch_product_details(url):
+        calls["details"][url] += 1
+        await asyncio.sleep(0.01)
+        return {"@type": "Product", "additionalProperty": [{"name": "Renk", "unitText": "Siyah"}]}
+
+    async def fake_fetch_review_page(params):
+        content_id, page = params["contentId"], params["page"]
+        calls["reviews"][(content_id, page)] += 1
+        await asyncio.sleep(0.001)
+        total = review_page_count(content_id)
+        content = [{"id": f"{content_id}-{page}", "comment": "iyi"}] if page < total else []
+        return {"result": {"productReviews": {"content": content, "totalPages": total}}}
+
+    monkeypatch.setattr(trendyol_service, "fetch_search_results", fake_fetch_search_results)
+    monkeypatch.setattr(trendyol_service, "fetch_product_details", fake_fetch_product_details)
+    monkeypatch.setattr(trendyol_service, "fetch_review_page", fake_fetch_review_page)
+    monkeypatch.setattr(trendyol_service, "review_store", ReviewStore(enabled=False))
+    return calls
+
+
+def test_each_product_is_processed_exactly_once(upstream):
+    result = asyncio.run(trendyol_service.get_product_reviews("https://www.trendyol.com/sr?q=awox"))
+
+    assert result["success"] is True
+    assert result["totalPages"] == 3
+    assert result["totalProducts"] == 5
+    assert all(count == 1 for count in upstream["search"].values())
+    assert set(upstream["search"]) == {1, 2, 3}
+
+    # Her ürünün detayı tam bir kez istenir
+    expected_urls = {f"https://www.trendyol.com/marka/urun-p-{i}" for i in range(1, 6)}
+    assert set(upstream["details"]) == expected_urls
+    assert all(count == 1 for count in upstream["details"].values())
+
+    # Yorum sayfaları ürünün sayfa sayısıyla örtüşür ve hiçbiri iki kez istenmez
+    assert all(count == 1 for count in upstream["reviews"].values())
+    for content_id in map(str, range(1, 6)):
+        total = review_page_count(content_id)
+        requested = {page for cid, page in upstream["reviews"] if cid == content_id}
+        # totalPages'in bir fazlası, taramayı bitiren boş sayfa olarak istenebilir
+        assert set(range(total)) <= requested <= set(range(total + 1))
+
+
+def test_streamed_products_carry_all_their_reviews(upstream):
+    streamed = []
+
+    async def on_product(product_reviews):
+        streamed.append(product_reviews)
+
+    result = asyncio.run(trendyol_service.get_product_reviews("https://www.trendyol.com/sr?q=awox", on_product=on_product))
+
+    assert result["success"] is True and result["products"] == []
+    assert sorted(p["productInfo"]["contentId"] for p in streamed) == [str(i) for i in range(1, 6)]
+    for product_reviews in streamed:
+        content_id = product_reviews["productInfo"]["contentId"]
+        assert [review["id"] for review in product_reviews["reviews"]] == [
+            f"{content_id}-{page}" for page in range(review_page_count(content_id))
+        ]
@@ -0,0 +1,58 @@
+from app.utils.watermarks import Watermark, WatermarkStore
+
+
+def review(review_id, date=None):
+    return {"id": review_id, "lastModifiedDate": date}
+
+
+def test_split_new_stops_at_known_review_id():
+    watermark = Watermark(["3", "2"])
+    page = [review(5), review(4), review(3), review(2)]
+    assert watermark.split_new(page, "id", "lastModifiedDate") == ([review(5), review(4)], True)
+
+
+def test_split_new_stops_at_older_iso_date_even_if_ids_were_deleted():
+    watermark = Watermark(["99"], latest_date="2024-03-01T10:00:00")
+    page = [review(7, "2024-03-02T09:00:00"), review(6, "2024-03-01T10:00:00"), review(5, "2024-02-28")]
+    new_reviews, crossed = watermark.split_new(page, "id", "lastModifiedDate")
+    assert [item["id"] for item in new_reviews] == [7]
+    assert crossed is True
+
+
+def test_split_new_ignores_non_comparable_dates():
+    watermark = Watermark([], latest_date="14 Temmuz 2023")
+    page = [review(2, "15 Temmuz 2023"), review(1, "1 Ocak 2020")]
+    assert watermark.split_new(page, "id", "lastModifiedDate") == (page, False)
+
+
+def test_store_without_watermark_treats_everything_as_new(tmp_path):
+    store = WatermarkStore(path=str(tmp_path / "wm.json"))
+    page = [review(1), review(2)]
+    assert store.split_new("trendyol", store.get("trendyol", "42"), page) == (page, False)
+
+
+def test_advance_keeps_newest_ids_first_and_persists(tmp_path):
+    path = str(tmp_path / "wm.json")
+    store = WatermarkStore(path=path, max_ids=3)
+    store.advance("trendyol", "42", [review(2, "2024-01-02"), review(1, "2024-01-01")])
+    store.advance("trendyol", "42", [review(4, "2024-01-04"), review(3, "2024-01-03")])
+    store.advance("trendyol", "42", [])
+    store.save()
+
+    reloaded = WatermarkStore(path=path, max_ids=3).get("trendyol", "42")
+    assert reloaded.review_ids == ["4", "3", "2"]
+    assert reloaded.latest_date == "2024-01-04"
+
+    # Bir sonraki taramada sadece yeni yorumlar geçer
+    page = [review(6, "2024-01-06"), review(5, "2024-01-05"), review(4, "2024-01-04")]
+    new_reviews, crossed = WatermarkStore(path=path).split_new("trendyol", reloaded, page)
+    assert [item["id"] for item in new_reviews] == [6, 5] and crossed
+
+
+def test_advance_keeps_previous_date_when_newest_review_has_none(tmp_path):
+    store = WatermarkStore(path=str(tmp_path / "wm.json"))
+    store.advance("hepsiburada", "SKU1", [{"id": "a", "createdAt": "2024-05-01"}])
+    store.advance("hepsiburada", "SKU1", [{"id": "b"}])
+    watermark = store.get("hepsiburada", "SKU1")
+    assert watermark.review_ids == ["b", "a"]
+    assert watermark.latest_date == "2024-05-01"